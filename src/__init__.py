@@ -1 +1 @@
-from .main import PersephAI
\ No newline at end of file
+from .main import PersephAI, AsyncPersephAI
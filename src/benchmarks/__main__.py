@@ -0,0 +1,3 @@
+from src.benchmarks.runner import main
+
+main()
@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DEFAULT_RUNS = 5
+DEFAULT_MAX_IMPORT_SECONDS = 1.0
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAZY_MODULES = (
+    'ollama',
+    'cryptography',
+    'metaplex',
+    'raydium',
+    'spl.stake_pool',
+    'spl.token',
+    'src.instructions.nft',
+    'src.instructions.pumpfun',
+    'src.instructions.raydium',
+    'src.instructions.staking',
+    'src.instructions.system',
+    'src.instructions.token',
+)
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src
+elapsed = time.perf_counter() - started
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+def measure_cold_import(runs=DEFAULT_RUNS):
+    samples = []
+    modules = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-c', PROBE],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(result['seconds'])
+        modules = result['modules']
+    return {
+        'median_seconds': statistics.median(samples),
+        'min_seconds': min(samples),
+        'max_seconds': max(samples),
+        'eager_modules': [module for module in LAZY_MODULES if module in modules],
+    }
+
+def check_cold_start(max_seconds=DEFAULT_MAX_IMPORT_SECONDS, runs=DEFAULT_RUNS):
+    result = measure_cold_import(runs)
+    failures = []
+    if result['eager_modules']:
+        failures.append(f"modules imported eagerly: {', '.join(result['eager_modules'])}")
+    if result['median_seconds'] > max_seconds:
+        failures.append(f"median cold import {result['median_seconds']:.3f}s exceeds {max_seconds:.3f}s")
+    result['failures'] = failures
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time check for the PersephAI package")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_IMPORT_SECONDS)
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    args = parser.parse_args()
+
+    result = check_cold_start(args.max_seconds, args.runs)
+    if args.json:
+        print(json.dumps(result, indent=4))
+    else:
+        print(f"cold import: median {result['median_seconds']:.3f}s (min {result['min_seconds']:.3f}s, max {result['max_seconds']:.3f}s)")
+        for failure in result['failures']:
+            print(f"REGRESSION: {failure}")
+    sys.exit(1 if result['failures'] else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+import argparse
+import base64
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from src.benchmarks.mocks import DEFAULT_SEED, NullCache
+from src.benchmarks.runner import percentile
+from src.utils.metrics import metrics
+
+DEFAULT_RATE = 50.0
+DEFAULT_WORKERS = 8
+DEFAULT_DURATION = 30.0
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_KEY_ENV_VAR = 'PERSEPHAI_LOADGEN_KEY'
+ARRIVAL_PROCESSES = ('uniform', 'poisson')
+
+def load_prompts(path):
+    prompts = []
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                prompts.append(json.loads(line)['prompt'])
+            else:
+                prompts.append(line)
+    if not prompts:
+        raise ValueError(f"No prompts found in {path}")
+    return prompts
+
+def classify_result(result):
+    if result is None:
+        return 'failed'
+    results = result if isinstance(result, list) else [result]
+    if not results:
+        return 'no_instructions'
+    if any(item is None for item in results):
+        return 'send_failed'
+    if any(isinstance(item, dict) and item.get('error') for item in results):
+        return 'rpc_error'
+    return None
+
+def arrival_offsets(rate, count, process='uniform', seed=DEFAULT_SEED):
+    if process not in ARRIVAL_PROCESSES:
+        raise ValueError(f"Unknown arrival process: {process}")
+    generator = random.Random(seed)
+    offset = 0.0
+    for _ in range(count):
+        yield offset
+        offset += generator.expovariate(rate) if process == 'poisson' else 1.0 / rate
+
+def _ensure_key(key_env_var):
+    if not os.getenv(key_env_var):
+        from solana.keypair import Keypair
+        os.environ[key_env_var] = base64.b64encode(Keypair().secret_key).decode('utf-8')
+
+def create_worker(llm_url, rpc_url, key_env_var=DEFAULT_KEY_ENV_VAR, api_key='loadgen', grammar_fast_path=True, use_cache=True):
+    from src.main import PersephAI
+    from src.parser.deepseek import DeepSeekInterface
+    from src.parser.parser import InstructionParser
+    from src.utils.rpc_pool import RpcPool
+
+    _ensure_key(key_env_var)
+    interface = DeepSeekInterface(api_key, cache=None if use_cache else NullCache(), host=llm_url)
+    parser = InstructionParser(api_key, grammar_fast_path=grammar_fast_path, interface=interface)
+    return PersephAI(api_key, key_env_var, rpc_pool=RpcPool([rpc_url]), parser=parser)
+
+class LoadGenerator:
+    def __init__(self, workers, prompts, rate, count, arrival='uniform', max_queue=DEFAULT_MAX_QUEUE, seed=DEFAULT_SEED):
+        self.workers = workers
+        self.prompts = prompts
+        self.rate = rate
+        self.count = count
+        self.arrival = arrival
+        self.max_queue = max_queue
+        self.seed = seed
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._response_times = []
+        self._service_times = []
+        self._errors = Counter()
+        self._completed = 0
+        self._dropped = 0
+        self._max_depth = 0
+        self._last_completion = None
+
+    def _record(self, scheduled, started, finished, error):
+        with self._lock:
+            self._response_times.append(finished - scheduled)
+            self._service_times.append(finished - started)
+            self._completed += 1
+            self._last_completion = finished
+            if error is not None:
+                self._errors[error] += 1
+
+    def _work(self, agent):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            scheduled, prompt = item
+            started = time.perf_counter()
+            metrics.observe('queue_wait', started - scheduled)
+            try:
+                error = classify_result(agent.run(prompt))
+            except Exception as exception:
+                error = type(exception).__name__
+            finished = time.perf_counter()
+            metrics.observe('run', finished - started, error=error is not None)
+            self._record(scheduled, started, finished, error)
+
+    def run(self):
+        threads = [
+            threading.Thread(target=self._work, args=(agent,), name=f"loadgen-worker-{index}", daemon=True)
+            for index, agent in enumerate(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        generator = random.Random(self.seed)
+        started = time.perf_counter()
+        for offset in arrival_offsets(self.rate, self.count, self.arrival, self.seed):
+            scheduled = started + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            depth = self._queue.qsize()
+            self._max_depth = max(self._max_depth, depth)
+            if depth >= self.max_queue:
+                self._dropped += 1
+                continue
+            self._queue.put((scheduled, generator.choice(self.prompts)))
+        offered_elapsed = time.perf_counter() - started
+
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+        return self.report(started, offered_elapsed)
+
+    def report(self, started, offered_elapsed):
+        response_times = sorted(self._response_times)
+        service_times = sorted(self._service_times)
+        elapsed = (self._last_completion - started) if self._last_completion else offered_elapsed
+        failed = sum(self._errors.values())
+        return {
+            'config': {
+                'workers': len(self.workers),
+                'target_rate': self.rate,
+                'requests': self.count,
+                'arrival': self.arrival,
+                'prompts': len(self.prompts),
+            },
+            'offered_rate': self.count / offered_elapsed if offered_elapsed else None,
+            'throughput': self._completed / elapsed if elapsed else None,
+            'goodput': (self._completed - failed) / elapsed if elapsed else None,
+            'completed': self._completed,
+            'dropped': self._dropped,
+            'max_queue_depth': self._max_depth,
+            'errors': dict(self._errors),
+            'response_time': _distribution(response_times),
+            'service_time': _distribution(service_times),
+            'stages': _stage_breakdown(metrics.snapshot()),
+        }
+
+def _distribution(ordered):
+    if not ordered:
+        return {}
+    return {
+        'mean_ms': sum(ordered) / len(ordered) * 1e3,
+        'p50_ms': percentile(ordered, 0.5) * 1e3,
+        'p90_ms': percentile(ordered, 0.9) * 1e3,
+        'p99_ms': percentile(ordered, 0.99) * 1e3,
+        'max_ms': ordered[-1] * 1e3,
+    }
+
+def _stage_breakdown(snapshot):
+    stages = {}
+    for stage, series in snapshot['stages'].items():
+        count = sum(entry['count'] for entry in series)
+        stages[stage] = {
+            'count': count,
+            'errors': sum(entry['errors'] for entry in series),
+            'mean_ms': sum(entry['sum'] for entry in series) / count * 1e3 if count else None,
+            'p50_ms': max((entry['p50'] for entry in series if entry['p50'] is not None), default=None),
+            'p99_ms': max((entry['p99'] for entry in series if entry['p99'] is not None), default=None),
+        }
+        for key in ('p50_ms', 'p99_ms'):
+            if stages[stage][key] is not None:
+                stages[stage][key] *= 1e3
+    return stages
+
+def print_report(report):
+    print(f"offered {report['offered_rate']:.1f} req/s, throughput {report['throughput']:.1f} req/s, "
+          f"goodput {report['goodput']:.1f} req/s")
+    print(f"completed {report['completed']}, dropped {report['dropped']}, max queue depth {report['max_queue_depth']}")
+    for name in ('response_time', 'service_time'):
+        distribution = report[name]
+        if distribution:
+            print(f"{name:<14} p50 {distribution['p50_ms']:.1f}ms  p90 {distribution['p90_ms']:.1f}ms  "
+                  f"p99 {distribution['p99_ms']:.1f}ms  max {distribution['max_ms']:.1f}ms")
+    if report['errors']:
+        print("errors: " + ", ".join(f"{kind}={count}" for kind, count in sorted(report['errors'].items())))
+    print(f"{'stage':<40}{'count':>9}{'errors':>8}{'mean (ms)':>11}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for stage, result in sorted(report['stages'].items()):
+        mean = f"{result['mean_ms']:>11.2f}" if result['mean_ms'] is not None else f"{'-':>11}"
+        p50 = f"{result['p50_ms']:>10.2f}" if result['p50_ms'] is not None else f"{'-':>10}"
+        p99 = f"{result['p99_ms']:>10.2f}" if result['p99_ms'] is not None else f"{'-':>10}"
+        print(f"{stage:<40}{result['count']:>9}{result['errors']:>8}{mean}{p50}{p99}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded prompts through PersephAI workers at an open-loop rate")
+    parser.add_argument('prompts', help="File with one prompt per line, or JSON lines with a 'prompt' field")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Target arrivals per second")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="Seconds of traffic to offer")
+    parser.add_argument('--count', type=int, help="Number of requests to offer; overrides --duration")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Number of PersephAI instances")
+    parser.add_argument('--arrival', choices=ARRIVAL_PROCESSES, default='uniform')
+    parser.add_argument('--max-queue', type=int, default=DEFAULT_MAX_QUEUE, help="Drop arrivals beyond this backlog")
+    parser.add_argument('--llm-url', help="LLM endpoint; starts a local stand-in when omitted")
+    parser.add_argument('--rpc-url', help="Solana JSON-RPC endpoint; starts a local stand-in when omitted")
+    parser.add_argument('--llm-latency', type=float, default=0.05, help="Stand-in LLM latency in seconds")
+    parser.add_argument('--rpc-latency', type=float, default=0.01, help="Stand-in RPC latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra uniform stand-in latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of stand-in calls that fail")
+    parser.add_argument('--no-grammar', action='store_true', help="Send every prompt to the LLM")
+    parser.add_argument('--no-cache', action='store_true', help="Disable the LLM response cache")
+    parser.add_argument('--key-env', default=DEFAULT_KEY_ENV_VAR, help="Environment variable holding the signing key")
+    parser.add_argument('--metrics-port', type=int, help="Also serve live Prometheus metrics on this port")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    from src.benchmarks.servers import start_llm_server, start_rpc_server
+    from src.utils.metrics import start_metrics_server
+
+    prompts = load_prompts(args.prompts)
+    count = args.count if args.count is not None else int(args.rate * args.duration)
+    servers = []
+    if args.llm_url is None:
+        servers.append(start_llm_server(latency=args.llm_latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed))
+        args.llm_url = servers[-1].url
+    if args.rpc_url is None:
+        servers.append(start_rpc_server(latency=args.rpc_latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed))
+        args.rpc_url = servers[-1].url
+
+    metrics.reset()
+    metrics.enable()
+    metrics_server = start_metrics_server(args.metrics_port) if args.metrics_port else None
+    workers = [
+        create_worker(args.llm_url, args.rpc_url, args.key_env, grammar_fast_path=not args.no_grammar, use_cache=not args.no_cache)
+        for _ in range(args.workers)
+    ]
+    try:
+        report = LoadGenerator(workers, prompts, args.rate, count, args.arrival, args.max_queue, args.seed).run()
+    finally:
+        for worker in workers:
+            worker.close()
+            worker.client.close()
+        for server in servers:
+            server.close()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        metrics.disable()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == '__main__':
+    main()
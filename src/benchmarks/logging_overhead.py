@@ -0,0 +1,79 @@
+import argparse
+import base64
+import logging
+import os
+import time
+from solana.keypair import Keypair
+from src.main import PersephAI
+from src.benchmarks.mocks import MockRpcClient
+from src.utils.log import configure_production_logging
+
+DEFAULT_ITERATIONS = 2000
+KEY_ENV_VAR = 'PERSEPHAI_BENCHMARK_KEY'
+MODES = ('disabled', 'production', 'sampled', 'debug')
+
+def _configure(mode, sink):
+    logging.disable(logging.NOTSET)
+    if mode == 'disabled':
+        logging.disable(logging.CRITICAL)
+    elif mode == 'production':
+        configure_production_logging(stream=sink)
+    elif mode == 'sampled':
+        configure_production_logging(stream=sink)
+        logging.getLogger('src.main.events').setLevel(logging.INFO)
+    elif mode == 'debug':
+        configure_production_logging(level=logging.DEBUG, structured=False, stream=sink)
+
+def _reset():
+    logging.disable(logging.NOTSET)
+    logging.getLogger('src.main.events').setLevel(logging.NOTSET)
+
+def create_agent():
+    os.environ[KEY_ENV_VAR] = base64.b64encode(Keypair().secret_key).decode('utf-8')
+    agent = PersephAI('unused', KEY_ENV_VAR, rpc_pool=MockRpcClient())
+    agent.blockhash_provider.refresh()
+    return agent
+
+def measure(agent, command, iterations):
+    agent.run(command)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        agent.run(command)
+    return (time.perf_counter() - started) / iterations
+
+def run(iterations=DEFAULT_ITERATIONS):
+    agent = create_agent()
+    command = f"transfer 0.5 SOL to {Keypair().public_key}"
+    results = {}
+    try:
+        with open(os.devnull, 'w') as sink:
+            for mode in MODES:
+                _configure(mode, sink)
+                try:
+                    results[mode] = measure(agent, command, iterations)
+                finally:
+                    _reset()
+    finally:
+        agent.close()
+
+    baseline = results['disabled']
+    return {
+        mode: {
+            'per_run_us': elapsed * 1e6,
+            'overhead_us': (elapsed - baseline) * 1e6,
+            'overhead_pct': (elapsed - baseline) / baseline * 100 if baseline else None,
+        }
+        for mode, elapsed in results.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead per PersephAI.run on the grammar fast path")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'per run (us)':>14}{'overhead (us)':>16}{'overhead':>10}")
+    for mode, result in run(args.iterations).items():
+        print(f"{mode:<12}{result['per_run_us']:>14.1f}{result['overhead_us']:>16.1f}{result['overhead_pct']:>9.1f}%")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from base58 import b58encode
+
+DEFAULT_SEED = 1234
+DEFAULT_BLOCK_HEIGHT = 250_000_000
+BLOCKHASH_VALIDITY = 150
+SIGNATURE_LENGTH = 64
+
+class MockBackendError(Exception):
+    pass
+
+class FaultInjector:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"Error rate must be between 0 and 1, got {error_rate}")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = bool(self.error_rate) and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    def inject(self, operation):
+        delay, failed = self._draw()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise MockBackendError(f"Injected failure in {operation}")
+
+    async def inject_async(self, operation):
+        delay, failed = self._draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            raise MockBackendError(f"Injected failure in {operation}")
+
+    def stats(self):
+        return {'calls': self.calls, 'errors': self.errors}
+
+def echo_responder(messages):
+    return next((message['content'] for message in messages if message['role'] == 'user'), '')
+
+def _completion(content):
+    return {'choices': [{'message': {'role': 'assistant', 'content': content}}]}
+
+def _stream_chunks(content, chunk_size):
+    for offset in range(0, len(content), chunk_size):
+        yield {'choices': [{'delta': {'content': content[offset:offset + chunk_size]}}]}
+
+class MockChatClient:
+    def __init__(self, responder=echo_responder, latency=0.0, jitter=0.0, error_rate=0.0, seed=DEFAULT_SEED,
+                 stream_chunk_size=16):
+        self.responder = responder
+        self.stream_chunk_size = stream_chunk_size
+        self.injector = FaultInjector(latency, jitter, error_rate, seed)
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        self.injector.inject('chat')
+        content = self.responder(messages)
+        if stream:
+            return _stream_chunks(content, self.stream_chunk_size)
+        return _completion(content)
+
+    def stats(self):
+        return self.injector.stats()
+
+class MockAsyncChatClient(MockChatClient):
+    async def chat(self, model, messages, stream=False, **kwargs):
+        await self.injector.inject_async('chat')
+        content = self.responder(messages)
+        if stream:
+            return self._stream(content)
+        return _completion(content)
+
+    async def _stream(self, content):
+        for chunk in _stream_chunks(content, self.stream_chunk_size):
+            yield chunk
+
+class NullCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def invalidate(self, key=None):
+        pass
+
+    def stats(self):
+        return {'hits': 0, 'disk_hits': 0, 'misses': 0, 'hit_rate': 0.0, 'size': 0}
+
+    def close(self):
+        pass
+
+def _fake_hash(seed):
+    return b58encode(hashlib.sha256(seed).digest()).decode('utf-8')
+
+class MockRpcClient:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=DEFAULT_SEED, accounts=None,
+                 confirmation_status='finalized'):
+        self.accounts = accounts if accounts is not None else {}
+        self.confirmation_status = confirmation_status
+        self.block_height = DEFAULT_BLOCK_HEIGHT
+        self.sent = {}
+        self._lock = threading.Lock()
+        self.injector = FaultInjector(latency, jitter, error_rate, seed)
+
+    def _advance(self):
+        with self._lock:
+            self.block_height += 1
+            return self.block_height
+
+    def get_latest_blockhash(self, *args, **kwargs):
+        self.injector.inject('get_latest_blockhash')
+        height = self._advance()
+        return {'result': {
+            'context': {'slot': height},
+            'value': {'blockhash': _fake_hash(height.to_bytes(8, 'little')), 'lastValidBlockHeight': height + BLOCKHASH_VALIDITY},
+        }}
+
+    def get_block_height(self, *args, **kwargs):
+        self.injector.inject('get_block_height')
+        with self._lock:
+            return {'result': self.block_height}
+
+    def send_raw_transaction(self, raw_transaction, opts=None):
+        self.injector.inject('send_raw_transaction')
+        signature = b58encode(bytes(raw_transaction)[1:1 + SIGNATURE_LENGTH]).decode('utf-8')
+        with self._lock:
+            self.sent[signature] = raw_transaction
+        return {'result': signature}
+
+    def get_signature_statuses(self, signatures, *args, **kwargs):
+        self.injector.inject('get_signature_statuses')
+        with self._lock:
+            known = set(self.sent)
+            block_height = self.block_height
+        status = {'slot': block_height, 'confirmations': None, 'err': None, 'confirmationStatus': self.confirmation_status}
+        return {'result': {'value': [dict(status) if signature in known else None for signature in signatures]}}
+
+    def get_account_info(self, pubkey, *args, **kwargs):
+        self.injector.inject('get_account_info')
+        return {'result': {'value': self.accounts.get(str(pubkey))}}
+
+    def get_multiple_accounts(self, pubkeys, *args, **kwargs):
+        self.injector.inject('get_multiple_accounts')
+        return {'result': {'value': [self.accounts.get(str(pubkey)) for pubkey in pubkeys]}}
+
+    def stats(self):
+        return dict(self.injector.stats(), sent=len(self.sent))
+
+    def close(self):
+        pass
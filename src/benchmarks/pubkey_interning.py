@@ -0,0 +1,61 @@
+import argparse
+import timeit
+from solana.keypair import Keypair
+from solana.system_program import SYS_PROGRAM_ID
+from src.utils.pubkeys import clear_pubkey_cache, pubkey_cache_info
+from src.instructions.system import create_transfer_sol_instruction
+from src.instructions.token import create_transfer_token_instruction
+from src.instructions.staking import create_stake_account_instruction
+from src.instructions.pumpfun import create_pump_action_instruction
+
+DEFAULT_ITERATIONS = 20000
+
+def _addresses(count):
+    return [str(Keypair().public_key) for _ in range(count)]
+
+def builder_cases():
+    sender, recipient, source, dest, mint, stake_account = _addresses(6)
+    program = str(SYS_PROGRAM_ID)
+    return {
+        'transfer_sol': lambda: create_transfer_sol_instruction(sender, recipient, 1000),
+        'transfer_token': lambda: create_transfer_token_instruction(source, dest, sender, 1000, mint, 6),
+        'stake_account': lambda: create_stake_account_instruction(stake_account, sender, 1000),
+        'pump_action': lambda: create_pump_action_instruction(sender, program, b'\x01'),
+    }
+
+def measure(build, iterations, interned):
+    if interned:
+        build()
+        return timeit.timeit(build, number=iterations) / iterations
+
+    def uncached():
+        clear_pubkey_cache()
+        build()
+
+    overhead = timeit.timeit(clear_pubkey_cache, number=iterations) / iterations
+    return timeit.timeit(uncached, number=iterations) / iterations - overhead
+
+def run(iterations=DEFAULT_ITERATIONS):
+    results = {}
+    for name, build in builder_cases().items():
+        before = measure(build, iterations, interned=False)
+        after = measure(build, iterations, interned=True)
+        results[name] = {
+            'before_us': before * 1e6,
+            'after_us': after * 1e6,
+            'speedup': before / after if after else None,
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-instruction build cost with and without PublicKey interning")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    print(f"{'builder':<16}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, result in run(args.iterations).items():
+        print(f"{name:<16}{result['before_us']:>14.2f}{result['after_us']:>14.2f}{result['speedup']:>9.2f}x")
+    print(pubkey_cache_info())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from src.benchmarks.mocks import DEFAULT_SEED
+from src.benchmarks.scenarios import create_scenarios
+
+DEFAULT_ITERATIONS = 1000
+DEFAULT_WARMUP = 50
+DEFAULT_MEMORY_ITERATIONS = 100
+DEFAULT_TOLERANCE = 0.2
+RESULTS_VERSION = 1
+
+def percentile(ordered, q):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def _call(scenario):
+    try:
+        return bool(scenario())
+    except Exception:
+        return False
+
+def measure_memory(scenario, iterations):
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(iterations):
+            _call(scenario)
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_kb': (peak - before) / 1024,
+        'retained_bytes_per_op': (after - before) / iterations,
+    }
+
+def run_scenario(scenario, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, memory_iterations=DEFAULT_MEMORY_ITERATIONS):
+    for _ in range(warmup):
+        _call(scenario)
+
+    latencies = []
+    errors = 0
+    clock = time.perf_counter
+    started = clock()
+    for _ in range(iterations):
+        call_started = clock()
+        ok = _call(scenario)
+        latencies.append(clock() - call_started)
+        if not ok:
+            errors += 1
+    elapsed = clock() - started
+
+    latencies.sort()
+    result = {
+        'iterations': iterations,
+        'errors': errors,
+        'ops_per_sec': iterations / elapsed if elapsed else None,
+        'mean_us': sum(latencies) / iterations * 1e6,
+        'p50_us': percentile(latencies, 0.5) * 1e6,
+        'p99_us': percentile(latencies, 0.99) * 1e6,
+    }
+    if memory_iterations:
+        result['memory'] = measure_memory(scenario, memory_iterations)
+    return result
+
+def run(iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP, memory_iterations=DEFAULT_MEMORY_ITERATIONS, pattern=None,
+        chat_latency=0.0, rpc_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    scenarios, cleanups = create_scenarios(chat_latency, rpc_latency, error_rate, seed)
+    selected = re.compile(pattern) if pattern else None
+    results = {}
+    try:
+        for name, scenario in scenarios.items():
+            if selected is not None and not selected.search(name):
+                continue
+            results[name] = run_scenario(scenario, iterations, warmup, memory_iterations)
+    finally:
+        for cleanup in cleanups:
+            cleanup()
+
+    return {
+        'version': RESULTS_VERSION,
+        'timestamp': time.time(),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'config': {
+            'iterations': iterations,
+            'warmup': warmup,
+            'memory_iterations': memory_iterations,
+            'chat_latency': chat_latency,
+            'rpc_latency': rpc_latency,
+            'error_rate': error_rate,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for name, result in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        if previous['ops_per_sec'] and result['ops_per_sec'] < previous['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s vs {previous['ops_per_sec']:.0f} ops/s")
+        if previous['p99_us'] and result['p99_us'] > previous['p99_us'] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['p99_us']:.1f}us vs {previous['p99_us']:.1f}us")
+    return regressions
+
+def print_report(report):
+    print(f"{'scenario':<40}{'ops/s':>12}{'p50 (us)':>11}{'p99 (us)':>11}{'peak (KB)':>11}{'errors':>8}")
+    for name, result in report['results'].items():
+        memory = result.get('memory')
+        peak = f"{memory['peak_kb']:>11.1f}" if memory else f"{'-':>11}"
+        print(f"{name:<40}{result['ops_per_sec']:>12.0f}{result['p50_us']:>11.1f}{result['p99_us']:>11.1f}{peak}{result['errors']:>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline PersephAI benchmarks against mock LLM and RPC backends")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    parser.add_argument('--memory-iterations', type=int, default=DEFAULT_MEMORY_ITERATIONS,
+                        help="Iterations traced with tracemalloc; 0 disables memory measurement")
+    parser.add_argument('--filter', dest='pattern', help="Only run scenarios whose name matches this regex")
+    parser.add_argument('--chat-latency', type=float, default=0.0, help="Mock LLM latency in seconds")
+    parser.add_argument('--rpc-latency', type=float, default=0.0, help="Mock RPC latency in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of mock backend calls that fail")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--baseline', help="JSON report to compare against; exits 1 on regression")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.warmup, args.memory_iterations, args.pattern,
+                 args.chat_latency, args.rpc_latency, args.error_rate, args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+import base64
+import os
+from solana.keypair import Keypair
+from solana.system_program import SYS_PROGRAM_ID
+from src.benchmarks.mocks import (
+    DEFAULT_SEED,
+    MockAsyncChatClient,
+    MockChatClient,
+    MockRpcClient,
+    NullCache
+)
+
+KEY_ENV_VAR = 'PERSEPHAI_BENCHMARK_KEY'
+
+def _addresses(count):
+    return [str(Keypair().public_key) for _ in range(count)]
+
+def command_text(recipients):
+    return ' and '.join(f"transfer {index + 1}.5 SOL to {recipient}" for index, recipient in enumerate(recipients))
+
+def builder_scenarios():
+    from src.instructions.system import create_transfer_sol_instruction, create_account_instruction
+    from src.instructions.token import (
+        create_initialize_token_account_instruction,
+        create_transfer_token_instruction,
+        create_mint_to_instruction,
+        create_approve_instruction
+    )
+    from src.instructions.staking import (
+        create_stake_account_instruction,
+        create_deposit_stake_instruction,
+        create_withdraw_stake_instruction,
+        create_delegate_stake_instruction
+    )
+    from src.instructions.nft import (
+        create_metadata_instruction,
+        create_update_metadata_instruction,
+        create_mint_nft_instruction,
+        create_transfer_nft_instruction
+    )
+    from src.instructions.raydium import (
+        create_swap_instruction,
+        create_add_liquidity_instruction,
+        create_remove_liquidity_instruction,
+        create_stake_liquidity_instruction
+    )
+    from src.instructions.pumpfun import (
+        create_pump_action_instruction,
+        create_fun_action_instruction,
+        create_pumpfun_composite_instruction
+    )
+    from src.instructions.templates import TRANSFER_SOL_TEMPLATE, TRANSFER_TOKEN_TEMPLATE
+
+    user, other, mint, account, pool, validator, metadata, edition, token_a, token_b = _addresses(10)
+    program = str(SYS_PROGRAM_ID)
+    metadata_data = {'name': 'Benchmark', 'symbol': 'BENCH', 'uri': 'https://example.com/nft.json', 'seller_fee_basis_points': 500}
+    return {
+        'builders.system.transfer_sol': lambda: create_transfer_sol_instruction(user, other, 1000),
+        'builders.system.create_account': lambda: create_account_instruction(account, user, 1000, 165),
+        'builders.token.initialize_account': lambda: create_initialize_token_account_instruction(account, mint, user),
+        'builders.token.transfer': lambda: create_transfer_token_instruction(account, other, user, 1000, mint, 6),
+        'builders.token.mint_to': lambda: create_mint_to_instruction(mint, account, user, 1000, 6),
+        'builders.token.approve': lambda: create_approve_instruction(account, other, user, 1000, mint, 6),
+        'builders.staking.stake_account': lambda: create_stake_account_instruction(account, user, 1000),
+        'builders.staking.deposit': lambda: create_deposit_stake_instruction(pool, account, validator, user, 1000),
+        'builders.staking.withdraw': lambda: create_withdraw_stake_instruction(pool, account, user, 1000),
+        'builders.staking.delegate': lambda: create_delegate_stake_instruction(account, validator, user),
+        'builders.nft.metadata': lambda: create_metadata_instruction(metadata, mint, user, user, metadata_data),
+        'builders.nft.update_metadata': lambda: create_update_metadata_instruction(metadata, user, metadata_data),
+        'builders.nft.mint': lambda: create_mint_nft_instruction(mint, account, user, metadata, edition),
+        'builders.nft.transfer': lambda: create_transfer_nft_instruction(mint, user, other, user),
+        'builders.raydium.swap': lambda: create_swap_instruction(user, pool, token_a, token_b, 1000, 990),
+        'builders.raydium.add_liquidity': lambda: create_add_liquidity_instruction(user, pool, token_a, token_b, 1000, 1000),
+        'builders.raydium.remove_liquidity': lambda: create_remove_liquidity_instruction(user, pool, token_a, 1000),
+        'builders.raydium.stake_liquidity': lambda: create_stake_liquidity_instruction(user, pool, token_a, 1000),
+        'builders.pumpfun.pump_action': lambda: create_pump_action_instruction(user, program, b'\x01'),
+        'builders.pumpfun.fun_action': lambda: create_fun_action_instruction(user, program, b'\x02'),
+        'builders.pumpfun.composite': lambda: create_pumpfun_composite_instruction(user, program, program, b'\x01', b'\x02'),
+        'builders.templates.transfer_sol': lambda: TRANSFER_SOL_TEMPLATE.build(sender=user, recipient=other, lamports=1000),
+        'builders.templates.transfer_token': lambda: TRANSFER_TOKEN_TEMPLATE.build(
+            source=account, mint=mint, destination=other, owner=user, amount=1000, decimals=6
+        ),
+    }
+
+def mapping_scenarios():
+    from src.parser.mappings import IncrementalScanner, map_deepseek_response_to_instructions, parse_command_grammar
+
+    text = command_text(_addresses(4))
+    chunks = [text[offset:offset + 16] for offset in range(0, len(text), 16)]
+
+    def incremental():
+        scanner = IncrementalScanner()
+        instructions = []
+        for chunk in chunks:
+            instructions.extend(scanner.feed(chunk))
+        instructions.extend(scanner.close())
+        return instructions
+
+    return {
+        'mappings.map_response': lambda: map_deepseek_response_to_instructions(text),
+        'mappings.command_grammar': lambda: parse_command_grammar(text),
+        'mappings.incremental_scanner': incremental,
+    }
+
+def create_parser(grammar_fast_path, chat_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    from src.parser.deepseek import DeepSeekInterface
+    from src.parser.parser import InstructionParser
+
+    interface = DeepSeekInterface(
+        'unused',
+        cache=NullCache(),
+        client=MockChatClient(latency=chat_latency, error_rate=error_rate, seed=seed),
+        async_client=MockAsyncChatClient(latency=chat_latency, error_rate=error_rate, seed=seed)
+    )
+    return InstructionParser('unused', grammar_fast_path=grammar_fast_path, interface=interface)
+
+def parser_scenarios(chat_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    text = command_text(_addresses(2))
+    grammar_parser = create_parser(True, chat_latency, error_rate, seed)
+    llm_parser = create_parser(False, chat_latency, error_rate, seed)
+    return {
+        'parser.parse_input.grammar': lambda: grammar_parser.parse_input(text),
+        'parser.parse_input.llm': lambda: llm_parser.parse_input(text),
+    }
+
+def create_agent(grammar_fast_path=True, chat_latency=0.0, rpc_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    from src.main import PersephAI
+
+    os.environ.setdefault(KEY_ENV_VAR, base64.b64encode(Keypair().secret_key).decode('utf-8'))
+    agent = PersephAI(
+        'unused',
+        KEY_ENV_VAR,
+        rpc_pool=MockRpcClient(latency=rpc_latency, error_rate=error_rate, seed=seed),
+        parser=create_parser(grammar_fast_path, chat_latency, error_rate, seed)
+    )
+    agent.blockhash_provider.refresh()
+    return agent
+
+def pipeline_scenarios(chat_latency=0.0, rpc_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    text = command_text(_addresses(2))
+    grammar_agent = create_agent(True, chat_latency, rpc_latency, error_rate, seed)
+    llm_agent = create_agent(False, chat_latency, rpc_latency, error_rate, seed)
+    scenarios = {
+        'persephai.run.grammar': lambda: grammar_agent.run(text),
+        'persephai.run.llm': lambda: llm_agent.run(text),
+    }
+    return scenarios, [grammar_agent.close, llm_agent.close]
+
+def create_scenarios(chat_latency=0.0, rpc_latency=0.0, error_rate=0.0, seed=DEFAULT_SEED):
+    scenarios = {}
+    scenarios.update(builder_scenarios())
+    scenarios.update(mapping_scenarios())
+    scenarios.update(parser_scenarios(chat_latency, error_rate, seed))
+    pipelines, cleanups = pipeline_scenarios(chat_latency, rpc_latency, error_rate, seed)
+    scenarios.update(pipelines)
+    return scenarios, cleanups
@@ -0,0 +1,139 @@
+import base64
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from base58 import b58decode
+from src.benchmarks.mocks import DEFAULT_SEED, MockBackendError, MockRpcClient, FaultInjector, echo_responder
+
+JSON_RPC_SERVER_ERROR = -32000
+JSON_RPC_METHOD_NOT_FOUND = -32601
+KEYED_METHODS = ('getAccountInfo', 'getMultipleAccounts', 'getSignatureStatuses')
+UNKEYED_METHODS = ('getBlockHeight', 'getLatestBlockhash')
+
+def _snake_case(method):
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', method).lower()
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class _ChatHandler(_JsonHandler):
+    def do_POST(self):
+        request = self._read_json()
+        try:
+            self.server.injector.inject('chat')
+        except MockBackendError as error:
+            self._send_json({'error': str(error)}, status=503)
+            return
+
+        content = self.server.responder(request.get('messages', []))
+        if not request.get('stream'):
+            self._send_json({
+                'model': request.get('model'),
+                'message': {'role': 'assistant', 'content': content},
+                'choices': [{'message': {'role': 'assistant', 'content': content}}],
+                'done': True,
+            })
+            return
+
+        lines = []
+        for offset in range(0, len(content), self.server.stream_chunk_size):
+            piece = content[offset:offset + self.server.stream_chunk_size]
+            lines.append(json.dumps({
+                'message': {'role': 'assistant', 'content': piece},
+                'choices': [{'delta': {'content': piece}}],
+                'done': False,
+            }))
+        lines.append(json.dumps({'message': {'role': 'assistant', 'content': ''}, 'choices': [{'delta': {}}], 'done': True}))
+        body = ('\n'.join(lines) + '\n').encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def _decode_transaction(params):
+    encoded = params[0]
+    config = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+    if config.get('encoding') == 'base64':
+        return base64.b64decode(encoded)
+    return b58decode(encoded)
+
+class _RpcHandler(_JsonHandler):
+    def _dispatch(self, request):
+        method = request.get('method', '')
+        params = request.get('params') or []
+        backend = self.server.backend
+        if method == 'getHealth':
+            return {'result': 'ok'}
+        if method == 'sendTransaction':
+            return backend.send_raw_transaction(_decode_transaction(params))
+        if method in KEYED_METHODS:
+            return getattr(backend, _snake_case(method))(params[0])
+        if method in UNKEYED_METHODS:
+            return getattr(backend, _snake_case(method))()
+        return {'error': {'code': JSON_RPC_METHOD_NOT_FOUND, 'message': f"Method not found: {method}"}}
+
+    def _respond(self, request):
+        try:
+            response = self._dispatch(request)
+        except MockBackendError as error:
+            response = {'error': {'code': JSON_RPC_SERVER_ERROR, 'message': str(error)}}
+        return dict(response, jsonrpc='2.0', id=request.get('id'))
+
+    def do_POST(self):
+        request = self._read_json()
+        if isinstance(request, list):
+            self._send_json([self._respond(item) for item in request])
+        else:
+            self._send_json(self._respond(request))
+
+class StandInServer:
+    def __init__(self, server):
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name=f"{type(server).__name__}-standin", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self):
+        return self._server.injector.stats()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+def start_llm_server(port=0, host='127.0.0.1', responder=echo_responder, latency=0.0, jitter=0.0, error_rate=0.0,
+                     seed=DEFAULT_SEED, stream_chunk_size=16):
+    server = ThreadingHTTPServer((host, port), _ChatHandler)
+    server.daemon_threads = True
+    server.injector = FaultInjector(latency, jitter, error_rate, seed)
+    server.responder = responder
+    server.stream_chunk_size = stream_chunk_size
+    return StandInServer(server)
+
+def start_rpc_server(port=0, host='127.0.0.1', latency=0.0, jitter=0.0, error_rate=0.0, seed=DEFAULT_SEED, accounts=None):
+    server = ThreadingHTTPServer((host, port), _RpcHandler)
+    server.daemon_threads = True
+    server.backend = MockRpcClient(latency, jitter, error_rate, seed, accounts)
+    server.injector = server.backend.injector
+    return StandInServer(server)
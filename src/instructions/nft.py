@@ -1,5 +1,6 @@
 from solana.transaction import TransactionInstruction
-from solana.publickey import PublicKey
+from src.utils.pubkeys import intern_pubkey
+from src.utils.derivation import derive_ata, derive_master_edition, derive_metadata
 from metaplex.instructions import (
     create_metadata_account,
     CreateMetadataAccountParams,
@@ -12,79 +13,106 @@ from metaplex.instructions import (
 )
 import logging
 
+logger = logging.getLogger(__name__)
+
 def create_metadata_instruction(metadata_pubkey, mint_pubkey, mint_authority_pubkey, update_authority_pubkey, metadata_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating metadata instruction for NFT with mint {mint_pubkey}")
+    logger.debug("Creating metadata instruction for NFT with mint %s", mint_pubkey)
 
     try:
         instruction = create_metadata_account(
             CreateMetadataAccountParams(
-                metadata=PublicKey(metadata_pubkey),
-                mint=PublicKey(mint_pubkey),
-                mint_authority=PublicKey(mint_authority_pubkey),
-                update_authority=PublicKey(update_authority_pubkey),
+                metadata=intern_pubkey(metadata_pubkey),
+                mint=intern_pubkey(mint_pubkey),
+                mint_authority=intern_pubkey(mint_authority_pubkey),
+                update_authority=intern_pubkey(update_authority_pubkey),
                 data=metadata_data
             )
         )
-        logger.debug(f"Metadata instruction created: {instruction}")
+        logger.debug("Metadata instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating metadata instruction: {error}")
+        logger.error("Error creating metadata instruction: %s", error)
         return None
 
 def create_update_metadata_instruction(metadata_pubkey, update_authority_pubkey, new_metadata_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating update metadata instruction for metadata {metadata_pubkey}")
+    logger.debug("Creating update metadata instruction for metadata %s", metadata_pubkey)
 
     try:
         instruction = update_metadata_account(
             UpdateMetadataAccountParams(
-                metadata=PublicKey(metadata_pubkey),
-                update_authority=PublicKey(update_authority_pubkey),
+                metadata=intern_pubkey(metadata_pubkey),
+                update_authority=intern_pubkey(update_authority_pubkey),
                 data=new_metadata_data
             )
         )
-        logger.debug(f"Update metadata instruction created: {instruction}")
+        logger.debug("Update metadata instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating update metadata instruction: {error}")
+        logger.error("Error creating update metadata instruction: %s", error)
         return None
 
 def create_mint_nft_instruction(mint_pubkey, destination_pubkey, mint_authority_pubkey, metadata_pubkey, master_edition_pubkey):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating mint NFT instruction for mint {mint_pubkey}")
+    logger.debug("Creating mint NFT instruction for mint %s", mint_pubkey)
 
     try:
         instruction = mint_nft(
             MintNFTParams(
-                mint=PublicKey(mint_pubkey),
-                destination=PublicKey(destination_pubkey),
-                mint_authority=PublicKey(mint_authority_pubkey),
-                metadata=PublicKey(metadata_pubkey),
-                master_edition=PublicKey(master_edition_pubkey)
+                mint=intern_pubkey(mint_pubkey),
+                destination=intern_pubkey(destination_pubkey),
+                mint_authority=intern_pubkey(mint_authority_pubkey),
+                metadata=intern_pubkey(metadata_pubkey),
+                master_edition=intern_pubkey(master_edition_pubkey)
             )
         )
-        logger.debug(f"Mint NFT instruction created: {instruction}")
+        logger.debug("Mint NFT instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating mint NFT instruction: {error}")
+        logger.error("Error creating mint NFT instruction: %s", error)
         return None
 
 def create_transfer_nft_instruction(nft_pubkey, source_pubkey, destination_pubkey, owner_pubkey):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating transfer NFT instruction for NFT {nft_pubkey}")
+    logger.debug("Creating transfer NFT instruction for NFT %s", nft_pubkey)
 
     try:
         instruction = transfer_nft(
             TransferNFTParams(
-                nft=PublicKey(nft_pubkey),
-                source=PublicKey(source_pubkey),
-                destination=PublicKey(destination_pubkey),
-                owner=PublicKey(owner_pubkey)
+                nft=intern_pubkey(nft_pubkey),
+                source=intern_pubkey(source_pubkey),
+                destination=intern_pubkey(destination_pubkey),
+                owner=intern_pubkey(owner_pubkey)
             )
         )
-        logger.debug(f"Transfer NFT instruction created: {instruction}")
+        logger.debug("Transfer NFT instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating transfer NFT instruction: {error}")
-        return None
\ No newline at end of file
+        logger.error("Error creating transfer NFT instruction: %s", error)
+        return None
+
+def create_metadata_instruction_for_mint(mint_pubkey, mint_authority_pubkey, update_authority_pubkey, metadata_data):
+    return create_metadata_instruction(
+        derive_metadata(mint_pubkey),
+        mint_pubkey,
+        mint_authority_pubkey,
+        update_authority_pubkey,
+        metadata_data
+    )
+
+def create_update_metadata_instruction_for_mint(mint_pubkey, update_authority_pubkey, new_metadata_data):
+    return create_update_metadata_instruction(derive_metadata(mint_pubkey), update_authority_pubkey, new_metadata_data)
+
+def create_mint_nft_instruction_for_owner(mint_pubkey, owner_pubkey, mint_authority_pubkey):
+    return create_mint_nft_instruction(
+        mint_pubkey,
+        derive_ata(owner_pubkey, mint_pubkey),
+        mint_authority_pubkey,
+        derive_metadata(mint_pubkey),
+        derive_master_edition(mint_pubkey)
+    )
+
+def create_transfer_nft_instruction_for_owners(nft_pubkey, owner_pubkey, recipient_pubkey):
+    return create_transfer_nft_instruction(
+        nft_pubkey,
+        derive_ata(owner_pubkey, nft_pubkey),
+        derive_ata(recipient_pubkey, nft_pubkey),
+        owner_pubkey
+    )
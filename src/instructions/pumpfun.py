@@ -1,52 +1,51 @@
-from solana.transaction import TransactionInstruction
-from solana.publickey import PublicKey
+from solana.transaction import AccountMeta, TransactionInstruction
+from src.utils.pubkeys import intern_pubkey
 import logging
 
+logger = logging.getLogger(__name__)
+
 def create_pump_action_instruction(user_pubkey, pump_program_pubkey, action_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating pump action instruction for user {user_pubkey}")
+    logger.debug("Creating pump action instruction for user %s", user_pubkey)
 
     try:
         instruction = TransactionInstruction(
-            program_id=PublicKey(pump_program_pubkey),
+            program_id=intern_pubkey(pump_program_pubkey),
             keys=[
-                {"pubkey": PublicKey(user_pubkey), "is_signer": True, "is_writable": True}
+                AccountMeta(pubkey=intern_pubkey(user_pubkey), is_signer=True, is_writable=True)
             ],
             data=action_data
         )
-        logger.debug(f"Pump action instruction created: {instruction}")
+        logger.debug("Pump action instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating pump action instruction: {error}")
+        logger.error("Error creating pump action instruction: %s", error)
         return None
 
 def create_fun_action_instruction(user_pubkey, fun_program_pubkey, action_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating fun action instruction for user {user_pubkey}")
+    logger.debug("Creating fun action instruction for user %s", user_pubkey)
 
     try:
         instruction = TransactionInstruction(
-            program_id=PublicKey(fun_program_pubkey),
+            program_id=intern_pubkey(fun_program_pubkey),
             keys=[
-                {"pubkey": PublicKey(user_pubkey), "is_signer": True, "is_writable": True}
+                AccountMeta(pubkey=intern_pubkey(user_pubkey), is_signer=True, is_writable=True)
             ],
             data=action_data
         )
-        logger.debug(f"Fun action instruction created: {instruction}")
+        logger.debug("Fun action instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating fun action instruction: {error}")
+        logger.error("Error creating fun action instruction: %s", error)
         return None
 
 def create_pumpfun_composite_instruction(user_pubkey, pump_program_pubkey, fun_program_pubkey, pump_data, fun_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating pumpfun composite instruction for user {user_pubkey}")
+    logger.debug("Creating pumpfun composite instruction for user %s", user_pubkey)
 
     try:
         pump_instruction = create_pump_action_instruction(user_pubkey, pump_program_pubkey, pump_data)
         fun_instruction = create_fun_action_instruction(user_pubkey, fun_program_pubkey, fun_data)
-        logger.debug(f"Pumpfun composite instructions created: {[pump_instruction, fun_instruction]}")
+        logger.debug("Pumpfun composite instructions created: %s, %s", pump_instruction, fun_instruction)
         return [pump_instruction, fun_instruction]
     except Exception as error:
-        logger.error(f"Error creating pumpfun composite instruction: {error}")
+        logger.error("Error creating pumpfun composite instruction: %s", error)
         return []
\ No newline at end of file
@@ -0,0 +1,279 @@
+import logging
+import threading
+import time
+from src.utils.accounts import TOKEN_ACCOUNT_AMOUNT_OFFSET, account_data, fetch_multiple_accounts, read_u64
+
+logger = logging.getLogger(__name__)
+
+BPS_DENOMINATOR = 10_000
+DEFAULT_FEE_BPS = 25
+DEFAULT_SLIPPAGE_BPS = 50
+DEFAULT_REFRESH_INTERVAL = 2.0
+DEFAULT_MAX_AGE = 30.0
+
+class PoolNotFoundError(Exception):
+    pass
+
+class StalePoolStateError(Exception):
+    pass
+
+class PoolState:
+    def __init__(self, pool, base_mint, quote_mint, base_vault, quote_vault, base_decimals, quote_decimals,
+                 fee_bps=DEFAULT_FEE_BPS, base_symbol=None, quote_symbol=None):
+        self.pool = str(pool)
+        self.base_mint = str(base_mint)
+        self.quote_mint = str(quote_mint)
+        self.base_vault = str(base_vault)
+        self.quote_vault = str(quote_vault)
+        self.base_decimals = base_decimals
+        self.quote_decimals = quote_decimals
+        self.fee_bps = fee_bps
+        self.base_symbol = base_symbol.upper() if base_symbol else None
+        self.quote_symbol = quote_symbol.upper() if quote_symbol else None
+        self.balances = None
+        self.updated_at = None
+
+    @property
+    def base_reserve(self):
+        return self.balances[0] if self.balances else None
+
+    @property
+    def quote_reserve(self):
+        return self.balances[1] if self.balances else None
+
+    def matches(self, token):
+        token = str(token)
+        return token in (self.base_mint, self.quote_mint) or token.upper() in (self.base_symbol, self.quote_symbol)
+
+    def is_base(self, token):
+        token = str(token)
+        return token == self.base_mint or (self.base_symbol is not None and token.upper() == self.base_symbol)
+
+    def reserves(self, input_token):
+        # Vault balances only. Raydium AMM v4 also counts funds on its OpenBook open orders and subtracts
+        # pending PnL, so quotes on pools with resting orders are approximate; min_amount_out absorbs the gap.
+        balances = self.balances or (None, None)
+        if self.is_base(input_token):
+            return balances
+        return balances[1], balances[0]
+
+    def mints(self, input_token):
+        if self.is_base(input_token):
+            return self.base_mint, self.quote_mint
+        return self.quote_mint, self.base_mint
+
+    def decimals(self, token):
+        return self.base_decimals if self.is_base(token) else self.quote_decimals
+
+    def age(self):
+        if self.updated_at is None:
+            return None
+        return time.monotonic() - self.updated_at
+
+def constant_product_out(amount_in, reserve_in, reserve_out, fee_bps=DEFAULT_FEE_BPS):
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_with_fee = amount_in * (BPS_DENOMINATOR - fee_bps)
+    return amount_in_with_fee * reserve_out // (reserve_in * BPS_DENOMINATOR + amount_in_with_fee)
+
+def minimum_amount_out(amount_out, slippage_bps=DEFAULT_SLIPPAGE_BPS):
+    return amount_out * (BPS_DENOMINATOR - slippage_bps) // BPS_DENOMINATOR
+
+def price_impact_bps(amount_in, amount_out, reserve_in, reserve_out):
+    if not amount_in or not reserve_in:
+        return 0
+    spot_out = amount_in * reserve_out / reserve_in
+    return int((1 - amount_out / spot_out) * BPS_DENOMINATOR) if spot_out else 0
+
+class PoolStateCache:
+    def __init__(self, client, refresh_interval=DEFAULT_REFRESH_INTERVAL, max_age=DEFAULT_MAX_AGE,
+                 default_slippage_bps=DEFAULT_SLIPPAGE_BPS):
+        self._client = client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.default_slippage_bps = default_slippage_bps
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._logger = self._setup_logger()
+        self.refresh_count = 0
+        self.refresh_errors = 0
+        self.last_refresh_latency = None
+
+    def _setup_logger(self):
+        logger.info("PoolStateCache initialized")
+        return logger
+
+    def add_pool(self, pool, base_mint, quote_mint, base_vault, quote_vault, base_decimals, quote_decimals,
+                 fee_bps=DEFAULT_FEE_BPS, base_symbol=None, quote_symbol=None):
+        state = PoolState(pool, base_mint, quote_mint, base_vault, quote_vault, base_decimals, quote_decimals,
+                          fee_bps, base_symbol, quote_symbol)
+        with self._lock:
+            self._pools[state.pool] = state
+        return state
+
+    def remove_pool(self, pool):
+        with self._lock:
+            self._pools.pop(str(pool), None)
+
+    def pools(self):
+        with self._lock:
+            return list(self._pools.values())
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="raydium-pool-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+    def _run(self):
+        self.refresh()
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def refresh(self, pools=None):
+        states = self.pools() if pools is None else [self._state(pool) for pool in pools]
+        if not states:
+            return 0
+        started = time.monotonic()
+        try:
+            vaults = [vault for state in states for vault in (state.base_vault, state.quote_vault)]
+            accounts = fetch_multiple_accounts(self._client, vaults)
+            updated = 0
+            with self._lock:
+                for state in states:
+                    base = account_data(accounts.get(state.base_vault))
+                    quote = account_data(accounts.get(state.quote_vault))
+                    if base is None or quote is None:
+                        self._logger.error("Missing vault account for pool %s", state.pool)
+                        continue
+                    state.balances = (read_u64(base, TOKEN_ACCOUNT_AMOUNT_OFFSET), read_u64(quote, TOKEN_ACCOUNT_AMOUNT_OFFSET))
+                    state.updated_at = started
+                    updated += 1
+                self.refresh_count += 1
+                self.last_refresh_latency = time.monotonic() - started
+            self._logger.debug("Refreshed %s pool(s) in %.3fs", updated, self.last_refresh_latency)
+            return updated
+        except Exception as error:
+            with self._lock:
+                self.refresh_errors += 1
+            self._logger.error("Error refreshing Raydium pool state: %s", error)
+            return 0
+
+    def _state(self, pool):
+        with self._lock:
+            state = self._pools.get(str(pool))
+        if state is None:
+            raise PoolNotFoundError(f"Unknown Raydium pool: {pool}")
+        return state
+
+    def get_state(self, pool, max_age=None):
+        state = self._state(pool)
+        max_age = self.max_age if max_age is None else max_age
+        age = state.age()
+        if age is None or age > max_age:
+            raise StalePoolStateError(f"Reserves for pool {pool} are missing or older than {max_age}s")
+        return state
+
+    def find_pool(self, input_token, output_token):
+        for state in self.pools():
+            if state.matches(input_token) and state.matches(output_token) and state.is_base(input_token) != state.is_base(output_token):
+                return state
+        raise PoolNotFoundError(f"No Raydium pool for {input_token} -> {output_token}")
+
+    def quote(self, pool, input_token, amount_in, slippage_bps=None):
+        state = self.get_state(pool.pool if isinstance(pool, PoolState) else pool)
+        reserve_in, reserve_out = state.reserves(input_token)
+        amount_out = constant_product_out(amount_in, reserve_in, reserve_out, state.fee_bps)
+        slippage_bps = self.default_slippage_bps if slippage_bps is None else slippage_bps
+        input_mint, output_mint = state.mints(input_token)
+        return {
+            'pool': state.pool,
+            'input_mint': input_mint,
+            'output_mint': output_mint,
+            'amount_in': amount_in,
+            'amount_out': amount_out,
+            'min_amount_out': minimum_amount_out(amount_out, slippage_bps),
+            'price_impact_bps': price_impact_bps(amount_in, amount_out, reserve_in, reserve_out),
+            'fee_bps': state.fee_bps,
+            'age': state.age(),
+        }
+
+    def quote_many(self, pools, input_tokens, amounts_in, slippage_bps=None):
+        import numpy as np
+
+        single_pool = isinstance(pools, (str, PoolState))
+        if single_pool:
+            pools = [pools]
+        states = [self.get_state(pool.pool if isinstance(pool, PoolState) else pool) for pool in pools]
+        if isinstance(input_tokens, str):
+            input_tokens = [input_tokens] * len(states)
+        reserves = [state.reserves(token) for state, token in zip(states, input_tokens)]
+        slippage_bps = self.default_slippage_bps if slippage_bps is None else slippage_bps
+
+        # Lists stay Python integers: np.asarray would silently turn amounts above int64 into float64.
+        amounts = amounts_in if isinstance(amounts_in, np.ndarray) else np.asarray(amounts_in, dtype=object)
+        if amounts.dtype.kind == 'O':
+            integral = all(isinstance(amount, (int, np.integer)) for amount in amounts.flat)
+        else:
+            integral = amounts.dtype.kind in 'iu'
+        if not integral:
+            raise ValueError("quote_many takes integer base-unit amounts")
+        # Same integer floor math as the pool program. int64 is exact while the largest product fits,
+        # and Python integers take over for u64-sized reserves.
+        largest_amount = int(amounts.max(initial=0))
+        largest_reserve = max((reserve or 0 for pair in reserves for reserve in pair), default=0)
+        int64_safe = max(largest_amount * largest_reserve, largest_amount, largest_reserve) * BPS_DENOMINATOR < 2 ** 62
+        dtype = np.int64 if int64_safe else object
+
+        reserve_in = np.array([reserve for reserve, _ in reserves], dtype=dtype)
+        reserve_out = np.array([reserve for _, reserve in reserves], dtype=dtype)
+        fee_factor = np.array([BPS_DENOMINATOR - state.fee_bps for state in states], dtype=dtype)
+        amount_with_fee = amounts.astype(dtype)[..., np.newaxis] * fee_factor
+        denominator = reserve_in * BPS_DENOMINATOR + amount_with_fee
+        valid = (amounts[..., np.newaxis] > 0) & (reserve_in > 0) & (reserve_out > 0)
+        amount_out = np.where(valid, amount_with_fee * reserve_out // np.where(valid, denominator, 1), 0)
+        min_amount_out = amount_out * (BPS_DENOMINATOR - slippage_bps) // BPS_DENOMINATOR
+        if single_pool:
+            amount_out, min_amount_out = amount_out[..., 0], min_amount_out[..., 0]
+        return {'amount_out': amount_out, 'min_amount_out': min_amount_out}
+
+    def stats(self):
+        with self._lock:
+            ages = [state.age() for state in self._pools.values()]
+            return {
+                'pools': len(self._pools),
+                'loaded': sum(age is not None for age in ages),
+                'max_age': max((age for age in ages if age is not None), default=None),
+                'refresh_count': self.refresh_count,
+                'refresh_errors': self.refresh_errors,
+                'last_refresh_latency': self.last_refresh_latency,
+            }
+
+def resolve_swap(pool_cache, instruction_data):
+    input_token = instruction_data.get('from_token', instruction_data.get('from_asset'))
+    output_token = instruction_data.get('to_token', instruction_data.get('to_asset'))
+    if 'pool' in instruction_data:
+        state = pool_cache.get_state(instruction_data['pool'])
+    else:
+        state = pool_cache.find_pool(input_token, output_token)
+    amount_in = instruction_data.get('amount_in')
+    if amount_in is None:
+        amount_in = int(round(instruction_data['amount'] * 10 ** state.decimals(input_token)))
+    quote = pool_cache.quote(state, input_token, amount_in, instruction_data.get('slippage_bps'))
+    return dict(
+        instruction_data,
+        pool=state.pool,
+        from_token=quote['input_mint'],
+        to_token=quote['output_mint'],
+        amount_in=amount_in,
+        min_amount_out=quote['min_amount_out']
+    )
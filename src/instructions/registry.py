@@ -0,0 +1,273 @@
+import importlib
+import logging
+import secrets
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+class InstructionBuildError(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(f"Failed to build {len(failures)} instruction(s): " + ', '.join(
+            f"#{index} ({instruction_type})" for index, instruction_type in failures
+        ))
+
+class InstructionRegistry:
+    def __init__(self):
+        self._builders = {}
+        self._bulk_builders = {}
+        self._modules = {}
+        self._unsupported = {}
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.info("InstructionRegistry initialized")
+        return logger
+
+    def register(self, instruction_type, builder, bulk_builder=None, modules=()):
+        self._logger.debug("Registering builder for instruction type: %s", instruction_type)
+        self._builders[instruction_type] = builder
+        self._modules[instruction_type] = tuple(modules)
+        self._unsupported.pop(instruction_type, None)
+        if bulk_builder is not None:
+            self._bulk_builders[instruction_type] = bulk_builder
+        else:
+            self._bulk_builders.pop(instruction_type, None)
+
+    def unregister(self, instruction_type):
+        self._builders.pop(instruction_type, None)
+        self._bulk_builders.pop(instruction_type, None)
+        self._modules.pop(instruction_type, None)
+        self._unsupported.pop(instruction_type, None)
+
+    def register_unsupported(self, instruction_type, reason):
+        self._logger.debug("Marking instruction type as unsupported: %s", instruction_type)
+        self.unregister(instruction_type)
+        self._unsupported[instruction_type] = reason
+
+    def unsupported_types(self):
+        return list(self._unsupported)
+
+    def instruction_types(self):
+        return list(self._builders)
+
+    def preload(self, instruction_types=None):
+        if instruction_types is None:
+            instruction_types = self.instruction_types()
+        for instruction_type in instruction_types:
+            if instruction_type not in self._builders:
+                self._logger.error("Cannot preload unknown instruction type: %s", instruction_type)
+                continue
+            for module in self._modules.get(instruction_type, ()):
+                self._logger.debug("Preloading %s for instruction type: %s", module, instruction_type)
+                importlib.import_module(module)
+
+    def build(self, instruction_data, context):
+        instruction_type = instruction_data.get('type')
+        builder = self._builders.get(instruction_type)
+        if builder is None:
+            self._logger.error("Unknown instruction type: %s", instruction_type)
+            return None
+        try:
+            instruction = builder(instruction_data, context)
+        except Exception as error:
+            self._logger.error("Error building %s instruction: %s", instruction_type, error)
+            return None
+        if isinstance(instruction, list) and not all(instruction):
+            self._logger.error("Incomplete %s instruction group", instruction_type)
+            return None
+        return instruction
+
+    def _build_group(self, instruction_type, group, context):
+        bulk_builder = self._bulk_builders.get(instruction_type)
+        if bulk_builder is not None:
+            try:
+                return bulk_builder([instruction_data for _, instruction_data in group], context)
+            except Exception as error:
+                self._logger.error("Error bulk building %s instructions, building one by one: %s", instruction_type, error)
+        return [self.build(instruction_data, context) for _, instruction_data in group]
+
+    def build_many(self, instructions_data, context):
+        skipped = [instruction_data for instruction_data in instructions_data if instruction_data.get('type') in self._unsupported]
+        for instruction_data in skipped:
+            instruction_type = instruction_data.get('type')
+            self._logger.warning("Skipping %s instruction: %s", instruction_type, self._unsupported[instruction_type])
+        if skipped:
+            instructions_data = [
+                instruction_data for instruction_data in instructions_data if instruction_data.get('type') not in self._unsupported
+            ]
+
+        groups = {}
+        for index, instruction_data in enumerate(instructions_data):
+            groups.setdefault(instruction_data.get('type'), []).append((index, instruction_data))
+
+        results = [None] * len(instructions_data)
+        for instruction_type, group in groups.items():
+            if instruction_type not in self._builders:
+                self._logger.error("Unknown instruction type: %s", instruction_type)
+                continue
+            with metrics.span('build_instructions', instruction_type=instruction_type):
+                instructions = self._build_group(instruction_type, group, context)
+            metrics.increment('instructions_built', len(group), instruction_type=instruction_type)
+            for (index, _), instruction in zip(group, instructions):
+                results[index] = instruction
+
+        failures = [
+            (index, instruction_data.get('type'))
+            for index, (instruction_data, instruction) in enumerate(zip(instructions_data, results))
+            if not instruction
+        ]
+        if failures:
+            raise InstructionBuildError(failures)
+        return results
+
+def _sol_lamports(instruction_data):
+    if 'lamports' in instruction_data:
+        return instruction_data['lamports']
+    return int(round(instruction_data['amount'] * LAMPORTS_PER_SOL))
+
+def build_transfer_sol(instruction_data, context):
+    from src.instructions.system import create_transfer_sol_instruction
+    return create_transfer_sol_instruction(
+        instruction_data.get('sender', context['payer']),
+        instruction_data['recipient'],
+        _sol_lamports(instruction_data)
+    )
+
+def build_transfer_sol_many(instructions_data, context):
+    from src.instructions.templates import TRANSFER_SOL_TEMPLATE
+    return TRANSFER_SOL_TEMPLATE.build_many([
+        {
+            'sender': instruction_data.get('sender', context['payer']),
+            'recipient': instruction_data['recipient'],
+            'lamports': _sol_lamports(instruction_data),
+        }
+        for instruction_data in instructions_data
+    ])
+
+def build_transfer_token(instruction_data, context):
+    from src.instructions.token import create_transfer_token_instruction
+    return create_transfer_token_instruction(
+        instruction_data['source'],
+        instruction_data['destination'],
+        context['payer'],
+        instruction_data['amount'],
+        instruction_data['mint'],
+        instruction_data['decimals']
+    )
+
+def build_transfer_token_many(instructions_data, context):
+    from src.instructions.templates import TRANSFER_TOKEN_TEMPLATE
+    return TRANSFER_TOKEN_TEMPLATE.build_many([
+        {
+            'source': instruction_data['source'],
+            'mint': instruction_data['mint'],
+            'destination': instruction_data['destination'],
+            'owner': context['payer'],
+            'amount': instruction_data['amount'],
+            'decimals': instruction_data['decimals'],
+        }
+        for instruction_data in instructions_data
+    ])
+
+def build_stake(instruction_data, context):
+    from src.instructions.staking import (
+        STAKE_RENT_EXEMPT_RESERVE,
+        create_delegate_stake_instruction,
+        create_initialize_stake_instruction,
+        create_stake_account_with_seed_instruction,
+        stake_account_with_seed
+    )
+    payer = context['payer']
+    seed = instruction_data.get('seed') or secrets.token_hex(16)
+    stake_account = stake_account_with_seed(payer, seed)
+    return [
+        create_stake_account_with_seed_instruction(payer, payer, seed, _sol_lamports(instruction_data) + STAKE_RENT_EXEMPT_RESERVE),
+        create_initialize_stake_instruction(stake_account, payer),
+        create_delegate_stake_instruction(stake_account, instruction_data['validator'], payer),
+    ]
+
+def build_mint_nft(instruction_data, context):
+    from src.instructions.nft import create_mint_nft_instruction
+    from src.utils.derivation import derive_ata, derive_master_edition, derive_metadata
+    mint = instruction_data['mint']
+    return create_mint_nft_instruction(
+        mint,
+        instruction_data.get('destination') or derive_ata(instruction_data.get('owner', context['payer']), mint),
+        context['payer'],
+        instruction_data.get('metadata') or derive_metadata(mint),
+        instruction_data.get('master_edition') or derive_master_edition(mint)
+    )
+
+def build_nft_transfer(instruction_data, context):
+    from src.instructions.nft import create_transfer_nft_instruction
+    return create_transfer_nft_instruction(
+        instruction_data['nft_id'],
+        instruction_data.get('source', context['payer']),
+        instruction_data['recipient'],
+        context['payer']
+    )
+
+def build_swap(instruction_data, context):
+    from src.instructions.raydium import create_swap_instruction
+    if 'min_amount_out' not in instruction_data and context.get('pool_cache') is not None:
+        from src.instructions.raydium_pools import resolve_swap
+        instruction_data = resolve_swap(context['pool_cache'], instruction_data)
+    return create_swap_instruction(
+        context['payer'],
+        instruction_data['pool'],
+        instruction_data['from_token'],
+        instruction_data['to_token'],
+        instruction_data.get('amount_in', instruction_data.get('amount')),
+        instruction_data['min_amount_out']
+    )
+
+def build_pumpfun(instruction_data, context):
+    from src.instructions.pumpfun import create_pumpfun_composite_instruction
+    return create_pumpfun_composite_instruction(
+        context['payer'],
+        instruction_data['pump_program'],
+        instruction_data['fun_program'],
+        instruction_data['pump_data'],
+        instruction_data['fun_data']
+    )
+
+def build_pumpfun_action(instruction_data, context):
+    from src.instructions.pumpfun import create_pumpfun_composite_instruction
+    pump_program = instruction_data.get('pump_program') or context.get('pump_program')
+    fun_program = instruction_data.get('fun_program') or context.get('fun_program')
+    if not pump_program or not fun_program:
+        raise ValueError("pumpfun_action needs pump_program and fun_program; configure them on PersephAI")
+    action = instruction_data['action'].encode('utf-8')
+    return create_pumpfun_composite_instruction(
+        context['payer'],
+        pump_program,
+        fun_program,
+        instruction_data.get('pump_data', action),
+        instruction_data.get('fun_data', action)
+    )
+
+SYSTEM_MODULES = ('src.instructions.system', 'src.instructions.templates')
+TOKEN_MODULES = ('src.instructions.token', 'src.instructions.templates')
+STAKING_MODULES = ('src.instructions.staking',)
+NFT_MODULES = ('src.instructions.nft',)
+RAYDIUM_MODULES = ('src.instructions.raydium',)
+PUMPFUN_MODULES = ('src.instructions.pumpfun',)
+
+def create_default_registry():
+    registry = InstructionRegistry()
+    registry.register('transfer_sol', build_transfer_sol, build_transfer_sol_many, SYSTEM_MODULES)
+    registry.register('transfer', build_transfer_sol, build_transfer_sol_many, SYSTEM_MODULES)
+    registry.register('transfer_token', build_transfer_token, build_transfer_token_many, TOKEN_MODULES)
+    registry.register('stake', build_stake, modules=STAKING_MODULES)
+    registry.register('mint_nft', build_mint_nft, modules=NFT_MODULES)
+    registry.register('nft_transfer', build_nft_transfer, modules=NFT_MODULES)
+    registry.register('swap', build_swap, modules=RAYDIUM_MODULES)
+    registry.register('raydium_swap', build_swap, modules=RAYDIUM_MODULES)
+    registry.register('pumpfun', build_pumpfun, modules=PUMPFUN_MODULES)
+    registry.register('pumpfun_action', build_pumpfun_action, modules=PUMPFUN_MODULES)
+    registry.register_unsupported('borrow', "no lending program builder is available")
+    registry.register_unsupported('governance_vote', "no governance program builder is available")
+    return registry
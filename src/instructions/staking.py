@@ -1,6 +1,8 @@
-from solana.transaction import TransactionInstruction
+import struct
 from solana.publickey import PublicKey
-from solana.system_program import SYS_PROGRAM_ID
+from solana.transaction import AccountMeta, TransactionInstruction
+from src.utils.pubkeys import intern_pubkey
+from solana.system_program import CreateAccountParams, CreateAccountWithSeedParams, create_account, create_account_with_seed
 from spl.stake_pool.instructions import (
     deposit_stake,
     DepositStakeParams,
@@ -11,79 +13,194 @@ from spl.stake_pool.instructions import (
 )
 import logging
 
+logger = logging.getLogger(__name__)
+
+STAKE_PROGRAM_ID = intern_pubkey("Stake11111111111111111111111111111111111111")
+STAKE_CONFIG_ID = intern_pubkey("StakeConfig11111111111111111111111111111111")
+SYSVAR_CLOCK_ID = intern_pubkey("SysvarC1ock11111111111111111111111111111111")
+SYSVAR_STAKE_HISTORY_ID = intern_pubkey("SysvarStakeHistory1111111111111111111111111")
+SYSVAR_RENT_ID = intern_pubkey("SysvarRent111111111111111111111111111111111")
+STAKE_ACCOUNT_SIZE = 200
+STAKE_RENT_EXEMPT_RESERVE = 2_282_880
+STAKE_INITIALIZE_INDEX = 0
+STAKE_DELEGATE_INDEX = 2
+STAKE_SPLIT_INDEX = 3
+STAKE_DEACTIVATE_INDEX = 5
+NO_LOCKUP = struct.pack('<qQ32s', 0, 0, bytes(32))
+
+def stake_account_with_seed(base_pubkey, seed):
+    return PublicKey.create_with_seed(intern_pubkey(base_pubkey), seed, STAKE_PROGRAM_ID)
+
 def create_stake_account_instruction(stake_account_pubkey, owner_pubkey, lamports):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating stake account instruction for stake account {stake_account_pubkey}")
+    logger.debug("Creating stake account instruction for stake account %s", stake_account_pubkey)
 
     try:
         instruction = create_stake_account(
             CreateStakeAccountParams(
-                stake_account=PublicKey(stake_account_pubkey),
-                owner=PublicKey(owner_pubkey),
+                stake_account=intern_pubkey(stake_account_pubkey),
+                owner=intern_pubkey(owner_pubkey),
                 lamports=lamports
             )
         )
-        logger.debug(f"Stake account creation instruction created: {instruction}")
+        logger.debug("Stake account creation instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating stake account instruction: {error}")
+        logger.error("Error creating stake account instruction: %s", error)
         return None
 
 def create_deposit_stake_instruction(stake_pool_pubkey, stake_account_pubkey, validator_pubkey, owner_pubkey, lamports):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating deposit stake instruction to pool {stake_pool_pubkey} from stake account {stake_account_pubkey}")
+    logger.debug("Creating deposit stake instruction to pool %s from stake account %s", stake_pool_pubkey, stake_account_pubkey)
 
     try:
         instruction = deposit_stake(
             DepositStakeParams(
-                stake_pool=PublicKey(stake_pool_pubkey),
-                stake_account=PublicKey(stake_account_pubkey),
-                validator=PublicKey(validator_pubkey),
-                owner=PublicKey(owner_pubkey),
+                stake_pool=intern_pubkey(stake_pool_pubkey),
+                stake_account=intern_pubkey(stake_account_pubkey),
+                validator=intern_pubkey(validator_pubkey),
+                owner=intern_pubkey(owner_pubkey),
                 lamports=lamports
             )
         )
-        logger.debug(f"Deposit stake instruction created: {instruction}")
+        logger.debug("Deposit stake instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating deposit stake instruction: {error}")
+        logger.error("Error creating deposit stake instruction: %s", error)
         return None
 
 def create_withdraw_stake_instruction(stake_pool_pubkey, stake_account_pubkey, owner_pubkey, lamports):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating withdraw stake instruction from pool {stake_pool_pubkey} to stake account {stake_account_pubkey}")
+    logger.debug("Creating withdraw stake instruction from pool %s to stake account %s", stake_pool_pubkey, stake_account_pubkey)
 
     try:
         instruction = withdraw_stake(
             WithdrawStakeParams(
-                stake_pool=PublicKey(stake_pool_pubkey),
-                stake_account=PublicKey(stake_account_pubkey),
-                owner=PublicKey(owner_pubkey),
+                stake_pool=intern_pubkey(stake_pool_pubkey),
+                stake_account=intern_pubkey(stake_account_pubkey),
+                owner=intern_pubkey(owner_pubkey),
                 lamports=lamports
             )
         )
-        logger.debug(f"Withdraw stake instruction created: {instruction}")
+        logger.debug("Withdraw stake instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating withdraw stake instruction: {error}")
+        logger.error("Error creating withdraw stake instruction: %s", error)
         return None
 
 def create_delegate_stake_instruction(stake_account_pubkey, validator_pubkey, owner_pubkey):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating delegate stake instruction for stake account {stake_account_pubkey} to validator {validator_pubkey}")
+    logger.debug("Creating delegate stake instruction for stake account %s to validator %s", stake_account_pubkey, validator_pubkey)
+
+    try:
+        instruction = TransactionInstruction(
+            program_id=STAKE_PROGRAM_ID,
+            keys=[
+                AccountMeta(pubkey=intern_pubkey(stake_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=intern_pubkey(validator_pubkey), is_signer=False, is_writable=False),
+                AccountMeta(pubkey=SYSVAR_CLOCK_ID, is_signer=False, is_writable=False),
+                AccountMeta(pubkey=SYSVAR_STAKE_HISTORY_ID, is_signer=False, is_writable=False),
+                AccountMeta(pubkey=STAKE_CONFIG_ID, is_signer=False, is_writable=False),
+                AccountMeta(pubkey=intern_pubkey(owner_pubkey), is_signer=True, is_writable=False),
+            ],
+            data=struct.pack('<I', STAKE_DELEGATE_INDEX)
+        )
+        logger.debug("Delegate stake instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating delegate stake instruction: %s", error)
+        return None
+
+def create_split_stake_instruction(stake_account_pubkey, split_stake_account_pubkey, owner_pubkey, lamports):
+    logger.debug("Creating split stake instruction for %s lamports from %s into %s", lamports, stake_account_pubkey, split_stake_account_pubkey)
+
+    try:
+        instruction = TransactionInstruction(
+            program_id=STAKE_PROGRAM_ID,
+            keys=[
+                AccountMeta(pubkey=intern_pubkey(stake_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=intern_pubkey(split_stake_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=intern_pubkey(owner_pubkey), is_signer=True, is_writable=False),
+            ],
+            data=struct.pack('<IQ', STAKE_SPLIT_INDEX, lamports)
+        )
+        logger.debug("Split stake instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating split stake instruction: %s", error)
+        return None
+
+def create_allocate_stake_account_instruction(payer_pubkey, stake_account_pubkey, lamports):
+    logger.debug("Creating allocate stake account instruction for %s", stake_account_pubkey)
+
+    try:
+        instruction = create_account(
+            CreateAccountParams(
+                from_pubkey=intern_pubkey(payer_pubkey),
+                new_account_pubkey=intern_pubkey(stake_account_pubkey),
+                lamports=lamports,
+                space=STAKE_ACCOUNT_SIZE,
+                program_id=STAKE_PROGRAM_ID
+            )
+        )
+        logger.debug("Allocate stake account instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating allocate stake account instruction: %s", error)
+        return None
+
+def create_stake_account_with_seed_instruction(payer_pubkey, base_pubkey, seed, lamports):
+    logger.debug("Creating stake account instruction for seed %s of %s", seed, base_pubkey)
+
+    try:
+        instruction = create_account_with_seed(
+            CreateAccountWithSeedParams(
+                from_pubkey=intern_pubkey(payer_pubkey),
+                new_account_pubkey=stake_account_with_seed(base_pubkey, seed),
+                base_pubkey=intern_pubkey(base_pubkey),
+                # The system program layout encodes seeds as a length-prefixed Rust string.
+                seed={'length': len(seed.encode('utf-8')), 'chars': seed},
+                lamports=lamports,
+                space=STAKE_ACCOUNT_SIZE,
+                program_id=STAKE_PROGRAM_ID
+            )
+        )
+        logger.debug("Seeded stake account instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating seeded stake account instruction: %s", error)
+        return None
+
+def create_initialize_stake_instruction(stake_account_pubkey, authority_pubkey):
+    logger.debug("Creating initialize stake instruction for stake account %s", stake_account_pubkey)
+
+    try:
+        authority = bytes(intern_pubkey(authority_pubkey))
+        instruction = TransactionInstruction(
+            program_id=STAKE_PROGRAM_ID,
+            keys=[
+                AccountMeta(pubkey=intern_pubkey(stake_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=SYSVAR_RENT_ID, is_signer=False, is_writable=False),
+            ],
+            data=struct.pack('<I', STAKE_INITIALIZE_INDEX) + authority + authority + NO_LOCKUP
+        )
+        logger.debug("Initialize stake instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating initialize stake instruction: %s", error)
+        return None
+
+def create_deactivate_stake_instruction(stake_account_pubkey, owner_pubkey):
+    logger.debug("Creating deactivate stake instruction for stake account %s", stake_account_pubkey)
 
     try:
         instruction = TransactionInstruction(
-            program_id=SYS_PROGRAM_ID,
+            program_id=STAKE_PROGRAM_ID,
             keys=[
-                {"pubkey": PublicKey(stake_account_pubkey), "is_signer": True, "is_writable": True},
-                {"pubkey": PublicKey(validator_pubkey), "is_signer": False, "is_writable": False},
-                {"pubkey": PublicKey(owner_pubkey), "is_signer": True, "is_writable": False},
+                AccountMeta(pubkey=intern_pubkey(stake_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=SYSVAR_CLOCK_ID, is_signer=False, is_writable=False),
+                AccountMeta(pubkey=intern_pubkey(owner_pubkey), is_signer=True, is_writable=False),
             ],
-            data=b''
+            data=struct.pack('<I', STAKE_DEACTIVATE_INDEX)
         )
-        logger.debug(f"Delegate stake instruction created: {instruction}")
+        logger.debug("Deactivate stake instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating delegate stake instruction: {error}")
-        return None
\ No newline at end of file
+        logger.error("Error creating deactivate stake instruction: %s", error)
+        return None
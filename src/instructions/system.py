@@ -1,41 +1,64 @@
-from solana.transaction import TransactionInstruction
-from solana.publickey import PublicKey
+from solana.transaction import AccountMeta, TransactionInstruction
+from src.utils.pubkeys import intern_pubkey
 from solana.system_program import SYS_PROGRAM_ID, TransferParams, transfer
 import logging
+import struct
+
+logger = logging.getLogger(__name__)
+
+SYSVAR_RECENT_BLOCKHASHES_ID = intern_pubkey("SysvarRecentB1ockHashes11111111111111111111")
+SYSTEM_ADVANCE_NONCE_INDEX = 4
 
 def create_transfer_sol_instruction(sender_pubkey, recipient_pubkey, lamports):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating transfer SOL instruction from {sender_pubkey} to {recipient_pubkey} for {lamports} lamports")
+    logger.debug("Creating transfer SOL instruction from %s to %s for %s lamports", sender_pubkey, recipient_pubkey, lamports)
 
     try:
         instruction = transfer(
             TransferParams(
-                from_pubkey=PublicKey(sender_pubkey),
-                to_pubkey=PublicKey(recipient_pubkey),
+                from_pubkey=intern_pubkey(sender_pubkey),
+                to_pubkey=intern_pubkey(recipient_pubkey),
                 lamports=lamports
             )
         )
-        logger.debug(f"Transfer SOL instruction created: {instruction}")
+        logger.debug("Transfer SOL instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating transfer SOL instruction: {error}")
+        logger.error("Error creating transfer SOL instruction: %s", error)
         return None
 
 def create_account_instruction(new_account_pubkey, owner_pubkey, lamports, space):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating account instruction for new account {new_account_pubkey} with owner {owner_pubkey}")
+    logger.debug("Creating account instruction for new account %s with owner %s", new_account_pubkey, owner_pubkey)
 
     try:
         instruction = TransactionInstruction(
             program_id=SYS_PROGRAM_ID,
             keys=[
-                {"pubkey": PublicKey(new_account_pubkey), "is_signer": True, "is_writable": True},
-                {"pubkey": PublicKey(owner_pubkey), "is_signer": False, "is_writable": False},
+                {"pubkey": intern_pubkey(new_account_pubkey), "is_signer": True, "is_writable": True},
+                {"pubkey": intern_pubkey(owner_pubkey), "is_signer": False, "is_writable": False},
             ],
             data=b''
         )
-        logger.debug(f"Account creation instruction created: {instruction}")
+        logger.debug("Account creation instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating account instruction: %s", error)
+        return None
+
+def create_advance_nonce_instruction(nonce_account_pubkey, authority_pubkey):
+    logger.debug("Creating advance nonce instruction for nonce account %s", nonce_account_pubkey)
+
+    try:
+        instruction = TransactionInstruction(
+            program_id=SYS_PROGRAM_ID,
+            keys=[
+                AccountMeta(pubkey=intern_pubkey(nonce_account_pubkey), is_signer=False, is_writable=True),
+                AccountMeta(pubkey=SYSVAR_RECENT_BLOCKHASHES_ID, is_signer=False, is_writable=False),
+                AccountMeta(pubkey=intern_pubkey(authority_pubkey), is_signer=True, is_writable=False),
+            ],
+            data=struct.pack('<I', SYSTEM_ADVANCE_NONCE_INDEX)
+        )
+        logger.debug("Advance nonce instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating account instruction: {error}")
-        return None
\ No newline at end of file
+        logger.error("Error creating advance nonce instruction: %s", error)
+        return None
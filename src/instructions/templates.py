@@ -0,0 +1,106 @@
+import logging
+import struct
+from solana.publickey import PublicKey
+from solana.system_program import SYS_PROGRAM_ID
+from solana.transaction import AccountMeta, TransactionInstruction
+from src.utils.derivation import ASSOCIATED_TOKEN_PROGRAM_ID
+from src.utils.pubkeys import intern_pubkey, SPL_TOKEN_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_TRANSFER_INDEX = 2
+TOKEN_TRANSFER_CHECKED_INDEX = 12
+ASSOCIATED_TOKEN_CREATE_IDEMPOTENT_INDEX = 1
+
+class InstructionTemplate:
+    def __init__(self, program_id, accounts, layout, constants=None, byte_order='<'):
+        self.program_id = intern_pubkey(program_id)
+        self._accounts = []
+        self.account_fields = []
+        for account, is_signer, is_writable in accounts:
+            if isinstance(account, PublicKey):
+                self._accounts.append((None, AccountMeta(pubkey=account, is_signer=is_signer, is_writable=is_writable)))
+            else:
+                self._accounts.append((account, (is_signer, is_writable)))
+                self.account_fields.append(account)
+
+        constants = constants or {}
+        self.data_fields = []
+        self._values = []
+        self._positions = []
+        format_codes = []
+        for name, code in layout:
+            format_codes.append(code)
+            if name in constants:
+                self._values.append(constants[name])
+            else:
+                self._values.append(None)
+                self.data_fields.append(name)
+                self._positions.append((name, len(self._values) - 1))
+        self._struct = struct.Struct(byte_order + ''.join(format_codes))
+        self.data_size = self._struct.size
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.debug("Instruction template compiled for program %s with %s data bytes", self.program_id, self.data_size)
+        return logger
+
+    def _keys(self, row):
+        keys = []
+        for field, meta in self._accounts:
+            if field is None:
+                keys.append(meta)
+            else:
+                is_signer, is_writable = meta
+                keys.append(AccountMeta(pubkey=intern_pubkey(row[field]), is_signer=is_signer, is_writable=is_writable))
+        return keys
+
+    def _data(self, row):
+        values = list(self._values)
+        for name, position in self._positions:
+            values[position] = row[name]
+        return self._struct.pack(*values)
+
+    def build(self, **fields):
+        return TransactionInstruction(program_id=self.program_id, keys=self._keys(fields), data=self._data(fields))
+
+    def build_many(self, rows):
+        return [
+            TransactionInstruction(program_id=self.program_id, keys=self._keys(row), data=self._data(row))
+            for row in rows
+        ]
+
+TRANSFER_SOL_TEMPLATE = InstructionTemplate(
+    program_id=SYS_PROGRAM_ID,
+    accounts=[('sender', True, True), ('recipient', False, True)],
+    layout=[('instruction', 'I'), ('lamports', 'Q')],
+    constants={'instruction': SYSTEM_TRANSFER_INDEX}
+)
+
+TRANSFER_TOKEN_TEMPLATE = InstructionTemplate(
+    program_id=SPL_TOKEN_PROGRAM_ID,
+    accounts=[('source', False, True), ('mint', False, False), ('destination', False, True), ('owner', True, False)],
+    layout=[('instruction', 'B'), ('amount', 'Q'), ('decimals', 'B')],
+    constants={'instruction': TOKEN_TRANSFER_CHECKED_INDEX}
+)
+
+CREATE_ASSOCIATED_TOKEN_ACCOUNT_TEMPLATE = InstructionTemplate(
+    program_id=ASSOCIATED_TOKEN_PROGRAM_ID,
+    accounts=[
+        ('payer', True, True),
+        ('account', False, True),
+        ('owner', False, False),
+        ('mint', False, False),
+        (SYS_PROGRAM_ID, False, False),
+        (SPL_TOKEN_PROGRAM_ID, False, False)
+    ],
+    layout=[('instruction', 'B')],
+    constants={'instruction': ASSOCIATED_TOKEN_CREATE_IDEMPOTENT_INDEX}
+)
+
+def compile_pump_action_template(pump_program_pubkey, action_data_size):
+    return InstructionTemplate(
+        program_id=pump_program_pubkey,
+        accounts=[('user', True, True)],
+        layout=[('action_data', f'{action_data_size}s')]
+    )
@@ -1,24 +1,13 @@
 import logging
-from solana.transaction import Transaction
-from solana.rpc.api import Client
+from solana.transaction import Transaction, TransactionInstruction
 from solana.rpc.types import TxOpts
-from solana.publickey import PublicKey
-from spl.token.instructions import transfer_checked, TransferCheckedParams, initialize_account, InitializeAccountParams
-
-class TokenInstructions:
-    def __init__(self, solana_client_url):
-        self._client = Client(solana_client_url)
-        self._logger = self._setup_logger()
-
-    def _setup_logger(self):
-        logger = logging.getLogger(__name__)
-        logger.info("TokenInstructions initialized")
-        return logger
-from solana.transaction import TransactionInstruction
-from solana.publickey import PublicKey
+from solana.system_program import CreateAccountParams, create_account
+from src.utils.pubkeys import intern_pubkey, SPL_TOKEN_PROGRAM_ID
 from spl.token.instructions import (
     initialize_account,
     InitializeAccountParams,
+    initialize_mint,
+    InitializeMintParams,
     transfer_checked,
     TransferCheckedParams,
     mint_to_checked,
@@ -26,98 +15,185 @@ from spl.token.instructions import (
     approve_checked,
     ApproveCheckedParams
 )
-import logging
+from src.utils.rpc_pool import RpcPool
+from src.utils.accounts import AccountResolver
+from src.utils.derivation import derive_ata
+from src.instructions.templates import CREATE_ASSOCIATED_TOKEN_ACCOUNT_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+MINT_ACCOUNT_SIZE = 82
+MINT_RENT_EXEMPT_RESERVE = 1_461_600
+
+def create_mint_account_instruction(payer_pubkey, mint_pubkey, lamports=MINT_RENT_EXEMPT_RESERVE):
+    logger.debug("Creating mint account instruction for mint %s", mint_pubkey)
+
+    try:
+        instruction = create_account(
+            CreateAccountParams(
+                from_pubkey=intern_pubkey(payer_pubkey),
+                new_account_pubkey=intern_pubkey(mint_pubkey),
+                lamports=lamports,
+                space=MINT_ACCOUNT_SIZE,
+                program_id=SPL_TOKEN_PROGRAM_ID
+            )
+        )
+        logger.debug("Mint account instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating mint account instruction: %s", error)
+        return None
+
+def create_initialize_mint_instruction(mint_pubkey, decimals, mint_authority_pubkey, freeze_authority_pubkey=None):
+    logger.debug("Creating initialize mint instruction for mint %s", mint_pubkey)
+
+    try:
+        instruction = initialize_mint(
+            InitializeMintParams(
+                decimals=decimals,
+                program_id=SPL_TOKEN_PROGRAM_ID,
+                mint=intern_pubkey(mint_pubkey),
+                mint_authority=intern_pubkey(mint_authority_pubkey),
+                freeze_authority=intern_pubkey(freeze_authority_pubkey) if freeze_authority_pubkey is not None else None
+            )
+        )
+        logger.debug("Initialize mint instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating initialize mint instruction: %s", error)
+        return None
 
 def create_initialize_token_account_instruction(account_pubkey, mint_pubkey, owner_pubkey):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating initialize token account instruction for account {account_pubkey}")
+    logger.debug("Creating initialize token account instruction for account %s", account_pubkey)
 
     try:
         instruction = initialize_account(
             InitializeAccountParams(
-                account=PublicKey(account_pubkey),
-                mint=PublicKey(mint_pubkey),
-                owner=PublicKey(owner_pubkey)
+                program_id=SPL_TOKEN_PROGRAM_ID,
+                account=intern_pubkey(account_pubkey),
+                mint=intern_pubkey(mint_pubkey),
+                owner=intern_pubkey(owner_pubkey)
             )
         )
-        logger.debug(f"Initialize token account instruction created: {instruction}")
+        logger.debug("Initialize token account instruction created: %s", instruction)
+        return instruction
+    except Exception as error:
+        logger.error("Error creating initialize token account instruction: %s", error)
+        return None
+
+def create_associated_token_account_instruction(payer_pubkey, owner_pubkey, mint_pubkey):
+    logger.debug("Creating associated token account instruction for owner %s and mint %s", owner_pubkey, mint_pubkey)
+
+    try:
+        instruction = CREATE_ASSOCIATED_TOKEN_ACCOUNT_TEMPLATE.build(
+            payer=payer_pubkey,
+            account=derive_ata(owner_pubkey, mint_pubkey),
+            owner=owner_pubkey,
+            mint=mint_pubkey
+        )
+        logger.debug("Associated token account instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating initialize token account instruction: {error}")
+        logger.error("Error creating associated token account instruction: %s", error)
         return None
 
 def create_transfer_token_instruction(source_pubkey, dest_pubkey, owner_pubkey, amount, mint_pubkey, decimals):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating transfer token instruction from {source_pubkey} to {dest_pubkey} for {amount} tokens")
+    logger.debug("Creating transfer token instruction from %s to %s for %s tokens", source_pubkey, dest_pubkey, amount)
 
     try:
         instruction = transfer_checked(
             TransferCheckedParams(
-                source=PublicKey(source_pubkey),
-                dest=PublicKey(dest_pubkey),
-                owner=PublicKey(owner_pubkey),
+                program_id=SPL_TOKEN_PROGRAM_ID,
+                source=intern_pubkey(source_pubkey),
+                dest=intern_pubkey(dest_pubkey),
+                owner=intern_pubkey(owner_pubkey),
                 amount=amount,
-                mint=PublicKey(mint_pubkey),
+                mint=intern_pubkey(mint_pubkey),
                 decimals=decimals
             )
         )
-        logger.debug(f"Transfer token instruction created: {instruction}")
+        logger.debug("Transfer token instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating transfer token instruction: {error}")
+        logger.error("Error creating transfer token instruction: %s", error)
         return None
 
 def create_mint_to_instruction(mint_pubkey, dest_pubkey, mint_authority_pubkey, amount, decimals):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating mint to instruction for mint {mint_pubkey} to destination {dest_pubkey} for {amount} tokens")
+    logger.debug("Creating mint to instruction for mint %s to destination %s for %s tokens", mint_pubkey, dest_pubkey, amount)
 
     try:
         instruction = mint_to_checked(
             MintToCheckedParams(
-                mint=PublicKey(mint_pubkey),
-                dest=PublicKey(dest_pubkey),
-                mint_authority=PublicKey(mint_authority_pubkey),
+                program_id=SPL_TOKEN_PROGRAM_ID,
+                mint=intern_pubkey(mint_pubkey),
+                dest=intern_pubkey(dest_pubkey),
+                mint_authority=intern_pubkey(mint_authority_pubkey),
                 amount=amount,
                 decimals=decimals
             )
         )
-        logger.debug(f"Mint to instruction created: {instruction}")
+        logger.debug("Mint to instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating mint to instruction: {error}")
+        logger.error("Error creating mint to instruction: %s", error)
         return None
 
 def create_approve_instruction(source_pubkey, delegate_pubkey, owner_pubkey, amount, mint_pubkey, decimals):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Creating approve instruction for source {source_pubkey} to delegate {delegate_pubkey} for {amount} tokens")
+    logger.debug("Creating approve instruction for source %s to delegate %s for %s tokens", source_pubkey, delegate_pubkey, amount)
 
     try:
         instruction = approve_checked(
             ApproveCheckedParams(
-                source=PublicKey(source_pubkey),
-                delegate=PublicKey(delegate_pubkey),
-                owner=PublicKey(owner_pubkey),
+                program_id=SPL_TOKEN_PROGRAM_ID,
+                source=intern_pubkey(source_pubkey),
+                delegate=intern_pubkey(delegate_pubkey),
+                owner=intern_pubkey(owner_pubkey),
                 amount=amount,
-                mint=PublicKey(mint_pubkey),
+                mint=intern_pubkey(mint_pubkey),
                 decimals=decimals
             )
         )
-        logger.debug(f"Approve instruction created: {instruction}")
+        logger.debug("Approve instruction created: %s", instruction)
         return instruction
     except Exception as error:
-        logger.error(f"Error creating approve instruction: {error}")
+        logger.error("Error creating approve instruction: %s", error)
         return None
-    def transfer_tokens(self, sender_private_key, recipient_address, amount, token_mint_address, decimals):
-        self._logger.debug(f"Preparing to transfer {amount} tokens from {sender_private_key} to {recipient_address}")
+
+def create_transfer_token_instruction_for_owners(owner_pubkey, recipient_pubkey, amount, mint_pubkey, decimals):
+    return create_transfer_token_instruction(
+        derive_ata(owner_pubkey, mint_pubkey),
+        derive_ata(recipient_pubkey, mint_pubkey),
+        owner_pubkey,
+        amount,
+        mint_pubkey,
+        decimals
+    )
+
+class TokenInstructions:
+    def __init__(self, rpc_pool, account_resolver=None):
+        if isinstance(rpc_pool, str):
+            rpc_pool = RpcPool([rpc_pool])
+        self._client = rpc_pool
+        self._account_resolver = account_resolver if account_resolver is not None else AccountResolver(rpc_pool)
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.info("TokenInstructions initialized")
+        return logger
+
+    def transfer_tokens(self, sender_private_key, recipient_address, amount, token_mint_address, decimals=None):
+        self._logger.debug("Preparing to transfer %s tokens from %s to %s", amount, sender_private_key, recipient_address)
         try:
-            sender = PublicKey(sender_private_key)
-            recipient = PublicKey(recipient_address)
-            mint = PublicKey(token_mint_address)
+            if decimals is None:
+                decimals = self._account_resolver.get_decimals(token_mint_address)
+            sender = intern_pubkey(sender_private_key)
+            recipient = intern_pubkey(recipient_address)
+            mint = intern_pubkey(token_mint_address)
 
             transaction = Transaction().add(
                 transfer_checked(
                     TransferCheckedParams(
-                        program_id=PublicKey("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),  # SPL Token Program ID
+                        program_id=SPL_TOKEN_PROGRAM_ID,
                         source=sender,
                         mint=mint,
                         dest=recipient,
@@ -130,23 +206,23 @@ def create_approve_instruction(source_pubkey, delegate_pubkey, owner_pubkey, amo
 
             self._logger.debug("Token transfer transaction created, sending transaction...")
             response = self._client.send_transaction(transaction, sender_private_key, opts=TxOpts(skip_confirmation=False))
-            self._logger.debug(f"Token transfer transaction response: {response}")
+            self._logger.debug("Token transfer transaction response: %s", response)
             return response
         except Exception as error:
-            self._logger.error(f"Error transferring tokens: {error}")
+            self._logger.error("Error transferring tokens: %s", error)
             return None
 
     def initialize_token_account(self, payer_private_key, new_account_address, token_mint_address):
-        self._logger.debug(f"Initializing token account {new_account_address} for mint {token_mint_address}")
+        self._logger.debug("Initializing token account %s for mint %s", new_account_address, token_mint_address)
         try:
-            payer = PublicKey(payer_private_key)
-            new_account = PublicKey(new_account_address)
-            mint = PublicKey(token_mint_address)
+            payer = intern_pubkey(payer_private_key)
+            new_account = intern_pubkey(new_account_address)
+            mint = intern_pubkey(token_mint_address)
 
             transaction = Transaction().add(
                 initialize_account(
                     InitializeAccountParams(
-                        program_id=PublicKey("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"),  # SPL Token Program ID
+                        program_id=SPL_TOKEN_PROGRAM_ID,
                         account=new_account,
                         mint=mint,
                         owner=payer
@@ -156,8 +232,8 @@ def create_approve_instruction(source_pubkey, delegate_pubkey, owner_pubkey, amo
 
             self._logger.debug("Token account initialization transaction created, sending transaction...")
             response = self._client.send_transaction(transaction, payer_private_key, opts=TxOpts(skip_confirmation=False))
-            self._logger.debug(f"Token account initialization transaction response: {response}")
+            self._logger.debug("Token account initialization transaction response: %s", response)
             return response
         except Exception as error:
-            self._logger.error(f"Error initializing token account: {error}")
-            return None
\ No newline at end of file
+            self._logger.error("Error initializing token account: %s", error)
+            return None
@@ -1,104 +1,269 @@
+import asyncio
 import logging
-from solana.rpc.api import Client
+from concurrent.futures import ThreadPoolExecutor
 from solana.transaction import Transaction
-from src.parser.parser import parse_input
-from src.parser.deepseek import analyze_with_deepseek
-from src.parser.mappings import map_to_instructions
-from src.instructions.system import create_transfer_sol_instruction
-from src.instructions.token import create_transfer_token_instruction
-from src.instructions.staking import create_stake_account_instruction
-from src.instructions.nft import create_mint_nft_instruction
-from src.instructions.raydium import create_swap_instruction
-from src.instructions.pumpfun import create_pumpfun_composite_instruction
-from src.utils.helper import send_transaction
-from src.utils.security import load_private_key_from_env, sign_transaction, send_signed_transaction
+from src.parser.parser import InstructionParser
+from src.instructions.registry import create_default_registry
+from src.utils.packer import pack_instructions, pack_transactions
+from src.utils.rpc_pool import RpcPool
+from src.utils.accounts import AccountResolver
+from src.utils.blockhash import BlockhashProvider, DEFAULT_REFRESH_INTERVAL
+from src.utils.confirmation import ConfirmationTracker
+from src.utils.log import get_sampled_logger
+from src.utils.metrics import timed
+from src.utils.security import (
+    load_private_key_from_env,
+    sign_transaction,
+    send_signed_transaction,
+    submit_signed_transaction
+)
+
+logger = logging.getLogger(__name__)
+events = get_sampled_logger(__name__ + '.events')
+
+SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"
+DEFAULT_MAX_CONCURRENCY = 256
+MAX_PARALLEL_SENDS = 16
+
+def send_failed(result):
+    return result is None or (isinstance(result, dict) and bool(result.get('error')))
 
 class PersephAI:
-    def __init__(self, deepseek_api_key, solana_private_key_env_var):
-        self.logger = logging.getLogger(__name__)
+    def __init__(self, deepseek_api_key, solana_private_key_env_var, blockhash_refresh_interval=DEFAULT_REFRESH_INTERVAL,
+                 rpc_pool=None, registry=None, preload_types=None, preload_llm=False, parser=None, pool_cache=None,
+                 account_resolver=None, nonce_pool=None, pump_program=None, fun_program=None):
+        self.logger = logger
         self.logger.debug("Initializing PersephAI instance")
         self.deepseek_api_key = deepseek_api_key
         self.keypair = load_private_key_from_env(solana_private_key_env_var)
-        self.client = Client("https://api.mainnet-beta.solana.com")
+        self._owns_client = rpc_pool is None
+        self.client = RpcPool([SOLANA_RPC_URL]) if rpc_pool is None else rpc_pool
+        self.parser = parser if parser is not None else InstructionParser(deepseek_api_key)
+        self.registry = registry if registry is not None else create_default_registry()
+        if preload_types:
+            self.registry.preload(preload_types)
+        if preload_llm:
+            self.parser.preload()
+        self.blockhash_provider = BlockhashProvider(self.client, refresh_interval=blockhash_refresh_interval)
+        self.blockhash_provider.start()
+        self.confirmation_tracker = ConfirmationTracker(self.client)
+        self.pool_cache = pool_cache
+        self.account_resolver = account_resolver if account_resolver is not None else AccountResolver(self.client)
+        self.nonce_pool = nonce_pool
+        self.pump_program = pump_program
+        self.fun_program = fun_program
+
+    @timed('process_input')
+    def process_input(self, input_string, context_info=None):
+        self.logger.debug("Processing input: %s", input_string)
+        return self.parser.parse_input(input_string, context_info)
+
+    def process_input_stream(self, input_string, context_info=None):
+        self.logger.debug("Streaming input: %s", input_string)
+        return self.parser.parse_input_stream(input_string, context_info)
 
-    def process_input(self, input_string):
-        self.logger.debug(f"Processing input: {input_string}")
-        parsed_data = parse_input(input_string)
-        deepseek_response = analyze_with_deepseek(parsed_data, self.deepseek_api_key)
-        instructions_data = map_to_instructions(deepseek_response)
-        return instructions_data
+    def build_instructions(self, instructions_data):
+        self.logger.debug("Building instructions")
+        instructions_data = self.account_resolver.resolve(instructions_data, self.keypair.public_key)
+        return self.registry.build_many(instructions_data, self.build_context())
 
+    def build_context(self):
+        return {
+            'payer': self.keypair.public_key,
+            'pool_cache': self.pool_cache,
+            'pump_program': self.pump_program,
+            'fun_program': self.fun_program,
+        }
+
+    @timed('construct_transaction')
     def construct_transaction(self, instructions_data):
         self.logger.debug("Constructing transaction")
-        transaction = Transaction()
-        for instruction_data in instructions_data:
-            if instruction_data['type'] == 'transfer_sol':
-                instruction = create_transfer_sol_instruction(
-                    instruction_data['sender'], 
-                    instruction_data['recipient'], 
-                    instruction_data['lamports']
-                )
-            elif instruction_data['type'] == 'transfer_token':
-                instruction = create_transfer_token_instruction(
-                    instruction_data['source'], 
-                    instruction_data['destination'], 
-                    self.keypair.public_key, 
-                    instruction_data['amount'], 
-                    instruction_data['mint'], 
-                    instruction_data['decimals']
-                )
-            elif instruction_data['type'] == 'stake':
-                instruction = create_stake_account_instruction(
-                    instruction_data['stake_account'], 
-                    self.keypair.public_key, 
-                    instruction_data['lamports']
-                )
-            elif instruction_data['type'] == 'mint_nft':
-                instruction = create_mint_nft_instruction(
-                    instruction_data['mint'], 
-                    instruction_data['destination'], 
-                    self.keypair.public_key, 
-                    instruction_data['metadata'], 
-                    instruction_data['master_edition']
-                )
-            elif instruction_data['type'] == 'swap':
-                instruction = create_swap_instruction(
-                    self.keypair.public_key, 
-                    instruction_data['pool'], 
-                    instruction_data['from_token'], 
-                    instruction_data['to_token'], 
-                    instruction_data['amount_in'], 
-                    instruction_data['min_amount_out']
-                )
-            elif instruction_data['type'] == 'pumpfun':
-                instruction = create_pumpfun_composite_instruction(
-                    self.keypair.public_key, 
-                    instruction_data['pump_program'], 
-                    instruction_data['fun_program'], 
-                    instruction_data['pump_data'], 
-                    instruction_data['fun_data']
-                )
+        transaction = Transaction(recent_blockhash=self.blockhash_provider.get_blockhash())
+        for instruction in self.build_instructions(instructions_data):
+            if isinstance(instruction, list):
+                transaction.add(*instruction)
             else:
-                self.logger.error(f"Unknown instruction type: {instruction_data['type']}")
-                continue
-
-            if instruction:
                 transaction.add(instruction)
-
         return transaction
 
+    @timed('construct_transaction')
+    def construct_transactions(self, instructions_data, ordered=True, recent_blockhash=None):
+        self.logger.debug("Constructing packed transactions")
+        instructions = self.build_instructions(instructions_data)
+        if not instructions:
+            return []
+        try:
+            return pack_transactions(
+                instructions,
+                self.keypair.public_key,
+                recent_blockhash or self.blockhash_provider.get_blockhash(),
+                ordered=ordered
+            )
+        except Exception as error:
+            self.logger.error("Error packing transactions: %s", error)
+            return []
+
     def execute_transaction(self, transaction):
         self.logger.debug("Executing transaction")
         signed_transaction = sign_transaction(transaction, self.keypair)
         if signed_transaction:
             result = send_signed_transaction(self.client, signed_transaction)
-            self.logger.debug(f"Transaction result: {result}")
+            self.logger.debug("Transaction result: %s", result)
             return result
         else:
             self.logger.error("Failed to sign transaction")
             return None
 
-    def run(self, input_string):
+    def execute_transactions(self, transactions, ordered=True):
+        self.logger.debug("Executing %s transactions", len(transactions))
+        if ordered or len(transactions) <= 1:
+            results = []
+            for transaction in transactions:
+                if results and send_failed(results[-1]):
+                    self.logger.error("Skipping %s ordered transaction(s) after a failed send", len(transactions) - len(results))
+                    break
+                results.append(self.execute_transaction(transaction))
+            return results + [None] * (len(transactions) - len(results))
+        with ThreadPoolExecutor(max_workers=min(len(transactions), MAX_PARALLEL_SENDS)) as executor:
+            return list(executor.map(self.execute_transaction, transactions))
+
+    def run(self, input_string, ordered=True):
         instructions_data = self.process_input(input_string)
-        transaction = self.construct_transaction(instructions_data)
-        return self.execute_transaction(transaction)
\ No newline at end of file
+        transactions = self.construct_transactions(instructions_data, ordered=ordered)
+        events.event('run', instructions=len(instructions_data or ()), transactions=len(transactions))
+        return self.execute_transactions(transactions, ordered=ordered)
+
+    def submit_transaction(self, transaction, commitment='confirmed', last_valid_block_height=None):
+        self.logger.debug("Submitting transaction")
+        if last_valid_block_height is None:
+            blockhash, last_valid_block_height = self.blockhash_provider.get_blockhash_with_height()
+            if str(blockhash) != str(transaction.recent_blockhash):
+                last_valid_block_height = None
+        signed_transaction = sign_transaction(transaction, self.keypair)
+        if signed_transaction:
+            return submit_signed_transaction(
+                self.confirmation_tracker,
+                signed_transaction,
+                commitment,
+                last_valid_block_height
+            )
+        else:
+            self.logger.error("Failed to sign transaction")
+            return None
+
+    def submit(self, input_string, commitment='confirmed'):
+        return self._submit_transactions(self.process_input(input_string), commitment)
+
+    def _submit_transactions(self, instructions_data, commitment):
+        blockhash, last_valid_block_height = self.blockhash_provider.get_blockhash_with_height()
+        transactions = self.construct_transactions(instructions_data, recent_blockhash=blockhash)
+        return [self.submit_transaction(transaction, commitment, last_valid_block_height) for transaction in transactions]
+
+    def presign(self, instructions_data, timeout=None):
+        if self.nonce_pool is None:
+            raise ValueError("Pre-signing requires a nonce_pool")
+        if isinstance(instructions_data, str):
+            instructions_data = self.process_input(instructions_data)
+        instructions = self.build_instructions(instructions_data)
+        if not instructions:
+            return []
+        presigned = []
+        try:
+            for packed in pack_instructions(instructions, self.keypair.public_key, reserved=self.nonce_pool.reserved_instructions()):
+                presigned.append(self.nonce_pool.presign(packed, [self.keypair], timeout))
+        except Exception:
+            for transaction in presigned:
+                self.nonce_pool.discard(transaction)
+            raise
+        return presigned
+
+    def send_presigned(self, presigned, commitment='confirmed'):
+        self.logger.debug("Sending %s presigned transaction(s)", len(presigned))
+        return [self.nonce_pool.send(transaction, commitment) for transaction in presigned]
+
+    def discard_presigned(self, presigned):
+        for transaction in presigned:
+            self.nonce_pool.discard(transaction)
+
+    def close(self):
+        self.blockhash_provider.stop()
+        self.confirmation_tracker.stop()
+        if self._owns_client:
+            self.client.close()
+
+class AsyncPersephAI(PersephAI):
+    def __init__(self, deepseek_api_key, solana_private_key_env_var, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 blockhash_refresh_interval=DEFAULT_REFRESH_INTERVAL, rpc_pool=None, registry=None,
+                 preload_types=None, preload_llm=False, parser=None, pool_cache=None, account_resolver=None, nonce_pool=None,
+                 pump_program=None, fun_program=None):
+        super().__init__(deepseek_api_key, solana_private_key_env_var, blockhash_refresh_interval, rpc_pool, registry,
+                         preload_types, preload_llm, parser, pool_cache, account_resolver, nonce_pool, pump_program, fun_program)
+        self.logger.debug("Initializing AsyncPersephAI instance with max concurrency %s", max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # The RPC pool is blocking; a dedicated executor lets every admitted request have a send in flight.
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="persephai-rpc")
+
+    def _run_blocking(self, function, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    @timed('process_input')
+    async def process_input(self, input_string, context_info=None):
+        self.logger.debug("Processing input asynchronously: %s", input_string)
+        return await self.parser.parse_input_async(input_string, context_info)
+
+    def process_input_stream(self, input_string, context_info=None):
+        self.logger.debug("Streaming input asynchronously: %s", input_string)
+        return self.parser.parse_input_stream_async(input_string, context_info)
+
+    async def execute_transaction(self, transaction):
+        self.logger.debug("Executing transaction asynchronously")
+        signed_transaction = sign_transaction(transaction, self.keypair)
+        if signed_transaction:
+            # Sends go through the pool so they keep its endpoint ranking and failover.
+            result = await self._run_blocking(send_signed_transaction, self.client, signed_transaction)
+            self.logger.debug("Transaction result: %s", result)
+            return result
+        else:
+            self.logger.error("Failed to sign transaction")
+            return None
+
+    async def execute_transactions(self, transactions, ordered=True):
+        self.logger.debug("Executing %s transactions asynchronously", len(transactions))
+        if not ordered:
+            return list(await asyncio.gather(*(self.execute_transaction(transaction) for transaction in transactions)))
+        results = []
+        for transaction in transactions:
+            if results and send_failed(results[-1]):
+                self.logger.error("Skipping %s ordered transaction(s) after a failed send", len(transactions) - len(results))
+                break
+            results.append(await self.execute_transaction(transaction))
+        return results + [None] * (len(transactions) - len(results))
+
+    async def run(self, input_string, ordered=True):
+        async with self._semaphore:
+            instructions_data = await self.process_input(input_string)
+            transactions = await self._run_blocking(self.construct_transactions, instructions_data, ordered)
+            events.event('run', instructions=len(instructions_data or ()), transactions=len(transactions))
+            return await self.execute_transactions(transactions, ordered=ordered)
+
+    async def presign(self, instructions_data, timeout=None):
+        if isinstance(instructions_data, str):
+            instructions_data = await self.process_input(instructions_data)
+        return await self._run_blocking(super().presign, instructions_data, timeout)
+
+    async def submit(self, input_string, commitment='confirmed'):
+        async with self._semaphore:
+            instructions_data = await self.process_input(input_string)
+            submitted = await self._run_blocking(self._submit_transactions, instructions_data, commitment)
+        return [None if result is None else (result[0], asyncio.wrap_future(result[1])) for result in submitted]
+
+    async def run_many(self, input_strings):
+        return await asyncio.gather(*(self.run(input_string) for input_string in input_strings))
+
+    async def close(self):
+        self.blockhash_provider.stop()
+        self.confirmation_tracker.stop()
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
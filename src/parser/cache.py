@@ -0,0 +1,135 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 3600
+
+def normalize_cache_key(input_text, context_info, model):
+    text = ' '.join(str(input_text).split())
+    if isinstance(context_info, (dict, list, tuple)):
+        context = json.dumps(context_info, sort_keys=True, default=str)
+    elif context_info is None:
+        context = ''
+    else:
+        context = ' '.join(str(context_info).split())
+    return (text, context, model)
+
+class ResponseCache:
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL, path=None):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._logger = self._setup_logger()
+        self._store = self._open_store(path) if path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _setup_logger(self):
+        logger.info("ResponseCache initialized")
+        return logger
+
+    def _open_store(self, path):
+        try:
+            store = sqlite3.connect(path, check_same_thread=False)
+            store.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            store.commit()
+            return store
+        except Exception as error:
+            self._logger.error("Error opening response cache store %s: %s", path, error)
+            return None
+
+    def _digest(self, key):
+        return hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+
+    def _remember(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self._store is not None:
+                try:
+                    row = self._store.execute(
+                        "SELECT value, expires_at FROM responses WHERE key = ?", (self._digest(key),)
+                    ).fetchone()
+                except Exception as error:
+                    self._logger.error("Error reading response cache store: %s", error)
+                    row = None
+                if row is not None and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        expires_at = time.time() + self._ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._store is not None:
+                try:
+                    self._store.execute(
+                        "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                        (self._digest(key), value, expires_at)
+                    )
+                    self._store.commit()
+                except Exception as error:
+                    self._logger.error("Error writing response cache store: %s", error)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            if self._store is not None:
+                try:
+                    if key is None:
+                        self._store.execute("DELETE FROM responses")
+                    else:
+                        self._store.execute("DELETE FROM responses WHERE key = ?", (self._digest(key),))
+                    self._store.commit()
+                except Exception as error:
+                    self._logger.error("Error invalidating response cache store: %s", error)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
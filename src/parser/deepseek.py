@@ -1,55 +1,228 @@
 import logging
-from ollama import Client
-from .mappings import map_deepseek_response_to_instructions
+import re
+from src.utils.metrics import timed
+from .cache import ResponseCache, normalize_cache_key
+from .mappings import map_deepseek_response_to_instructions, IncrementalScanner
+
+DEEPSEEK_HOST = 'https://api.deepseek.com/v1'
+DEEPSEEK_MODEL = 'deepseek-reasoner'
+BATCH_SECTION = re.compile(r'^[ \t]*###[ \t]*(\d+)[ \t]*$', re.MULTILINE)
+BATCH_PREAMBLE = (
+    "Handle each numbered request below independently. For every request, answer under a line "
+    "'### <number>' containing only the instructions for that request."
+)
+
+logger = logging.getLogger(__name__)
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+def build_batch_prompt(input_texts):
+    sections = [BATCH_PREAMBLE]
+    for index, input_text in enumerate(input_texts, start=1):
+        sections.append(f"### {index}\n{input_text}")
+    return "\n\n".join(sections)
+
+def split_batch_response(raw_response, count):
+    sections = [None] * count
+    matches = list(BATCH_SECTION.finditer(raw_response))
+    for position, match in enumerate(matches):
+        index = int(match.group(1)) - 1
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(raw_response)
+        if 0 <= index < count and sections[index] is None:
+            sections[index] = raw_response[match.end():end].strip()
+    return sections
 
 class DeepSeekInterface:
-    def __init__(self, api_key):
-        self._api_client = self._initialize_client(api_key)
+    def __init__(self, api_key, cache=None, model=DEEPSEEK_MODEL, client=None, async_client=None, host=DEEPSEEK_HOST):
+        self._host = host
+        self._api_client = client if client is not None else self._initialize_client(api_key)
+        self._async_api_client = async_client if async_client is not None else self._initialize_async_client(api_key)
+        self._cache = cache if cache is not None else ResponseCache()
+        self._model = model
         self._logger = self._setup_logger()
 
     def _initialize_client(self, api_key):
+        from ollama import Client
         return Client(
-            host='https://api.deepseek.com/v1',
+            host=self._host,
+            headers={'Authorization': f'Bearer {api_key}'}
+        )
+
+    def _initialize_async_client(self, api_key):
+        from ollama import AsyncClient
+        return AsyncClient(
+            host=self._host,
             headers={'Authorization': f'Bearer {api_key}'}
         )
 
     def _setup_logger(self):
-        logger = logging.getLogger(__name__)
         logger.info("DeepSeekInterface initialized")
         return logger
 
-    def extract_instructions(self, input_text, context_info):
-        self._logger.debug(f"Extracting instructions from input: {input_text} with context: {context_info}")
+    def _build_messages(self, content, context):
+        return [
+            {'role': 'user', 'content': content},
+            {'role': 'system', 'content': f"Context: {context}"}
+        ]
+
+    def _response_content(self, response):
+        return response.get('choices', [{}])[0].get('message', {}).get('content', '')
+
+    def _chunk_content(self, chunk):
+        return chunk.get('choices', [{}])[0].get('delta', {}).get('content') or ''
+
+    def _chat(self, content, context, use_cache):
+        key = normalize_cache_key(content, context, self._model)
+        if use_cache:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._logger.debug("Response cache hit for input: %s", content)
+                return cached
+        response = self._api_client.chat(
+            model=self._model,
+            messages=self._build_messages(content, context)
+        )
+        result = self._response_content(response)
+        if use_cache and result:
+            self._cache.set(key, result)
+        return result
+
+    async def _chat_async(self, content, context, use_cache):
+        key = normalize_cache_key(content, context, self._model)
+        if use_cache:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._logger.debug("Response cache hit for input: %s", content)
+                return cached
+        response = await self._async_api_client.chat(
+            model=self._model,
+            messages=self._build_messages(content, context)
+        )
+        result = self._response_content(response)
+        if use_cache and result:
+            self._cache.set(key, result)
+        return result
+
+    def invalidate_cache(self, input_text=None, context_info=None):
+        if input_text is None:
+            self._logger.debug("Invalidating entire response cache")
+            self._cache.invalidate()
+        else:
+            self._logger.debug("Invalidating cached response for input: %s", input_text)
+            self._cache.invalidate(normalize_cache_key(input_text, context_info, self._model))
+
+    def cache_stats(self):
+        return self._cache.stats()
+
+    @timed('extract_instructions')
+    def extract_instructions(self, input_text, context_info, use_cache=True):
+        self._logger.debug("Extracting instructions from input: %s with context: %s", input_text, context_info)
         try:
-            response = self._api_client.chat(
-                model='deepseek-reasoner',
-                messages=[
-                    {'role': 'user', 'content': input_text},
-                    {'role': 'system', 'content': f"Context: {context_info}"}
-                ]
-            )
-            raw_instructions = response.get('choices', [{}])[0].get('message', {}).get('content', '')
-            self._logger.debug(f"Raw instructions: {raw_instructions}")
+            raw_instructions = self._chat(input_text, context_info, use_cache)
+            self._logger.debug("Raw instructions: %s", raw_instructions)
+            instructions = map_deepseek_response_to_instructions(raw_instructions)
+            self._logger.debug("Mapped instructions: %s", instructions)
+            return instructions
+        except Exception as error:
+            self._logger.error("Error extracting instructions: %s", error)
+            return []
+
+    @timed('extract_instructions')
+    async def extract_instructions_async(self, input_text, context_info, use_cache=True):
+        self._logger.debug("Extracting instructions asynchronously from input: %s with context: %s", input_text, context_info)
+        try:
+            raw_instructions = await self._chat_async(input_text, context_info, use_cache)
+            self._logger.debug("Raw instructions: %s", raw_instructions)
             instructions = map_deepseek_response_to_instructions(raw_instructions)
-            self._logger.debug(f"Mapped instructions: {instructions}")
+            self._logger.debug("Mapped instructions: %s", instructions)
             return instructions
         except Exception as error:
-            self._logger.error(f"Error extracting instructions: {error}")
+            self._logger.error("Error extracting instructions: %s", error)
             return []
 
-    def enhance_communication(self, message, context_details):
-        self._logger.debug(f"Enhancing communication for message: {message} with context: {context_details}")
+    def stream_instructions(self, input_text, context_info, use_cache=True):
+        self._logger.debug("Streaming instructions from input: %s with context: %s", input_text, context_info)
+        key = normalize_cache_key(input_text, context_info, self._model)
         try:
-            response = self._api_client.chat(
-                model='deepseek-reasoner',
-                messages=[
-                    {'role': 'user', 'content': message},
-                    {'role': 'system', 'content': f"Context: {context_details}"}
-                ]
+            cached = self._cache.get(key) if use_cache else None
+            if cached is not None:
+                yield from map_deepseek_response_to_instructions(cached)
+                return
+
+            scanner = IncrementalScanner()
+            chunks = []
+            stream = self._api_client.chat(
+                model=self._model,
+                messages=self._build_messages(input_text, context_info),
+                stream=True
             )
-            enhanced_content = response.get('choices', [{}])[0].get('message', {}).get('content', '')
-            self._logger.debug(f"Enhanced communication result: {enhanced_content}")
+            for chunk in stream:
+                content = self._chunk_content(chunk)
+                if not content:
+                    continue
+                chunks.append(content)
+                yield from scanner.feed(content)
+            yield from scanner.close()
+
+            if use_cache and chunks:
+                self._cache.set(key, ''.join(chunks))
+        except Exception as error:
+            self._logger.error("Error streaming instructions: %s", error)
+            raise
+
+    async def stream_instructions_async(self, input_text, context_info, use_cache=True):
+        self._logger.debug("Streaming instructions asynchronously from input: %s with context: %s", input_text, context_info)
+        key = normalize_cache_key(input_text, context_info, self._model)
+        try:
+            cached = self._cache.get(key) if use_cache else None
+            if cached is not None:
+                for instruction in map_deepseek_response_to_instructions(cached):
+                    yield instruction
+                return
+
+            scanner = IncrementalScanner()
+            chunks = []
+            stream = await self._async_api_client.chat(
+                model=self._model,
+                messages=self._build_messages(input_text, context_info),
+                stream=True
+            )
+            async for chunk in stream:
+                content = self._chunk_content(chunk)
+                if not content:
+                    continue
+                chunks.append(content)
+                for instruction in scanner.feed(content):
+                    yield instruction
+            for instruction in scanner.close():
+                yield instruction
+
+            if use_cache and chunks:
+                self._cache.set(key, ''.join(chunks))
+        except Exception as error:
+            self._logger.error("Error streaming instructions: %s", error)
+            raise
+
+    def extract_instructions_batch(self, input_texts, context_info):
+        self._logger.debug("Extracting instructions for a batch of %s inputs with context: %s", len(input_texts), context_info)
+        try:
+            raw_response = self._chat(build_batch_prompt(input_texts), context_info, use_cache=False)
+            self._logger.debug("Raw batch response: %s", raw_response)
+            results = []
+            for section in split_batch_response(raw_response, len(input_texts)):
+                results.append(map_deepseek_response_to_instructions(section) if section else None)
+            return results
+        except Exception as error:
+            self._logger.error("Error extracting batch instructions: %s", error)
+            return [None] * len(input_texts)
+
+    def enhance_communication(self, message, context_details, use_cache=True):
+        self._logger.debug("Enhancing communication for message: %s with context: %s", message, context_details)
+        try:
+            enhanced_content = self._chat(message, context_details, use_cache)
+            self._logger.debug("Enhanced communication result: %s", enhanced_content)
             return enhanced_content
         except Exception as error:
-            self._logger.error(f"Error enhancing communication: {error}")
-            return ""
\ No newline at end of file
+            self._logger.error("Error enhancing communication: %s", error)
+            return ""
@@ -1,82 +1,161 @@
 import logging
 import re
+import threading
+from src.utils.metrics import timed
 
+logger = logging.getLogger(__name__)
+
+CLAUSE_SEPARATOR = re.compile(r'\s*(?:[,;\n]|\band then\b|\bthen\b|\band\b)\s*')
+MAX_MATCH_LENGTH = 512
+
+class InstructionScanner:
+    def __init__(self):
+        self._patterns = []
+        self._compiled = None
+        self._lock = threading.Lock()
+
+    def register(self, instruction_type, pattern, build):
+        if isinstance(pattern, re.Pattern):
+            pattern = pattern.pattern
+        re.compile(pattern)
+        with self._lock:
+            self._patterns.append((instruction_type, pattern, build))
+            self._compiled = None
+
+    def instruction_types(self):
+        return [instruction_type for instruction_type, _, _ in self._patterns]
+
+    def _compile(self):
+        compiled = self._compiled
+        if compiled is not None:
+            return compiled
+        with self._lock:
+            if self._compiled is None:
+                parts = []
+                dispatch = {}
+                index = 1
+                for _, pattern, build in self._patterns:
+                    group_count = re.compile(pattern).groups
+                    parts.append(f'({pattern})')
+                    dispatch[index] = (build, index + 1, index + 1 + group_count)
+                    index += group_count + 1
+                self._compiled = (re.compile('|'.join(parts)), dispatch)
+            return self._compiled
+
+    def _build(self, match, dispatch):
+        build, start, end = dispatch[match.lastindex]
+        groups = match.groups()
+        return build(*groups[start - 1:end - 1])
+
+    def finditer(self, text, pos=0):
+        regex, dispatch = self._compile()
+        for match in regex.finditer(text, pos):
+            yield match, self._build(match, dispatch)
+
+    def scan(self, text):
+        for _, instruction in self.finditer(text):
+            yield instruction
+
+    def fullmatch(self, text):
+        regex, dispatch = self._compile()
+        match = regex.fullmatch(text)
+        if match is None:
+            return None
+        return self._build(match, dispatch)
+
+class IncrementalScanner:
+    def __init__(self, scanner=None):
+        self._scanner = scanner or _scanner
+        self._buffer = ''
+        self._position = 0
+
+    def feed(self, chunk):
+        self._buffer += chunk
+        instructions = []
+        pending = None
+        for match, instruction in self._scanner.finditer(self._buffer, self._position):
+            # A match touching the end of the buffer may still grow with the next chunk.
+            if match.end() >= len(self._buffer):
+                pending = match.start()
+                break
+            instructions.append(instruction)
+            self._position = match.end()
+        # Text that cannot start a match of at most MAX_MATCH_LENGTH is never scanned again.
+        keep = max(self._position, len(self._buffer) - MAX_MATCH_LENGTH)
+        if pending is not None:
+            keep = min(keep, pending)
+        self._buffer = self._buffer[keep:]
+        self._position = 0
+        return instructions
+
+    def close(self):
+        instructions = [instruction for _, instruction in self._scanner.finditer(self._buffer, self._position)]
+        self._buffer = ''
+        self._position = 0
+        return instructions
+
+_scanner = InstructionScanner()
+
+def register_instruction_pattern(instruction_type, pattern, build):
+    _scanner.register(instruction_type, pattern, build)
+
+def get_instruction_scanner():
+    return _scanner
+
+register_instruction_pattern(
+    'transfer', r'transfer (\d+\.?\d*) SOL to (\w+)',
+    lambda amount, recipient: {'type': 'transfer', 'asset': 'SOL', 'amount': float(amount), 'recipient': recipient}
+)
+register_instruction_pattern(
+    'stake', r'stake (\d+\.?\d*) tokens with (\w+)',
+    lambda amount, validator: {'type': 'stake', 'asset': 'tokens', 'amount': float(amount), 'validator': validator}
+)
+register_instruction_pattern(
+    'nft_transfer', r'transfer NFT (\w+) to (\w+)',
+    lambda nft_id, recipient: {'type': 'nft_transfer', 'nft_id': nft_id, 'recipient': recipient}
+)
+register_instruction_pattern(
+    'governance_vote', r'vote (\w+) on proposal (\w+)',
+    lambda vote, proposal_id: {'type': 'governance_vote', 'vote': vote, 'proposal_id': proposal_id}
+)
+register_instruction_pattern(
+    'borrow', r'borrow (\d+\.?\d*) (\w+) from (\w+)',
+    lambda amount, asset, platform: {'type': 'borrow', 'asset': asset, 'amount': float(amount), 'platform': platform}
+)
+register_instruction_pattern(
+    'raydium_swap', r'swap (\d+\.?\d*) (\w+) for (\w+) on Raydium',
+    lambda amount, from_asset, to_asset: {'type': 'raydium_swap', 'from_asset': from_asset, 'to_asset': to_asset, 'amount': float(amount)}
+)
+register_instruction_pattern(
+    'pumpfun_action', r'perform (\w+) action on Pumpfun',
+    lambda action: {'type': 'pumpfun_action', 'action': action}
+)
+
+def parse_command_grammar(input_text):
+    instructions = []
+    for clause in CLAUSE_SEPARATOR.split(input_text.strip()):
+        clause = clause.strip().rstrip('.')
+        if not clause:
+            continue
+        instruction = _scanner.fullmatch(clause)
+        if instruction is None:
+            logger.debug("Clause does not match command grammar: %s", clause)
+            return None
+        instructions.append(instruction)
+
+    return instructions or None
+
+@timed('map_deepseek_response_to_instructions')
 def map_deepseek_response_to_instructions(raw_instructions):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Mapping raw instructions: {raw_instructions}")
+    logger.debug("Mapping raw instructions: %s", raw_instructions)
 
     instructions = []
 
     try:
-        # Extract transfer SOL instructions
-        transfer_matches = re.findall(r'transfer (\d+\.?\d*) SOL to (\w+)', raw_instructions)
-        for amount, recipient in transfer_matches:
-            instructions.append({
-                'type': 'transfer',
-                'asset': 'SOL',
-                'amount': float(amount),
-                'recipient': recipient
-            })
-
-        # Extract stake tokens instructions
-        stake_matches = re.findall(r'stake (\d+\.?\d*) tokens with (\w+)', raw_instructions)
-        for amount, validator in stake_matches:
-            instructions.append({
-                'type': 'stake',
-                'asset': 'tokens',
-                'amount': float(amount),
-                'validator': validator
-            })
-
-        # Extract NFT-related instructions
-        nft_transfer_matches = re.findall(r'transfer NFT (\w+) to (\w+)', raw_instructions)
-        for nft_id, recipient in nft_transfer_matches:
-            instructions.append({
-                'type': 'nft_transfer',
-                'nft_id': nft_id,
-                'recipient': recipient
-            })
-
-        # Extract governance instructions
-        governance_vote_matches = re.findall(r'vote (\w+) on proposal (\w+)', raw_instructions)
-        for vote, proposal_id in governance_vote_matches:
-            instructions.append({
-                'type': 'governance_vote',
-                'vote': vote,
-                'proposal_id': proposal_id
-            })
-
-        # Extract lending instructions
-        lending_borrow_matches = re.findall(r'borrow (\d+\.?\d*) (\w+) from (\w+)', raw_instructions)
-        for amount, asset, platform in lending_borrow_matches:
-            instructions.append({
-                'type': 'borrow',
-                'asset': asset,
-                'amount': float(amount),
-                'platform': platform
-            })
-
-        # Extract Raydium-specific transactions
-        raydium_swap_matches = re.findall(r'swap (\d+\.?\d*) (\w+) for (\w+) on Raydium', raw_instructions)
-        for amount, from_asset, to_asset in raydium_swap_matches:
-            instructions.append({
-                'type': 'raydium_swap',
-                'from_asset': from_asset,
-                'to_asset': to_asset,
-                'amount': float(amount)
-            })
-
-        # Extract Pumpfun-specific transactions
-        pumpfun_action_matches = re.findall(r'perform (\w+) action on Pumpfun', raw_instructions)
-        for action in pumpfun_action_matches:
-            instructions.append({
-                'type': 'pumpfun_action',
-                'action': action
-            })
-
-        logger.debug(f"Mapped instructions: {instructions}")
+        instructions = list(_scanner.scan(raw_instructions))
+        logger.debug("Mapped instructions: %s", instructions)
 
     except Exception as error:
-        logger.error(f"Error mapping instructions: {error}")
+        logger.error("Error mapping instructions: %s", error)
 
-    return instructions
\ No newline at end of file
+    return instructions
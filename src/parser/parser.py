@@ -1,31 +1,163 @@
 import logging
-from .deepseek import DeepSeekInterface
-from .mappings import map_deepseek_response_to_instructions
+import threading
+from .deepseek import DeepSeekInterface, estimate_tokens, BATCH_PREAMBLE
+from .mappings import parse_command_grammar
+
+logger = logging.getLogger(__name__)
+
+GRAMMAR_PATH = 'grammar'
+LLM_PATH = 'llm'
+DEFAULT_BATCH_TOKEN_BUDGET = 8000
+BATCH_ITEM_OVERHEAD_TOKENS = 4
 
 class InstructionParser:
-    def __init__(self, api_key):
-        self._deepseek_interface = DeepSeekInterface(api_key)
+    def __init__(self, api_key, cache=None, grammar_fast_path=True, interface=None):
+        self._api_key = api_key
+        self._cache = cache
+        self._deepseek = interface
+        self._deepseek_lock = threading.Lock()
+        self.grammar_fast_path = grammar_fast_path
+        self._path_counts = {GRAMMAR_PATH: 0, LLM_PATH: 0}
+        self._path_lock = threading.Lock()
         self._logger = self._setup_logger()
 
     def _setup_logger(self):
-        logger = logging.getLogger(__name__)
         logger.info("InstructionParser initialized")
         return logger
 
-    def parse_input(self, input_text, context_info):
-        self._logger.debug(f"Parsing input: {input_text} with context: {context_info}")
+    @property
+    def _deepseek_interface(self):
+        if self._deepseek is None:
+            with self._deepseek_lock:
+                if self._deepseek is None:
+                    self._logger.debug("Loading DeepSeek client")
+                    self._deepseek = DeepSeekInterface(self._api_key, cache=self._cache)
+        return self._deepseek
+
+    def preload(self):
+        return self._deepseek_interface
+
+    def _record_path(self, path):
+        with self._path_lock:
+            self._path_counts[path] += 1
+
+    def _parse_grammar(self, input_text):
+        if not self.grammar_fast_path:
+            return None
+        instructions = parse_command_grammar(input_text)
+        if instructions is not None:
+            self._record_path(GRAMMAR_PATH)
+            self._logger.debug("Input parsed by command grammar: %s", instructions)
+        return instructions
+
+    def path_stats(self):
+        with self._path_lock:
+            counts = dict(self._path_counts)
+        total = sum(counts.values())
+        return {
+            'counts': counts,
+            'fractions': {path: count / total if total else 0.0 for path, count in counts.items()},
+            'total': total,
+        }
+
+    def parse_input(self, input_text, context_info=None):
+        self._logger.debug("Parsing input: %s with context: %s", input_text, context_info)
         try:
-            raw_instructions = self._deepseek_interface.extract_instructions(input_text, context_info)
-            self._logger.debug(f"Raw instructions received: {raw_instructions}")
-            instructions = map_deepseek_response_to_instructions(raw_instructions)
-            self._logger.debug(f"Parsed instructions: {instructions}")
+            instructions = self._parse_grammar(input_text)
+            if instructions is not None:
+                return instructions
+            self._record_path(LLM_PATH)
+            instructions = self._deepseek_interface.extract_instructions(input_text, context_info)
+            self._logger.debug("Parsed instructions: %s", instructions)
             return instructions
         except Exception as error:
-            self._logger.error(f"Error parsing input: {error}")
+            self._logger.error("Error parsing input: %s", error)
             return []
 
-    def process_and_map(self, input_text, context_info):
-        self._logger.debug(f"Processing and mapping input: {input_text} with context: {context_info}")
+    async def parse_input_async(self, input_text, context_info=None):
+        self._logger.debug("Parsing input asynchronously: %s with context: %s", input_text, context_info)
+        try:
+            instructions = self._parse_grammar(input_text)
+            if instructions is not None:
+                return instructions
+            self._record_path(LLM_PATH)
+            instructions = await self._deepseek_interface.extract_instructions_async(input_text, context_info)
+            self._logger.debug("Parsed instructions: %s", instructions)
+            return instructions
+        except Exception as error:
+            self._logger.error("Error parsing input: %s", error)
+            return []
+
+    def parse_input_stream(self, input_text, context_info=None):
+        self._logger.debug("Streaming parse of input: %s with context: %s", input_text, context_info)
+        instructions = self._parse_grammar(input_text)
+        if instructions is not None:
+            yield from instructions
+            return
+        self._record_path(LLM_PATH)
+        yield from self._deepseek_interface.stream_instructions(input_text, context_info)
+
+    async def parse_input_stream_async(self, input_text, context_info=None):
+        self._logger.debug("Streaming parse of input asynchronously: %s with context: %s", input_text, context_info)
+        instructions = self._parse_grammar(input_text)
+        if instructions is not None:
+            for instruction in instructions:
+                yield instruction
+            return
+        self._record_path(LLM_PATH)
+        async for instruction in self._deepseek_interface.stream_instructions_async(input_text, context_info):
+            yield instruction
+
+    def _pack_batches(self, indexed_inputs, token_budget):
+        batches = []
+        current = []
+        current_tokens = estimate_tokens(BATCH_PREAMBLE)
+        for index, input_text in indexed_inputs:
+            tokens = estimate_tokens(input_text) + BATCH_ITEM_OVERHEAD_TOKENS
+            if current and current_tokens + tokens > token_budget:
+                batches.append(current)
+                current = []
+                current_tokens = estimate_tokens(BATCH_PREAMBLE)
+            current.append((index, input_text))
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def parse_batch(self, input_texts, context_info=None, token_budget=DEFAULT_BATCH_TOKEN_BUDGET):
+        self._logger.debug("Parsing batch of %s inputs with context: %s", len(input_texts), context_info)
+        results = [None] * len(input_texts)
+        pending = []
+        for index, input_text in enumerate(input_texts):
+            instructions = self._parse_grammar(input_text)
+            if instructions is not None:
+                results[index] = instructions
+            else:
+                pending.append((index, input_text))
+
+        for batch in self._pack_batches(pending, token_budget):
+            if len(batch) == 1:
+                index, input_text = batch[0]
+                self._record_path(LLM_PATH)
+                results[index] = self._deepseek_interface.extract_instructions(input_text, context_info)
+                continue
+
+            batch_results = self._deepseek_interface.extract_instructions_batch(
+                [input_text for _, input_text in batch], context_info
+            )
+            for (index, input_text), instructions in zip(batch, batch_results):
+                self._record_path(LLM_PATH)
+                if instructions:
+                    results[index] = instructions
+                else:
+                    self._logger.debug("Batch item %s failed, retrying individually", index)
+                    results[index] = self._deepseek_interface.extract_instructions(input_text, context_info)
+
+        self._logger.debug("Parsed batch instructions: %s", results)
+        return results
+
+    def process_and_map(self, input_text, context_info=None):
+        self._logger.debug("Processing and mapping input: %s with context: %s", input_text, context_info)
         instructions = self.parse_input(input_text, context_info)
-        self._logger.debug(f"Processed and mapped instructions: {instructions}")
-        return instructions
\ No newline at end of file
+        self._logger.debug("Processed and mapped instructions: %s", instructions)
+        return instructions
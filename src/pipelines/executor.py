@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from collections import Counter
+from itertools import islice
+from base58 import b58encode
+from solana.transaction import Transaction
+from src.utils.blockhash import BlockhashProvider
+from src.utils.confirmation import (
+    ConfirmationTracker,
+    DEFAULT_EXPIRY,
+    MAX_SIGNATURES_PER_REQUEST,
+    TransactionExpiredError
+)
+from src.utils.ledger import CONFIRMED, EXPIRED, FAILED, PENDING, SENT
+from src.utils.packer import pack_groups, required_signers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 64
+DEFAULT_RECONCILE_INTERVAL = 2.0
+
+class WorkItem:
+    def __init__(self, keys, instructions, signers=()):
+        self.keys = [keys] if isinstance(keys, str) else list(keys)
+        self.instructions = instructions
+        self.signers = list(signers)
+
+def iter_windows(rows, size):
+    rows = iter(rows)
+    while True:
+        window = list(islice(rows, size))
+        if not window:
+            return
+        yield window
+
+class BatchExecutor:
+    def __init__(self, client, payer, ledger, blockhash_provider=None, confirmation_tracker=None,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, commitment='confirmed', ordered=False):
+        self._client = client
+        self.payer = payer
+        self.ledger = ledger
+        self.commitment = commitment
+        self.ordered = ordered
+        self._owns_provider = blockhash_provider is None
+        self.blockhash_provider = blockhash_provider if blockhash_provider is not None else BlockhashProvider(client)
+        self._owns_tracker = confirmation_tracker is None
+        self.confirmation_tracker = confirmation_tracker if confirmation_tracker is not None else ConfirmationTracker(client)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._logger = self._setup_logger()
+        if self._owns_provider:
+            self.blockhash_provider.start()
+
+    def _setup_logger(self):
+        logger.info("BatchExecutor initialized")
+        return logger
+
+    def reconcile(self, poll_interval=DEFAULT_RECONCILE_INTERVAL):
+        while True:
+            in_flight = self.ledger.in_flight()
+            if not in_flight:
+                return
+            self._logger.info("Reconciling %s in-flight transaction(s) from %s", len(in_flight), self.ledger.path)
+            block_height = self._client.get_block_height()['result']
+            signatures = list(in_flight)
+            unresolved = 0
+            for offset in range(0, len(signatures), MAX_SIGNATURES_PER_REQUEST):
+                batch = signatures[offset:offset + MAX_SIGNATURES_PER_REQUEST]
+                response = self._client.get_signature_statuses(batch, search_transaction_history=True)
+                for signature, status in zip(batch, response['result']['value']):
+                    entries = in_flight[signature]
+                    keys = [entry['key'] for entry in entries]
+                    if status is not None and status.get('err') is not None:
+                        self.ledger.record(keys, FAILED, signature=signature, error=str(status['err']))
+                    elif status is not None and status.get('confirmationStatus') in ('confirmed', 'finalized'):
+                        self.ledger.record(keys, CONFIRMED, signature=signature)
+                    elif status is None and self._expired(entries[0], block_height):
+                        self.ledger.record(keys, EXPIRED, signature=signature)
+                    else:
+                        unresolved += 1
+            if unresolved:
+                self._logger.info("Waiting for %s transaction(s) to land or expire", unresolved)
+                time.sleep(poll_interval)
+
+    def _expired(self, entry, block_height):
+        last_valid_block_height = entry.get('last_valid_block_height')
+        if last_valid_block_height is not None:
+            return block_height > last_valid_block_height
+        return time.time() - entry['time'] >= DEFAULT_EXPIRY
+
+    def _sign(self, instructions, signers, recent_blockhash):
+        transaction = Transaction(recent_blockhash=recent_blockhash, fee_payer=self.payer.public_key)
+        transaction.add(*instructions)
+        required = required_signers(instructions)
+        extra = {str(signer.public_key): signer for signer in signers if str(signer.public_key) in required}
+        transaction.sign(self.payer, *extra.values())
+        return transaction
+
+    def _settle(self, keys, signature, future):
+        try:
+            future.result()
+            self.ledger.record(keys, CONFIRMED, signature=signature)
+        except TransactionExpiredError:
+            self.ledger.record(keys, EXPIRED, signature=signature)
+        except Exception as error:
+            self.ledger.record(keys, FAILED, signature=signature, error=str(error))
+        finally:
+            self._slots.release()
+
+    def _submit(self, keys, transaction, last_valid_block_height):
+        signature = b58encode(transaction.signature()).decode('utf-8')
+        self.ledger.record(keys, PENDING, signature=signature, last_valid_block_height=last_valid_block_height)
+        signature, future = self.confirmation_tracker.submit(transaction, self.commitment, last_valid_block_height)
+        self.ledger.record(keys, SENT, signature=signature, last_valid_block_height=last_valid_block_height)
+        return signature, future
+
+    def _drain(self):
+        for _ in range(self.max_in_flight):
+            self._slots.acquire()
+        for _ in range(self.max_in_flight):
+            self._slots.release()
+
+    def execute(self, items):
+        buildable = []
+        for item in items:
+            if not item.instructions or any(instruction is None for instruction in item.instructions):
+                self._logger.error("Skipping %s: instruction build failed", ', '.join(item.keys))
+                self.ledger.record(item.keys, FAILED, error="instruction build failed")
+            else:
+                buildable.append(item)
+
+        transactions = 0
+        if buildable:
+            groups = pack_groups([item.instructions for item in buildable], self.payer.public_key, ordered=self.ordered)
+            for indices, instructions in groups:
+                keys = [key for index in indices for key in buildable[index].keys]
+                signers = [signer for index in indices for signer in buildable[index].signers]
+                self._slots.acquire()
+                try:
+                    blockhash, last_valid_block_height = self.blockhash_provider.get_blockhash_with_height()
+                    signature, future = self._submit(keys, self._sign(instructions, signers, blockhash), last_valid_block_height)
+                except Exception as error:
+                    self._slots.release()
+                    self._logger.error("Error sending batch of %s item(s): %s", len(indices), error)
+                    self.ledger.record(keys, FAILED, error=str(error))
+                    continue
+                future.add_done_callback(lambda done, keys=keys, signature=signature: self._settle(keys, signature, done))
+                transactions += 1
+            self._drain()
+            self._logger.info("Executed %s item(s) in %s transaction(s)", len(buildable), transactions)
+
+        return Counter(self.ledger.state(key) for item in items for key in item.keys)
+
+    def close(self):
+        if self._owns_provider:
+            self.blockhash_provider.stop()
+        if self._owns_tracker:
+            self.confirmation_tracker.stop()
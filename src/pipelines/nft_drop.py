@@ -0,0 +1,119 @@
+import argparse
+import hashlib
+import logging
+from collections import Counter
+from solana.keypair import Keypair
+from src.instructions.nft import (
+    create_metadata_instruction_for_mint,
+    create_mint_nft_instruction_for_owner,
+    create_update_metadata_instruction_for_mint
+)
+from src.instructions.token import (
+    create_associated_token_account_instruction,
+    create_initialize_mint_instruction,
+    create_mint_account_instruction
+)
+from src.pipelines.executor import BatchExecutor, DEFAULT_MAX_IN_FLIGHT, WorkItem, iter_windows
+from src.utils.derivation import derive_many
+from src.utils.helper import iter_records
+from src.utils.ledger import CONFIRMED, Ledger
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 512
+MINT_SEED_DOMAIN = b'persephai-nft-drop:'
+METADATA_FIELDS = ('name', 'symbol', 'uri', 'seller_fee_basis_points', 'creators')
+
+def mint_keypair(drop_seed, row_id):
+    return Keypair.from_seed(hashlib.sha256(MINT_SEED_DOMAIN + drop_seed + str(row_id).encode('utf-8')).digest())
+
+def metadata_from_row(row):
+    metadata = {field: row[field] for field in METADATA_FIELDS if row.get(field) not in (None, '')}
+    if 'seller_fee_basis_points' in metadata:
+        metadata['seller_fee_basis_points'] = int(metadata['seller_fee_basis_points'])
+    return metadata
+
+class NftDropPipeline:
+    def __init__(self, client, payer, ledger_path, drop_seed=None, update_authority=None, window=DEFAULT_WINDOW,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, commitment='confirmed', derivation_executor=None):
+        self.payer = payer
+        self.drop_seed = drop_seed if drop_seed is not None else bytes(payer.secret_key)
+        self.update_authority = update_authority if update_authority is not None else payer.public_key
+        self.window = window
+        self.derivation_executor = derivation_executor
+        self.ledger = Ledger(ledger_path)
+        self.executor = BatchExecutor(client, payer, self.ledger, max_in_flight=max_in_flight, commitment=commitment)
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.info("NftDropPipeline initialized")
+        return logger
+
+    def mint_for(self, row_id):
+        return mint_keypair(self.drop_seed, row_id).public_key
+
+    def build(self, rows):
+        mints = [mint_keypair(self.drop_seed, row['id']) for row in rows]
+        mint_pubkeys = [str(mint.public_key) for mint in mints]
+        owners = [row.get('owner') or str(self.payer.public_key) for row in rows]
+        # Without an executor, derive_many reuses one module-wide process pool, so only the first window pays startup.
+        derive_many('metadata', mint_pubkeys, executor=self.derivation_executor)
+        derive_many('master_edition', mint_pubkeys, executor=self.derivation_executor)
+        derive_many('ata', list(zip(owners, mint_pubkeys)), executor=self.derivation_executor)
+
+        items = []
+        for row, mint, mint_pubkey, owner in zip(rows, mints, mint_pubkeys, owners):
+            instructions = [
+                create_mint_account_instruction(self.payer.public_key, mint_pubkey),
+                create_initialize_mint_instruction(mint_pubkey, 0, self.payer.public_key, self.payer.public_key),
+                create_associated_token_account_instruction(self.payer.public_key, owner, mint_pubkey),
+                create_metadata_instruction_for_mint(mint_pubkey, self.payer.public_key, self.update_authority, metadata_from_row(row)),
+                create_mint_nft_instruction_for_owner(mint_pubkey, owner, self.payer.public_key),
+            ]
+            if row.get('update'):
+                instructions.append(create_update_metadata_instruction_for_mint(mint_pubkey, self.update_authority, row['update']))
+            items.append(WorkItem(str(row['id']), instructions, [mint]))
+        return items
+
+    def run(self, manifest):
+        self.executor.reconcile()
+        rows = iter_records(manifest) if isinstance(manifest, str) else manifest
+        summary = Counter()
+        for window in iter_windows(rows, self.window):
+            pending = [row for row in window if self.ledger.state(str(row['id'])) != CONFIRMED]
+            summary['skipped'] += len(window) - len(pending)
+            if pending:
+                summary.update(self.executor.execute(self.build(pending)))
+            self._logger.info("NFT drop progress: %s", dict(summary))
+        return dict(summary)
+
+    def close(self):
+        self.executor.close()
+        self.ledger.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mint a collection from a manifest of metadata rows")
+    parser.add_argument('manifest', help="JSON lines or CSV file with id, name, symbol, uri and optional owner/update per row")
+    parser.add_argument('--ledger', required=True, help="Checkpoint file; rerun with the same path to resume")
+    parser.add_argument('--key-env', default='SOLANA_PRIVATE_KEY', help="Environment variable holding the payer key")
+    parser.add_argument('--rpc-url', default="https://api.mainnet-beta.solana.com")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="Rows built and signed per batch")
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Unconfirmed transactions allowed at once")
+    args = parser.parse_args(argv)
+
+    from src.utils.rpc_pool import RpcPool
+    from src.utils.security import load_private_key_from_env
+
+    payer = load_private_key_from_env(args.key_env)
+    if payer is None:
+        raise SystemExit(f"Could not load payer key from {args.key_env}")
+    client = RpcPool([args.rpc_url])
+    pipeline = NftDropPipeline(client, payer, args.ledger, window=args.window, max_in_flight=args.max_in_flight)
+    try:
+        print(pipeline.run(args.manifest))
+    finally:
+        pipeline.close()
+        client.close()
+
+if __name__ == '__main__':
+    main()
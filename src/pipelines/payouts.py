@@ -0,0 +1,161 @@
+import argparse
+import hashlib
+import json
+import logging
+from collections import Counter
+from decimal import Decimal
+from src.instructions.templates import TRANSFER_SOL_TEMPLATE, TRANSFER_TOKEN_TEMPLATE
+from src.instructions.token import create_associated_token_account_instruction
+from src.pipelines.executor import BatchExecutor, DEFAULT_MAX_IN_FLIGHT, WorkItem, iter_windows
+from src.utils.accounts import AccountResolver
+from src.utils.derivation import derive_ata, derive_many
+from src.utils.helper import iter_records
+from src.utils.ledger import CONFIRMED, Ledger
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 1024
+SOL_DECIMALS = 9
+
+def payout_key(row, mint=None):
+    if row.get('id') not in (None, ''):
+        return str(row['id'])
+    # Without an id, the key is the row itself so that reordering or editing the file cannot remap payments.
+    content = json.dumps([str(mint) if mint else 'SOL', row], sort_keys=True, default=str)
+    return 'sha256:' + hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def base_units(amount, decimals):
+    return int(Decimal(str(amount)).scaleb(decimals))
+
+class PayoutPipeline:
+    def __init__(self, client, payer, ledger_path, mint=None, account_resolver=None, window=DEFAULT_WINDOW,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, commitment='confirmed', create_missing_accounts=True):
+        self.payer = payer
+        self.account_resolver = account_resolver if account_resolver is not None else AccountResolver(client)
+        self.mint = self.account_resolver.mint_for(mint)
+        self.window = window
+        self.create_missing_accounts = create_missing_accounts
+        self.ledger = Ledger(ledger_path)
+        self.executor = BatchExecutor(client, payer, self.ledger, max_in_flight=max_in_flight, commitment=commitment)
+        self._decimals = None
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.info("PayoutPipeline initialized for %s", self.mint or 'SOL')
+        return logger
+
+    @property
+    def decimals(self):
+        if self._decimals is None:
+            self._decimals = SOL_DECIMALS if self.mint is None else self.account_resolver.get_decimals(self.mint)
+        return self._decimals
+
+    def _amount(self, row):
+        if row.get('raw_amount') not in (None, ''):
+            return int(row['raw_amount'])
+        return base_units(row['amount'], self.decimals)
+
+    def build_sol(self, keyed_rows):
+        instructions = TRANSFER_SOL_TEMPLATE.build_many([
+            {'sender': self.payer.public_key, 'recipient': row['recipient'], 'lamports': self._amount(row)}
+            for _, row in keyed_rows
+        ])
+        return [WorkItem(key, [instruction]) for (key, _), instruction in zip(keyed_rows, instructions)]
+
+    def build_token(self, keyed_rows):
+        destinations = [str(address) for address in derive_many('ata', [(row['recipient'], self.mint) for _, row in keyed_rows])]
+        self.account_resolver.prefetch(token_accounts=destinations)
+        transfers = TRANSFER_TOKEN_TEMPLATE.build_many([
+            {
+                'source': derive_ata(self.payer.public_key, self.mint),
+                'mint': self.mint,
+                'destination': destination,
+                'owner': self.payer.public_key,
+                'amount': self._amount(row),
+                'decimals': self.decimals,
+            }
+            for (_, row), destination in zip(keyed_rows, destinations)
+        ])
+
+        items = []
+        created = []
+        for (key, row), destination, transfer in zip(keyed_rows, destinations, transfers):
+            instructions = [transfer]
+            if self.create_missing_accounts and self.account_resolver.get_token_account(destination) is None:
+                instructions.insert(0, create_associated_token_account_instruction(self.payer.public_key, row['recipient'], self.mint))
+                created.append(destination)
+            items.append(WorkItem(key, instructions))
+        if created:
+            self._logger.info("Creating %s missing token account(s) alongside their transfers", len(created))
+            for destination in created:
+                self.account_resolver.invalidate(destination)
+        return items
+
+    def build(self, keyed_rows):
+        return self.build_sol(keyed_rows) if self.mint is None else self.build_token(keyed_rows)
+
+    def _rows(self, recipients):
+        return iter_records(recipients) if isinstance(recipients, str) else iter(recipients)
+
+    def check_duplicates(self, recipients):
+        seen = set()
+        duplicates = []
+        for row in self._rows(recipients):
+            key = payout_key(row, self.mint)
+            if key in seen:
+                duplicates.append((key, row.get('recipient')))
+            seen.add(key)
+        if duplicates:
+            key, recipient = duplicates[0]
+            raise ValueError(f"{len(duplicates)} duplicate payout(s), first {key} for {recipient}; "
+                             "give repeated payments distinct ids")
+
+    def run(self, recipients):
+        if not isinstance(recipients, str) and iter(recipients) is recipients:
+            recipients = list(recipients)
+        # Keys are checked over the whole input first so that a duplicate cannot abort a half-paid run.
+        self.check_duplicates(recipients)
+        self.executor.reconcile()
+        summary = Counter()
+        for window in iter_windows(self._rows(recipients), self.window):
+            keyed_rows = [(payout_key(row, self.mint), row) for row in window]
+            pending = [(key, row) for key, row in keyed_rows if self.ledger.state(key) != CONFIRMED]
+            summary['skipped'] += len(keyed_rows) - len(pending)
+            if pending:
+                summary.update(self.executor.execute(self.build(pending)))
+            self._logger.info("Payout progress: %s", dict(summary))
+        return dict(summary)
+
+    def close(self):
+        self.executor.close()
+        self.ledger.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pay SOL or an SPL token to every recipient in a CSV or JSON lines file")
+    parser.add_argument('recipients', help="CSV or JSON lines file with recipient, amount (or raw_amount) and an optional unique id")
+    parser.add_argument('--ledger', required=True, help="Append-only ledger; rerun with the same path to resume")
+    parser.add_argument('--mint', help="SPL token mint or registered symbol; pays SOL when omitted")
+    parser.add_argument('--key-env', default='SOLANA_PRIVATE_KEY', help="Environment variable holding the payer key")
+    parser.add_argument('--rpc-url', default="https://api.mainnet-beta.solana.com")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW, help="Recipients resolved and signed per batch")
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT, help="Unconfirmed transactions allowed at once")
+    parser.add_argument('--no-create-accounts', action='store_true', help="Do not create missing recipient token accounts")
+    args = parser.parse_args(argv)
+
+    from src.utils.rpc_pool import RpcPool
+    from src.utils.security import load_private_key_from_env
+
+    payer = load_private_key_from_env(args.key_env)
+    if payer is None:
+        raise SystemExit(f"Could not load payer key from {args.key_env}")
+    client = RpcPool([args.rpc_url])
+    pipeline = PayoutPipeline(client, payer, args.ledger, mint=args.mint, window=args.window, max_in_flight=args.max_in_flight,
+                              create_missing_accounts=not args.no_create_accounts)
+    try:
+        print(pipeline.run(args.recipients))
+    finally:
+        pipeline.close()
+        client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+import hashlib
+import logging
+import struct
+from solana.transaction import Transaction
+from base58 import b58encode
+from src.instructions.staking import (
+    create_deactivate_stake_instruction,
+    create_delegate_stake_instruction,
+    create_deposit_stake_instruction,
+    create_initialize_stake_instruction,
+    create_split_stake_instruction,
+    create_stake_account_with_seed_instruction,
+    stake_account_with_seed,
+    STAKE_RENT_EXEMPT_RESERVE
+)
+from src.pipelines.executor import WorkItem
+from src.utils.accounts import account_data, fetch_multiple_accounts, read_u64
+from src.utils.ledger import CONFIRMED
+from src.utils.packer import pack_groups
+
+logger = logging.getLogger(__name__)
+
+STAKE_STATE_INITIALIZED = 1
+STAKE_STATE_DELEGATED = 2
+STAKE_RENT_EXEMPT_RESERVE_OFFSET = 4
+STAKE_STAKER_OFFSET = 12
+STAKE_VOTER_OFFSET = 124
+STAKE_AMOUNT_OFFSET = 156
+STAKE_ACTIVATION_EPOCH_OFFSET = 164
+STAKE_DEACTIVATION_EPOCH_OFFSET = 172
+STAKE_META_SIZE = 124
+NOT_DEACTIVATING = 2 ** 64 - 1
+DEFAULT_MIN_MOVE_LAMPORTS = 1_000_000_000
+
+ACTIVE = 'active'
+ACTIVATING = 'activating'
+DEACTIVATING = 'deactivating'
+INACTIVE = 'inactive'
+NEW_ACCOUNT_MOVES = ('split_deactivate', 'split_delegate', 'create')
+
+def decode_stake_account(data):
+    if data is None or len(data) < STAKE_META_SIZE:
+        return None
+    state = struct.unpack_from('<I', data)[0]
+    if state == STAKE_STATE_INITIALIZED:
+        delegation = {'voter': None, 'stake': 0, 'activation_epoch': None, 'deactivation_epoch': None}
+    elif state == STAKE_STATE_DELEGATED and len(data) >= STAKE_DEACTIVATION_EPOCH_OFFSET + 8:
+        delegation = {
+            'voter': b58encode(data[STAKE_VOTER_OFFSET:STAKE_VOTER_OFFSET + 32]).decode('utf-8'),
+            'stake': read_u64(data, STAKE_AMOUNT_OFFSET),
+            'activation_epoch': read_u64(data, STAKE_ACTIVATION_EPOCH_OFFSET),
+            'deactivation_epoch': read_u64(data, STAKE_DEACTIVATION_EPOCH_OFFSET),
+        }
+    else:
+        return None
+    return dict(
+        delegation,
+        rent_exempt_reserve=read_u64(data, STAKE_RENT_EXEMPT_RESERVE_OFFSET),
+        staker=b58encode(data[STAKE_STAKER_OFFSET:STAKE_STAKER_OFFSET + 32]).decode('utf-8'),
+    )
+
+def stake_status(account, epoch):
+    if account['voter'] is None:
+        return INACTIVE
+    if account['deactivation_epoch'] != NOT_DEACTIVATING:
+        return INACTIVE if account['deactivation_epoch'] < epoch else DEACTIVATING
+    return ACTIVE if account['activation_epoch'] < epoch else ACTIVATING
+
+def target_allocation(weights, total):
+    import numpy as np
+
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.sum() <= 0:
+        raise ValueError("Target weights must sum to a positive value")
+    target = np.floor(weights / weights.sum() * total).astype(np.int64)
+    target[np.argmax(weights)] += total - int(target.sum())
+    return target
+
+def _take_largest_first(voter, stake, surplus):
+    import numpy as np
+
+    order = np.lexsort((-stake, voter))
+    sorted_voter = voter[order]
+    sorted_stake = stake[order]
+    group_start = np.r_[True, sorted_voter[1:] != sorted_voter[:-1]] if len(order) else np.zeros(0, dtype=bool)
+    running = np.cumsum(sorted_stake)
+    taken_before = running - sorted_stake - np.maximum.accumulate(np.where(group_start, running - sorted_stake, 0))
+    return order, np.clip(surplus[sorted_voter] - taken_before, 0, sorted_stake)
+
+def _match(source_amount, sink_amount):
+    import numpy as np
+
+    source_end = np.cumsum(source_amount)
+    sink_end = np.cumsum(sink_amount)
+    breaks = np.union1d(source_end, sink_end)
+    breaks = breaks[breaks <= min(source_end[-1], sink_end[-1])]
+    return np.diff(np.r_[0, breaks]), np.searchsorted(source_end, breaks), np.searchsorted(sink_end, breaks)
+
+def plan_rebalance(accounts, targets, total=None, min_move_lamports=DEFAULT_MIN_MOVE_LAMPORTS, pooled=None):
+    import numpy as np
+
+    pooled = pooled or {}
+    committed = [account for account in accounts if account['status'] in (ACTIVE, ACTIVATING)]
+    free = sorted((account for account in accounts if account['status'] == INACTIVE), key=lambda account: -account['stake'])
+    in_transit = sum(account['stake'] for account in accounts if account['status'] == DEACTIVATING)
+
+    validators = list(dict.fromkeys(list(targets) + [account['voter'] for account in committed] + list(pooled)))
+    index = {validator: position for position, validator in enumerate(validators)}
+    voter = np.fromiter((index[account['voter']] for account in committed), dtype=np.int64, count=len(committed))
+    stake = np.fromiter((account['stake'] for account in committed), dtype=np.int64, count=len(committed))
+    free_stake = np.fromiter((account['stake'] for account in free), dtype=np.int64, count=len(free))
+
+    current = np.fromiter((pooled.get(validator, 0) for validator in validators), dtype=np.int64, count=len(validators))
+    np.add.at(current, voter, stake)
+    held = int(current.sum()) + int(free_stake.sum()) + in_transit
+    total = held if total is None else int(total)
+    delta = target_allocation([targets.get(validator, 0) for validator in validators], total) - current
+    delta[np.abs(delta) < min_move_lamports] = 0
+
+    # Over-weight validators deactivate their largest fully active accounts first. Activating stake and
+    # stake waiting for a pool deposit cannot be moved this epoch.
+    moves = []
+    movable = np.flatnonzero(np.fromiter(
+        (account['status'] == ACTIVE and not account.get('pending_deposit') for account in committed),
+        dtype=bool, count=len(committed)
+    ))
+    order, take = _take_largest_first(voter[movable], stake[movable], np.maximum(-delta, 0))
+    for position, amount in zip(movable[order].tolist(), take.tolist()):
+        if amount < min_move_lamports:
+            continue
+        available = int(stake[position])
+        whole = available - amount < min_move_lamports
+        moves.append({
+            'type': 'deactivate' if whole else 'split_deactivate',
+            'stake_account': committed[position]['pubkey'],
+            'validator': None,
+            'lamports': available if whole else amount,
+        })
+
+    # Under-weight validators are filled from stake that is already inactive, then from new funds. Whatever
+    # is still deactivating is delegated in a later epoch, once it has cooled down.
+    source_amount = free_stake
+    if total - held >= min_move_lamports:
+        source_amount = np.r_[source_amount, total - held]
+    sink_validator = np.flatnonzero(delta > 0)
+    if not len(source_amount) or not len(sink_validator):
+        return moves
+    amounts, source, sink = _match(source_amount, delta[sink_validator])
+    single = np.bincount(source, minlength=len(source_amount)) == 1
+    for amount, source_index, sink_index in zip(amounts.tolist(), source.tolist(), sink.tolist()):
+        if amount < min_move_lamports:
+            continue
+        validator = validators[sink_validator[sink_index]]
+        if source_index >= len(free):
+            moves.append({'type': 'create', 'stake_account': None, 'validator': validator, 'lamports': amount})
+            continue
+        whole = single[source_index] and amount == free_stake[source_index]
+        moves.append({
+            'type': 'delegate' if whole else 'split_delegate',
+            'stake_account': free[source_index]['pubkey'],
+            'validator': validator,
+            'lamports': amount,
+        })
+    return moves
+
+def move_seed(move, epoch):
+    plan = f"{epoch}:{move['type']}:{move['stake_account']}:{move['validator']}:{move['lamports']}"
+    return hashlib.sha256(plan.encode('utf-8')).hexdigest()[:32]
+
+def move_key(move, epoch, new_account=None):
+    return ':'.join(str(part) for part in (
+        epoch, move['type'], move['stake_account'] or '-', new_account or '-', move['validator'] or '-', move['lamports']
+    ))
+
+def parse_move_key(key):
+    parts = key.split(':')
+    if len(parts) != 6:
+        return None
+    epoch, move_type, stake_account, new_account, validator, lamports = parts
+    return {
+        'epoch': int(epoch),
+        'type': move_type,
+        'stake_account': None if stake_account == '-' else stake_account,
+        'new_account': None if new_account == '-' else new_account,
+        'validator': None if validator == '-' else validator,
+        'lamports': int(lamports),
+    }
+
+class StakeRebalancer:
+    def __init__(self, client, owner, stake_pool=None, min_move_lamports=DEFAULT_MIN_MOVE_LAMPORTS,
+                 rent_exempt_reserve=STAKE_RENT_EXEMPT_RESERVE):
+        self._client = client
+        self.owner = owner
+        self.stake_pool = stake_pool
+        self.min_move_lamports = min_move_lamports
+        self.rent_exempt_reserve = rent_exempt_reserve
+        self._logger = self._setup_logger()
+
+    def _setup_logger(self):
+        logger.info("StakeRebalancer initialized")
+        return logger
+
+    def current_epoch(self):
+        return self._client.get_epoch_info()['result']['epoch']
+
+    def fetch_accounts(self, stake_accounts, epoch, pending_deposits=()):
+        pending_deposits = set(pending_deposits)
+        accounts = []
+        for pubkey, account in fetch_multiple_accounts(self._client, stake_accounts).items():
+            decoded = decode_stake_account(account_data(account))
+            if decoded is None:
+                self._logger.warning("Skipping stake account %s: missing or not a stake account", pubkey)
+                continue
+            status = stake_status(decoded, epoch)
+            if status == INACTIVE:
+                decoded['stake'] = account['lamports'] - decoded['rent_exempt_reserve']
+            accounts.append(dict(decoded, pubkey=pubkey, status=status, pending_deposit=pubkey in pending_deposits))
+        return accounts
+
+    def from_ledger(self, ledger):
+        created = {}
+        deposited = {}
+        for key in ledger.keys(states=(CONFIRMED,)):
+            move = parse_move_key(key)
+            if move is None:
+                continue
+            if move['type'] in NEW_ACCOUNT_MOVES:
+                created[move['new_account']] = move
+            elif move['type'] == 'deposit':
+                deposited[move['stake_account']] = move
+        pooled = {}
+        for move in deposited.values():
+            pooled[move['validator']] = pooled.get(move['validator'], 0) + move['lamports']
+        managed = [account for account in created if account not in deposited]
+        pending_deposits = [account for account in managed if self.stake_pool is not None and created[account]['type'] == 'create']
+        return managed, pending_deposits, pooled
+
+    def plan(self, accounts, targets, total=None, pooled=None):
+        moves = plan_rebalance(accounts, targets, total, self.min_move_lamports, pooled)
+        if self.stake_pool is not None:
+            # Pools only take fully active stake, so new accounts are deposited the epoch after they activate.
+            moves += [
+                {'type': 'deposit', 'stake_account': account['pubkey'], 'validator': account['voter'], 'lamports': account['stake']}
+                for account in accounts if account.get('pending_deposit') and account['status'] == ACTIVE
+            ]
+        self._logger.info("Planned %s move(s) across %s stake account(s)", len(moves), len(accounts))
+        return moves
+
+    def new_account(self, move, epoch):
+        if move['type'] not in NEW_ACCOUNT_MOVES:
+            return None
+        return stake_account_with_seed(self.owner.public_key, move_seed(move, epoch))
+
+    def _instructions(self, move, epoch):
+        owner = self.owner.public_key
+        if move['type'] == 'deactivate':
+            return [create_deactivate_stake_instruction(move['stake_account'], owner)]
+        if move['type'] == 'delegate':
+            return [create_delegate_stake_instruction(move['stake_account'], move['validator'], owner)]
+        if move['type'] == 'deposit':
+            return [create_deposit_stake_instruction(self.stake_pool, move['stake_account'], move['validator'], owner, move['lamports'])]
+
+        seed = move_seed(move, epoch)
+        new_account = stake_account_with_seed(owner, seed)
+        if move['type'] == 'create':
+            return [
+                create_stake_account_with_seed_instruction(owner, owner, seed, move['lamports'] + self.rent_exempt_reserve),
+                create_initialize_stake_instruction(new_account, owner),
+                create_delegate_stake_instruction(new_account, move['validator'], owner),
+            ]
+        instructions = [
+            create_stake_account_with_seed_instruction(owner, owner, seed, self.rent_exempt_reserve),
+            create_split_stake_instruction(move['stake_account'], new_account, owner, move['lamports']),
+        ]
+        if move['type'] == 'split_deactivate':
+            return instructions + [create_deactivate_stake_instruction(new_account, owner)]
+        if move['type'] == 'split_delegate':
+            return instructions + [create_delegate_stake_instruction(new_account, move['validator'], owner)]
+        raise ValueError(f"Unknown stake move type: {move['type']}")
+
+    def build(self, moves, epoch):
+        return [WorkItem(move_key(move, epoch, self.new_account(move, epoch)), self._instructions(move, epoch)) for move in moves]
+
+    def transactions(self, moves, epoch, recent_blockhash):
+        items = self.build(moves, epoch)
+        transactions = []
+        for _, instructions in pack_groups([item.instructions for item in items], self.owner.public_key, ordered=False):
+            transaction = Transaction(recent_blockhash=recent_blockhash, fee_payer=self.owner.public_key)
+            transaction.add(*instructions)
+            transactions.append(transaction)
+        return transactions
+
+    def rebalance(self, stake_accounts, targets, executor, total=None):
+        executor.reconcile()
+        epoch = self.current_epoch()
+        managed, pending_deposits, pooled = self.from_ledger(executor.ledger)
+        stake_accounts = list(dict.fromkeys([str(account) for account in stake_accounts] + managed))
+        accounts = self.fetch_accounts(stake_accounts, epoch, pending_deposits)
+        items = [
+            item for item in self.build(self.plan(accounts, targets, total, pooled), epoch)
+            if executor.ledger.state(item.keys[0]) != CONFIRMED
+        ]
+        if not items:
+            return {}
+        return executor.execute(items)
@@ -0,0 +1,246 @@
+import base64
+import logging
+import struct
+import threading
+import time
+from base58 import b58encode
+from src.utils.derivation import derive_ata
+
+logger = logging.getLogger(__name__)
+
+MAX_ACCOUNTS_PER_REQUEST = 100
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
+MINT_DECIMALS_OFFSET = 44
+DEFAULT_TOKEN_ACCOUNT_TTL = 30.0
+TOKEN_TRANSFER_TYPES = ('transfer_token',)
+
+_U64 = struct.Struct('<Q')
+
+def account_data(account):
+    if account is None:
+        return None
+    data = account.get('data')
+    if isinstance(data, (list, tuple)):
+        encoded, encoding = data[0], data[1] if len(data) > 1 else 'base64'
+        if encoding != 'base64':
+            raise ValueError(f"Unsupported account data encoding: {encoding}")
+        return base64.b64decode(encoded)
+    if isinstance(data, str):
+        return base64.b64decode(data)
+    return data
+
+def read_u64(data, offset):
+    return _U64.unpack_from(data, offset)[0]
+
+def fetch_multiple_accounts(client, pubkeys, chunk_size=MAX_ACCOUNTS_PER_REQUEST, commitment=None):
+    pubkeys = list(dict.fromkeys(str(pubkey) for pubkey in pubkeys))
+    accounts = {}
+    for offset in range(0, len(pubkeys), chunk_size):
+        chunk = pubkeys[offset:offset + chunk_size]
+        if commitment is not None:
+            response = client.get_multiple_accounts(chunk, commitment=commitment)
+        else:
+            response = client.get_multiple_accounts(chunk)
+        for pubkey, account in zip(chunk, response['result']['value']):
+            accounts[pubkey] = account
+    logger.debug("Fetched %s accounts in %s request(s)", len(pubkeys), -(-len(pubkeys) // chunk_size))
+    return accounts
+
+def decode_mint_decimals(data):
+    return data[MINT_DECIMALS_OFFSET]
+
+def decode_token_account(data):
+    return {
+        'mint': b58encode(data[0:32]).decode('utf-8'),
+        'owner': b58encode(data[32:64]).decode('utf-8'),
+        'amount': read_u64(data, TOKEN_ACCOUNT_AMOUNT_OFFSET),
+    }
+
+def associated_token_address(owner, mint):
+    return str(derive_ata(owner, mint))
+
+class AccountResolver:
+    def __init__(self, client, token_account_ttl=DEFAULT_TOKEN_ACCOUNT_TTL, symbols=None):
+        self._client = client
+        self.token_account_ttl = token_account_ttl
+        self._symbols = {}
+        self._decimals = {}
+        self._token_accounts = {}
+        self._lock = threading.Lock()
+        self._logger = self._setup_logger()
+        self.fetches = 0
+        self.accounts_fetched = 0
+        self.cache_hits = 0
+        for symbol, mint in (symbols or {}).items():
+            self.register_symbol(symbol, mint)
+
+    def _setup_logger(self):
+        logger.info("AccountResolver initialized")
+        return logger
+
+    def register_symbol(self, symbol, mint, decimals=None):
+        with self._lock:
+            self._symbols[symbol.upper()] = str(mint)
+            if decimals is not None:
+                self._decimals[str(mint)] = decimals
+
+    def mint_for(self, token):
+        if token is None:
+            return None
+        token = str(token)
+        return self._symbols.get(token.upper(), token)
+
+    def _cached_decimals(self, mint):
+        with self._lock:
+            return self._decimals.get(mint)
+
+    def _cached_token_account(self, pubkey, now):
+        with self._lock:
+            entry = self._token_accounts.get(pubkey)
+        if entry is None or entry[0] <= now:
+            return False, None
+        return True, entry[1]
+
+    def _fetch(self, mints, token_accounts):
+        pubkeys = list(mints) + list(token_accounts)
+        if not pubkeys:
+            return
+        accounts = fetch_multiple_accounts(self._client, pubkeys)
+        expires_at = time.monotonic() + self.token_account_ttl
+        with self._lock:
+            self.fetches += 1
+            self.accounts_fetched += len(accounts)
+            for mint in mints:
+                data = account_data(accounts.get(mint))
+                if data is not None:
+                    self._decimals[mint] = decode_mint_decimals(data)
+                else:
+                    self._logger.error("Mint account %s not found", mint)
+            for pubkey in token_accounts:
+                data = account_data(accounts.get(pubkey))
+                self._token_accounts[pubkey] = (expires_at, decode_token_account(data) if data is not None else None)
+
+    def prefetch(self, mints=(), token_accounts=()):
+        now = time.monotonic()
+        mints = list(dict.fromkeys(str(mint) for mint in mints))
+        token_accounts = list(dict.fromkeys(str(pubkey) for pubkey in token_accounts))
+        missing_mints = [mint for mint in mints if self._cached_decimals(mint) is None]
+        missing_accounts = [pubkey for pubkey in token_accounts if not self._cached_token_account(pubkey, now)[0]]
+        with self._lock:
+            self.cache_hits += len(mints) + len(token_accounts) - len(missing_mints) - len(missing_accounts)
+        self._fetch(missing_mints, missing_accounts)
+
+    def get_decimals(self, mint):
+        mint = self.mint_for(mint)
+        decimals = self._cached_decimals(mint)
+        if decimals is None:
+            self.prefetch(mints=[mint])
+            decimals = self._cached_decimals(mint)
+        if decimals is None:
+            raise ValueError(f"Could not resolve decimals for mint {mint}")
+        return decimals
+
+    def get_token_account(self, pubkey):
+        pubkey = str(pubkey)
+        cached, info = self._cached_token_account(pubkey, time.monotonic())
+        if not cached:
+            self.prefetch(token_accounts=[pubkey])
+            with self._lock:
+                entry = self._token_accounts.get(pubkey)
+            info = entry[1] if entry is not None else None
+        return info
+
+    def invalidate(self, pubkey=None):
+        with self._lock:
+            if pubkey is None:
+                self._token_accounts.clear()
+            else:
+                self._token_accounts.pop(str(pubkey), None)
+
+    def _needs_resolution(self, instruction_data):
+        return instruction_data.get('type') in TOKEN_TRANSFER_TYPES and not all(
+            field in instruction_data for field in ('source', 'destination', 'mint', 'decimals')
+        )
+
+    def _plan(self, instruction_data, payer):
+        mint = self.mint_for(instruction_data.get('mint', instruction_data.get('asset')))
+        source = instruction_data.get('source')
+        destination = instruction_data.get('destination')
+        if mint is not None:
+            if source is None:
+                source = associated_token_address(instruction_data.get('sender', payer), mint)
+            if destination is None and instruction_data.get('recipient') is not None:
+                destination = associated_token_address(instruction_data['recipient'], mint)
+        return mint, source, destination
+
+    def resolve(self, instructions_data, payer):
+        pending = [
+            (index, instruction_data) for index, instruction_data in enumerate(instructions_data)
+            if self._needs_resolution(instruction_data)
+        ]
+        if not pending:
+            return instructions_data
+
+        plans = [(index, instruction_data, self._plan(instruction_data, payer)) for index, instruction_data in pending]
+        mints = [mint for _, _, (mint, _, _) in plans if mint is not None]
+        token_accounts = [account for _, _, (_, source, destination) in plans for account in (source, destination) if account]
+        self.prefetch(mints, token_accounts)
+
+        unknown_mints = []
+        late_accounts = []
+        for _, instruction_data, (mint, source, destination) in plans:
+            if mint is None and source is not None:
+                info = self.get_token_account(source)
+                if info is None:
+                    continue
+                if self._cached_decimals(info['mint']) is None:
+                    unknown_mints.append(info['mint'])
+                if destination is None and instruction_data.get('recipient') is not None:
+                    late_accounts.append(associated_token_address(instruction_data['recipient'], info['mint']))
+        if unknown_mints or late_accounts:
+            self.prefetch(unknown_mints, late_accounts)
+
+        resolved = list(instructions_data)
+        for index, instruction_data, (mint, source, destination) in plans:
+            try:
+                resolved[index] = self._enrich(instruction_data, payer, mint, source, destination)
+            except Exception as error:
+                self._logger.error("Error resolving accounts for %s instruction: %s", instruction_data.get('type'), error)
+        return resolved
+
+    def _enrich(self, instruction_data, payer, mint, source, destination):
+        if mint is None:
+            info = self.get_token_account(source) if source else None
+            if info is None:
+                raise ValueError("Token transfer has neither a mint nor an existing source account")
+            mint = info['mint']
+            if destination is None and instruction_data.get('recipient') is not None:
+                destination = associated_token_address(instruction_data['recipient'], mint)
+        decimals = instruction_data.get('decimals')
+        if decimals is None:
+            decimals = self.get_decimals(mint)
+        amount = instruction_data['amount']
+        if isinstance(amount, float):
+            amount = int(round(amount * 10 ** decimals))
+        destination_account = self.get_token_account(destination) if destination else None
+        if destination_account is None:
+            self._logger.warning("Destination token account %s does not exist yet", destination)
+        return dict(
+            instruction_data,
+            mint=mint,
+            decimals=decimals,
+            source=source,
+            destination=destination,
+            amount=amount,
+            destination_exists=destination_account is not None
+        )
+
+    def stats(self):
+        with self._lock:
+            return {
+                'mints': len(self._decimals),
+                'token_accounts': len(self._token_accounts),
+                'fetches': self.fetches,
+                'accounts_fetched': self.accounts_fetched,
+                'cache_hits': self.cache_hits,
+            }
@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 10
+# A blockhash is valid for 150 blocks (about 60s). Handing it out for at most half of that leaves time to sign, send and land.
+DEFAULT_MAX_AGE = 30
+DEFAULT_COMMITMENT = 'confirmed'
+
+class BlockhashProvider:
+    def __init__(self, client, refresh_interval=DEFAULT_REFRESH_INTERVAL, max_age=DEFAULT_MAX_AGE, commitment=DEFAULT_COMMITMENT):
+        self._client = client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.commitment = commitment
+        self._blockhash = None
+        self._last_valid_block_height = None
+        self._fetched_at = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._logger = self._setup_logger()
+        self.refresh_count = 0
+        self.refresh_errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.last_refresh_latency = None
+        self.max_refresh_latency = 0.0
+
+    def _setup_logger(self):
+        logger.info("BlockhashProvider initialized")
+        return logger
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="blockhash-provider", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+    def _run(self):
+        self.refresh()
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def refresh(self):
+        return self._fetch()[0]
+
+    def _fetch(self):
+        started = time.monotonic()
+        try:
+            # A finalized blockhash is already ~32 slots into its validity window, so fetch at confirmed.
+            response = self._client.get_latest_blockhash(commitment=self.commitment)
+            value = response['result']['value']
+            latency = time.monotonic() - started
+            with self._lock:
+                self._blockhash = value['blockhash']
+                self._last_valid_block_height = value.get('lastValidBlockHeight')
+                self._fetched_at = started
+                self.refresh_count += 1
+                self.last_refresh_latency = latency
+                self.max_refresh_latency = max(self.max_refresh_latency, latency)
+            self._logger.debug("Refreshed blockhash %s in %.3fs", value['blockhash'], latency)
+            return value['blockhash'], value.get('lastValidBlockHeight')
+        except Exception as error:
+            with self._lock:
+                self.refresh_errors += 1
+            self._logger.error("Error refreshing blockhash: %s", error)
+            return None, None
+
+    def _current(self):
+        if self._fetched_at is None or time.monotonic() - self._fetched_at >= self.max_age:
+            return None
+        return self._blockhash
+
+    def get_blockhash(self):
+        return self.get_blockhash_with_height()[0]
+
+    def get_blockhash_with_height(self):
+        with self._lock:
+            blockhash = self._current()
+            if blockhash is not None:
+                self.cache_hits += 1
+                return blockhash, self._last_valid_block_height
+            self.cache_misses += 1
+            self._blockhash = None
+        self._logger.debug("Cached blockhash missing or expired, fetching synchronously")
+        return self._fetch()
+
+    def get_last_valid_block_height(self):
+        with self._lock:
+            return self._last_valid_block_height if self._current() is not None else None
+
+    def staleness(self):
+        with self._lock:
+            if self._fetched_at is None:
+                return None
+            return time.monotonic() - self._fetched_at
+
+    def metrics(self):
+        staleness = self.staleness()
+        with self._lock:
+            return {
+                'staleness': staleness,
+                'refresh_count': self.refresh_count,
+                'refresh_errors': self.refresh_errors,
+                'last_refresh_latency': self.last_refresh_latency,
+                'max_refresh_latency': self.max_refresh_latency,
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+            }
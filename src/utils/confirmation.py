@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from base58 import b58encode
+from solana.rpc.types import TxOpts
+
+logger = logging.getLogger(__name__)
+
+COMMITMENT_LEVELS = {'processed': 0, 'confirmed': 1, 'finalized': 2}
+MAX_SIGNATURES_PER_REQUEST = 256
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_REBROADCAST_INTERVAL = 2.0
+DEFAULT_EXPIRY = 60
+
+class TransactionExpiredError(Exception):
+    pass
+
+class TransactionFailedError(Exception):
+    pass
+
+class _PendingTransaction:
+    def __init__(self, signature, raw_transaction, commitment, expires_at, last_valid_block_height):
+        self.signature = signature
+        self.raw_transaction = raw_transaction
+        self.commitment = commitment
+        self.expires_at = expires_at
+        self.last_valid_block_height = last_valid_block_height
+        self.last_broadcast = None
+        self.broadcasts = 0
+        self.accepted = False
+        self.future = Future()
+
+class ConfirmationTracker:
+    def __init__(self, client, poll_interval=DEFAULT_POLL_INTERVAL, rebroadcast_interval=DEFAULT_REBROADCAST_INTERVAL,
+                 expiry=DEFAULT_EXPIRY, max_broadcast_workers=8):
+        self._client = client
+        self.poll_interval = poll_interval
+        self.rebroadcast_interval = rebroadcast_interval
+        self.expiry = expiry
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._broadcast_executor = ThreadPoolExecutor(max_workers=max_broadcast_workers, thread_name_prefix="tx-broadcast")
+        self._logger = self._setup_logger()
+        self.confirmed = 0
+        self.failed = 0
+        self.expired = 0
+        self.rebroadcasts = 0
+
+    def _setup_logger(self):
+        logger.info("ConfirmationTracker initialized")
+        return logger
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="confirmation-tracker", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 4)
+            self._thread = None
+        self._broadcast_executor.shutdown(wait=False)
+
+    def submit(self, transaction, commitment='confirmed', last_valid_block_height=None):
+        if commitment not in COMMITMENT_LEVELS:
+            raise ValueError(f"Unknown commitment level: {commitment}")
+        signature = b58encode(transaction.signature()).decode('utf-8')
+        pending = _PendingTransaction(
+            signature,
+            transaction.serialize(),
+            commitment,
+            time.monotonic() + self.expiry,
+            last_valid_block_height
+        )
+        with self._lock:
+            existing = self._pending.get(signature)
+            if existing is not None:
+                return signature, existing.future
+            self._pending[signature] = pending
+        self._logger.debug("Tracking transaction %s until %s", signature, commitment)
+        self._broadcast_executor.submit(self._broadcast, pending)
+        self.start()
+        return signature, pending.future
+
+    def _broadcast(self, pending):
+        first = not pending.accepted
+        try:
+            pending.last_broadcast = time.monotonic()
+            pending.broadcasts += 1
+            self._client.send_raw_transaction(
+                pending.raw_transaction,
+                opts=TxOpts(skip_confirmation=True, skip_preflight=not first)
+            )
+            pending.accepted = True
+        except Exception as error:
+            if not first:
+                self._logger.error("Error rebroadcasting transaction %s: %s", pending.signature, error)
+                return
+            self._logger.error("Transaction %s rejected on first send: %s", pending.signature, error)
+            self._resolve(pending, 'failed', error=TransactionFailedError(f"Transaction {pending.signature} rejected: {error}"))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.poll()
+            except Exception as error:
+                self._logger.error("Error polling signature statuses: %s", error)
+
+    def _resolve(self, pending, outcome, result=None, error=None):
+        with self._lock:
+            # Only the caller that removes the transaction resolves and counts it.
+            if self._pending.pop(pending.signature, None) is not pending:
+                return
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        if error is not None:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(result)
+
+    def _current_block_height(self, pending_transactions):
+        if not any(pending.last_valid_block_height is not None for pending in pending_transactions):
+            return None
+        try:
+            return self._client.get_block_height()['result']
+        except Exception as error:
+            self._logger.error("Error fetching block height: %s", error)
+            return None
+
+    def poll(self):
+        with self._lock:
+            pending_transactions = list(self._pending.values())
+        if not pending_transactions:
+            return
+
+        now = time.monotonic()
+        block_height = self._current_block_height(pending_transactions)
+        for offset in range(0, len(pending_transactions), MAX_SIGNATURES_PER_REQUEST):
+            batch = pending_transactions[offset:offset + MAX_SIGNATURES_PER_REQUEST]
+            response = self._client.get_signature_statuses([pending.signature for pending in batch])
+            statuses = response['result']['value']
+            for pending, status in zip(batch, statuses):
+                if status is not None and status.get('err') is not None:
+                    self._resolve(pending, 'failed', error=TransactionFailedError(f"Transaction {pending.signature} failed: {status['err']}"))
+                elif status is not None and COMMITMENT_LEVELS.get(status.get('confirmationStatus'), -1) >= COMMITMENT_LEVELS[pending.commitment]:
+                    self._resolve(pending, 'confirmed', result=status)
+                elif status is None and self._expired(pending, now, block_height):
+                    self._resolve(pending, 'expired', error=TransactionExpiredError(f"Blockhash expired before {pending.signature} landed"))
+                elif status is None and pending.accepted and now - pending.last_broadcast >= self.rebroadcast_interval:
+                    with self._lock:
+                        self.rebroadcasts += 1
+                    pending.last_broadcast = now
+                    self._broadcast_executor.submit(self._broadcast, pending)
+
+    def _expired(self, pending, now, block_height):
+        if pending.last_valid_block_height is not None and block_height is not None:
+            return block_height > pending.last_valid_block_height
+        return now >= pending.expires_at
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'confirmed': self.confirmed,
+                'failed': self.failed,
+                'expired': self.expired,
+                'rebroadcasts': self.rebroadcasts,
+            }
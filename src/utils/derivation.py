@@ -0,0 +1,172 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from solana.publickey import PublicKey
+from src.utils.pubkeys import intern_pubkey, SPL_TOKEN_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+DERIVATION_CACHE_SIZE = 65536
+PARALLEL_THRESHOLD = 512
+DEFAULT_CHUNK_SIZE = 256
+ASSOCIATED_TOKEN_PROGRAM_ID = intern_pubkey("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
+METADATA_PROGRAM_ID = intern_pubkey("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
+METADATA_SEED = b'metadata'
+EDITION_SEED = b'edition'
+
+class DerivationCache:
+    def __init__(self, max_entries=DERIVATION_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            address = self._entries.get(key)
+            if address is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return address
+
+    def set(self, key, address):
+        with self._lock:
+            self._entries[key] = address
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'max_entries': self._max_entries,
+            }
+
+_cache = DerivationCache()
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+def _ata_seeds(owner, mint):
+    return [bytes(PublicKey(owner)), bytes(SPL_TOKEN_PROGRAM_ID), bytes(PublicKey(mint))], ASSOCIATED_TOKEN_PROGRAM_ID
+
+def _metadata_seeds(mint):
+    return [METADATA_SEED, bytes(METADATA_PROGRAM_ID), bytes(PublicKey(mint))], METADATA_PROGRAM_ID
+
+def _master_edition_seeds(mint):
+    return [METADATA_SEED, bytes(METADATA_PROGRAM_ID), bytes(PublicKey(mint)), EDITION_SEED], METADATA_PROGRAM_ID
+
+SEED_BUILDERS = {
+    'ata': _ata_seeds,
+    'metadata': _metadata_seeds,
+    'master_edition': _master_edition_seeds,
+}
+
+def _derive_uncached(kind, args):
+    seeds, program_id = SEED_BUILDERS[kind](*args)
+    address, _ = PublicKey.find_program_address(seeds, program_id)
+    return address
+
+def _cache_key(kind, args):
+    return (kind,) + tuple(str(arg) for arg in args)
+
+def derive(kind, *args):
+    key = _cache_key(kind, args)
+    address = _cache.get(key)
+    if address is None:
+        address = _derive_uncached(kind, args)
+        _cache.set(key, address)
+    return address
+
+def derive_ata(owner, mint):
+    return derive('ata', owner, mint)
+
+def derive_metadata(mint):
+    return derive('metadata', mint)
+
+def derive_master_edition(mint):
+    return derive('master_edition', mint)
+
+def _derive_chunk(kind, rows):
+    return [str(_derive_uncached(kind, args)) for args in rows]
+
+def get_derivation_pool(max_workers=None):
+    global _pool, _pool_workers
+    workers = max_workers or os.cpu_count() or 1
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            # Workers are spawned once and reused, so only the first large batch pays for process startup.
+            logger.debug("Starting derivation pool with %s processes", workers)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+def shutdown_derivation_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_workers = None
+
+atexit.register(shutdown_derivation_pool)
+
+def derive_many(kind, rows, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, parallel_threshold=PARALLEL_THRESHOLD,
+                executor=None):
+    if kind not in SEED_BUILDERS:
+        raise ValueError(f"Unknown derivation kind: {kind}")
+    rows = [tuple(str(arg) for arg in (row if isinstance(row, (tuple, list)) else (row,))) for row in rows]
+    results = [None] * len(rows)
+    missing = {}
+    for index, args in enumerate(rows):
+        address = _cache.get((kind,) + args)
+        if address is not None:
+            results[index] = address
+        else:
+            missing.setdefault(args, []).append(index)
+
+    if missing:
+        pending = list(missing)
+        if len(pending) < parallel_threshold:
+            derived = [_derive_uncached(kind, args) for args in pending]
+        else:
+            chunks = [pending[offset:offset + chunk_size] for offset in range(0, len(pending), chunk_size)]
+            executor = executor if executor is not None else get_derivation_pool(max_workers)
+            logger.debug("Deriving %s %s addresses in %s chunks", len(pending), kind, len(chunks))
+            derived = [
+                PublicKey(address)
+                for chunk_result in executor.map(_derive_chunk, [kind] * len(chunks), chunks)
+                for address in chunk_result
+            ]
+        for args, address in zip(pending, derived):
+            _cache.set((kind,) + args, address)
+            for index in missing[args]:
+                results[index] = address
+    return results
+
+def derivation_cache_info():
+    return _cache.stats()
+
+def clear_derivation_cache():
+    _cache.clear()
@@ -1,65 +1,78 @@
 import base64
+import csv
 import json
 import logging
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 
+logger = logging.getLogger(__name__)
+
 def base64_encode(data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Encoding data to base64: {data}")
+    logger.debug("Encoding data to base64: %s", data)
 
     try:
         encoded_data = base64.b64encode(data.encode('utf-8')).decode('utf-8')
-        logger.debug(f"Encoded data: {encoded_data}")
+        logger.debug("Encoded data: %s", encoded_data)
         return encoded_data
     except Exception as error:
-        logger.error(f"Error encoding data to base64: {error}")
+        logger.error("Error encoding data to base64: %s", error)
         return None
 
 def base64_decode(encoded_data):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Decoding data from base64: {encoded_data}")
+    logger.debug("Decoding data from base64: %s", encoded_data)
 
     try:
         decoded_data = base64.b64decode(encoded_data.encode('utf-8')).decode('utf-8')
-        logger.debug(f"Decoded data: {decoded_data}")
+        logger.debug("Decoded data: %s", decoded_data)
         return decoded_data
     except Exception as error:
-        logger.error(f"Error decoding data from base64: {error}")
+        logger.error("Error decoding data from base64: %s", error)
         return None
 
 def send_transaction(client, transaction, signers, opts=TxOpts(skip_confirmation=False)):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Sending transaction with signers: {signers}")
+    logger.debug("Sending transaction with signers: %s", signers)
 
     try:
         transaction_result = client.send_transaction(transaction, *signers, opts=opts)
-        logger.debug(f"Transaction sent: {transaction_result}")
+        logger.debug("Transaction sent: %s", transaction_result)
         return transaction_result
     except Exception as error:
-        logger.error(f"Error sending transaction: {error}")
+        logger.error("Error sending transaction: %s", error)
         return None
 
 def load_json_from_file(file_path):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Loading JSON from file: {file_path}")
+    logger.debug("Loading JSON from file: %s", file_path)
 
     try:
         with open(file_path, 'r') as file:
             data = json.load(file)
-            logger.debug(f"Loaded JSON data: {data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Loaded JSON from %s: %s with %s top-level entries", file_path, type(data).__name__,
+                             len(data) if isinstance(data, (dict, list)) else 1)
             return data
     except Exception as error:
-        logger.error(f"Error loading JSON from file: {error}")
+        logger.error("Error loading JSON from file: %s", error)
         return None
 
 def save_json_to_file(data, file_path):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Saving JSON to file: {file_path}")
+    logger.debug("Saving JSON to file: %s", file_path)
 
     try:
         with open(file_path, 'w') as file:
             json.dump(data, file, indent=4)
-            logger.debug(f"JSON data saved: {data}")
+            logger.debug("JSON data saved to %s", file_path)
     except Exception as error:
-        logger.error(f"Error saving JSON to file: {error}")
\ No newline at end of file
+        logger.error("Error saving JSON to file: %s", error)
+
+def iter_records(file_path):
+    logger.debug("Streaming records from file: %s", file_path)
+
+    with open(file_path, 'r', newline='') as file:
+        if file_path.endswith('.csv'):
+            for row in csv.DictReader(file):
+                yield row
+            return
+        for line in file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+SENT = 'sent'
+CONFIRMED = 'confirmed'
+FAILED = 'failed'
+EXPIRED = 'expired'
+IN_FLIGHT_STATES = (PENDING, SENT)
+RETRYABLE_STATES = (FAILED, EXPIRED)
+
+class Ledger:
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._logger = self._setup_logger()
+        self._load()
+        self._file = open(path, 'a', encoding='utf-8')
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write('\n')
+
+    def _setup_logger(self):
+        logger.info("Ledger initialized at %s", self.path)
+        return logger
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    self._logger.warning("Skipping truncated ledger line %s in %s", line_number, self.path)
+                    continue
+                self._entries[entry['key']] = entry
+        self._logger.debug("Loaded %s ledger entries from %s", len(self._entries), self.path)
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b'\n'
+
+    def record(self, keys, state, **fields):
+        if isinstance(keys, str):
+            keys = [keys]
+        now = time.time()
+        entries = [dict(fields, key=key, state=state, time=now) for key in keys]
+        lines = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            for entry in entries:
+                self._entries[entry['key']] = entry
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def state(self, key):
+        entry = self.get(key)
+        return entry['state'] if entry is not None else None
+
+    def keys(self, states=None):
+        with self._lock:
+            return [key for key, entry in self._entries.items() if states is None or entry['state'] in states]
+
+    def in_flight(self):
+        signatures = {}
+        with self._lock:
+            for key, entry in self._entries.items():
+                if entry['state'] in IN_FLIGHT_STATES:
+                    signatures.setdefault(entry['signature'], []).append(entry)
+        return signatures
+
+    def counts(self):
+        counts = {}
+        with self._lock:
+            for entry in self._entries.values():
+                counts[entry['state']] = counts.get(entry['state'], 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,62 @@
+import itertools
+import json
+import logging
+
+PRODUCTION_LEVEL = logging.WARNING
+DEFAULT_SAMPLE_RATE = 0.01
+PLAIN_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+PACKAGE_LOGGER = 'src'
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            'ts': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+class _ProductionHandler(logging.StreamHandler):
+    pass
+
+def configure_production_logging(level=PRODUCTION_LEVEL, structured=True, stream=None, logger_name=PACKAGE_LOGGER):
+    handler = _ProductionHandler(stream)
+    handler.setFormatter(JsonFormatter() if structured else logging.Formatter(PLAIN_FORMAT))
+    target = logging.getLogger(logger_name)
+    for previous in [existing for existing in target.handlers if isinstance(existing, _ProductionHandler)]:
+        target.removeHandler(previous)
+    target.addHandler(handler)
+    target.setLevel(level)
+    target.propagate = False
+    return handler
+
+class SampledLogger:
+    def __init__(self, logger, sample_rate=DEFAULT_SAMPLE_RATE, level=logging.INFO):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {sample_rate}")
+        self._logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+        self.every = round(1 / sample_rate) if sample_rate else 0
+        self._counter = itertools.count()
+
+    def enabled(self):
+        return bool(self.every) and self._logger.isEnabledFor(self.level)
+
+    def event(self, name, **fields):
+        if not self.every or not self._logger.isEnabledFor(self.level):
+            return False
+        if next(self._counter) % self.every:
+            return False
+        fields['event'] = name
+        fields['sample_every'] = self.every
+        self._logger.log(self.level, name, extra={'fields': fields})
+        return True
+
+def get_sampled_logger(name, sample_rate=DEFAULT_SAMPLE_RATE, level=logging.INFO):
+    return SampledLogger(name, sample_rate, level)
@@ -0,0 +1,218 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = 'persephai'
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, value, error):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+        if error:
+            self.errors += 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class _Span:
+    def __init__(self, registry, stage, labels):
+        self._registry = registry
+        self.stage = stage
+        self.labels = labels
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._registry.observe(self.stage, time.perf_counter() - self.started, self.labels, exc_type is not None, self.started)
+        return False
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+class MetricsRegistry:
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+        self._logger = logger
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def span(self, stage, **labels):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, stage, labels)
+
+    def observe(self, stage, duration, labels=None, error=False, started=None):
+        if not self.enabled:
+            return
+        key = (stage, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.observe(duration, error)
+        for hook in self._hooks:
+            try:
+                hook(stage, labels or {}, started, duration, error)
+            except Exception as hook_error:
+                self._logger.error("Error in metrics hook: %s", hook_error)
+
+    def increment(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {}
+            for (stage, labels), histogram in self._histograms.items():
+                histograms.setdefault(stage, []).append({
+                    'labels': dict(labels),
+                    'count': histogram.count,
+                    'errors': histogram.errors,
+                    'sum': histogram.total,
+                    'mean': histogram.total / histogram.count if histogram.count else None,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99),
+                    'buckets': dict(zip(self.buckets + (float('inf'),), histogram.counts)),
+                })
+            counters = {}
+            for (name, labels), value in self._counters.items():
+                counters.setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        return {'stages': histograms, 'counters': counters}
+
+    def render_prometheus(self):
+        lines = [
+            f'# HELP {METRIC_PREFIX}_stage_duration_seconds Time spent in each pipeline stage.',
+            f'# TYPE {METRIC_PREFIX}_stage_duration_seconds histogram',
+        ]
+        error_lines = [
+            f'# HELP {METRIC_PREFIX}_stage_errors_total Pipeline stage calls that raised.',
+            f'# TYPE {METRIC_PREFIX}_stage_errors_total counter',
+        ]
+        with self._lock:
+            for (stage, labels), histogram in sorted(self._histograms.items()):
+                pairs = (('stage', stage),) + labels
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_bucket{_format_labels(pairs + (("le", le),))} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_sum{_format_labels(pairs)} {histogram.total}')
+                lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_count{_format_labels(pairs)} {histogram.count}')
+                error_lines.append(f'{METRIC_PREFIX}_stage_errors_total{_format_labels(pairs)} {histogram.errors}')
+            lines.extend(error_lines)
+            for name in sorted({name for name, _ in self._counters}):
+                lines.append(f'# TYPE {METRIC_PREFIX}_{name}_total counter')
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name == name:
+                        lines.append(f'{METRIC_PREFIX}_{name}_total{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+
+def timed(stage, registry=None):
+    def decorator(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                active = registry or metrics
+                if not active.enabled:
+                    return await function(*args, **kwargs)
+                with active.span(stage):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            active = registry or metrics
+            if not active.enabled:
+                return function(*args, **kwargs)
+            with active.span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def start_metrics_server(port, host='127.0.0.1', registry=None):
+    active = registry or metrics
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = active.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,240 @@
+import logging
+import struct
+import threading
+from collections import deque
+from base58 import b58encode
+from solana.transaction import Transaction
+from src.instructions.system import create_advance_nonce_instruction
+from src.utils.accounts import account_data, fetch_multiple_accounts
+from src.utils.confirmation import ConfirmationTracker
+
+logger = logging.getLogger(__name__)
+
+NONCE_STATE_INITIALIZED = 1
+NONCE_AUTHORITY_OFFSET = 8
+NONCE_BLOCKHASH_OFFSET = 40
+NONCE_ACCOUNT_SIZE = 80
+
+class NoncePoolExhaustedError(Exception):
+    pass
+
+def decode_nonce_account(data):
+    if data is None or len(data) < NONCE_ACCOUNT_SIZE:
+        return None
+    _, state = struct.unpack_from('<II', data)
+    if state != NONCE_STATE_INITIALIZED:
+        return None
+    return {
+        'authority': b58encode(data[NONCE_AUTHORITY_OFFSET:NONCE_AUTHORITY_OFFSET + 32]).decode('utf-8'),
+        'nonce': b58encode(data[NONCE_BLOCKHASH_OFFSET:NONCE_BLOCKHASH_OFFSET + 32]).decode('utf-8'),
+    }
+
+class PresignedTransaction:
+    def __init__(self, nonce_account, nonce, transaction):
+        self.nonce_account = nonce_account
+        self.nonce = nonce
+        self.transaction = transaction
+        self.sent = False
+        self.discarded = False
+
+    @property
+    def signature(self):
+        return b58encode(self.transaction.signature()).decode('utf-8')
+
+class NoncePool:
+    def __init__(self, client, authority, nonce_accounts, confirmation_tracker=None, commitment='confirmed'):
+        self._client = client
+        self.authority = authority
+        self.commitment = commitment
+        self._nonces = {str(account): None for account in nonce_accounts}
+        self._spent = {}
+        self._available = deque(self._nonces)
+        self._in_use = set()
+        self._quarantined = set()
+        self._condition = threading.Condition()
+        self._owns_tracker = confirmation_tracker is None
+        self.confirmation_tracker = confirmation_tracker if confirmation_tracker is not None else ConfirmationTracker(client)
+        self._logger = self._setup_logger()
+        self.presigned = 0
+        self.sent = 0
+        self.invalidations = 0
+
+    def _setup_logger(self):
+        logger.info("NoncePool initialized with %s nonce account(s)", len(self._nonces))
+        return logger
+
+    def _fetch_nonces(self, accounts):
+        fetched = fetch_multiple_accounts(self._client, accounts, commitment=self.commitment)
+        nonces = {}
+        for account in accounts:
+            decoded = decode_nonce_account(account_data(fetched.get(account)))
+            nonces[account] = decoded['nonce'] if decoded is not None else None
+        return nonces
+
+    def refresh(self, accounts=None):
+        with self._condition:
+            accounts = list(self._nonces) if accounts is None else [str(account) for account in accounts]
+        nonces = self._fetch_nonces(accounts)
+        with self._condition:
+            for account, nonce in nonces.items():
+                if nonce is None:
+                    self._logger.error("Nonce account %s is missing or uninitialized", account)
+                    self._nonces[account] = None
+                elif nonce == self._spent.get(account):
+                    self._logger.debug("Nonce account %s has not advanced yet", account)
+                    self._nonces[account] = None
+                else:
+                    self._nonces[account] = nonce
+            self._condition.notify_all()
+
+    def acquire(self, timeout=None):
+        refreshed = set()
+        for _ in range(len(self._nonces)):
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._available, timeout):
+                    raise NoncePoolExhaustedError(f"All {len(self._nonces)} nonce accounts are in use")
+                account = self._available.popleft()
+                self._in_use.add(account)
+                stale = [
+                    candidate for candidate in [account, *self._available]
+                    if self._nonces[candidate] is None and candidate not in refreshed
+                ]
+            if stale:
+                refreshed.update(stale)
+                try:
+                    self.refresh(stale)
+                except Exception:
+                    self.release(account)
+                    raise
+            with self._condition:
+                nonce = self._nonces[account]
+            if nonce is not None:
+                return account, nonce
+            self._logger.warning("Nonce account %s has no usable nonce, trying the next account", account)
+            self.release(account)
+        raise NoncePoolExhaustedError(f"None of the {len(self._nonces)} nonce accounts has a usable nonce")
+
+    def release(self, account):
+        with self._condition:
+            if account not in self._in_use:
+                return
+            self._in_use.discard(account)
+            self._available.append(account)
+            self._condition.notify()
+
+    def reserved_instructions(self):
+        return [create_advance_nonce_instruction(next(iter(self._nonces)), self.authority.public_key)]
+
+    def _build(self, account, nonce, instructions, fee_payer):
+        transaction = Transaction(recent_blockhash=nonce, fee_payer=fee_payer)
+        transaction.add(create_advance_nonce_instruction(account, self.authority.public_key), *instructions)
+        return transaction
+
+    def presign(self, instructions, signers, timeout=None):
+        signers = list({str(signer.public_key): signer for signer in list(signers) + [self.authority]}.values())
+        account, nonce = self.acquire(timeout)
+        try:
+            transaction = self._build(account, nonce, instructions, signers[0].public_key)
+            transaction.sign(*signers)
+        except Exception:
+            self.release(account)
+            raise
+        with self._condition:
+            self.presigned += 1
+        return PresignedTransaction(account, nonce, transaction)
+
+    def send(self, presigned, commitment=None):
+        if presigned.sent:
+            raise ValueError(f"Presigned transaction {presigned.signature} was already sent")
+        if presigned.discarded:
+            raise ValueError(f"Presigned transaction {presigned.signature} was discarded")
+        presigned.sent = True
+        try:
+            signature, future = self.confirmation_tracker.submit(presigned.transaction, commitment or self.commitment)
+        except Exception:
+            presigned.sent = False
+            raise
+        with self._condition:
+            self.sent += 1
+        future.add_done_callback(lambda done: self._recycle(presigned, done))
+        return signature, future
+
+    def discard(self, presigned):
+        if presigned.sent or presigned.discarded:
+            return
+        # The discarded transaction is signed and valid until its nonce advances.
+        presigned.discarded = True
+        self._invalidate(presigned, "discarded")
+
+    def _recycle(self, presigned, future):
+        if future.exception() is not None:
+            self._invalidate(presigned, future.exception())
+            return
+        self._logger.debug("Nonce account %s advanced by %s", presigned.nonce_account, presigned.signature)
+        self._release_advanced(presigned)
+
+    def _invalidate(self, presigned, reason):
+        account = presigned.nonce_account
+        try:
+            current = self._fetch_nonces([account])[account]
+        except Exception as error:
+            self._quarantine(account, f"could not re-read nonce: {error}")
+            return
+        if current != presigned.nonce:
+            self._logger.debug("Nonce account %s already advanced past %s", account, presigned.signature)
+            self._release_advanced(presigned)
+            return
+
+        self._logger.warning("Transaction %s was not executed (%s), advancing nonce %s to invalidate it",
+                             presigned.signature, reason, account)
+        with self._condition:
+            self.invalidations += 1
+        try:
+            transaction = self._build(account, presigned.nonce, [], self.authority.public_key)
+            transaction.sign(self.authority)
+            _, future = self.confirmation_tracker.submit(transaction, self.commitment)
+        except Exception as error:
+            self._quarantine(account, f"invalidation failed: {error}")
+            return
+        future.add_done_callback(lambda done: self._invalidated(presigned, done))
+
+    def _invalidated(self, presigned, future):
+        if future.exception() is not None:
+            self._quarantine(presigned.nonce_account, f"invalidation failed: {future.exception()}")
+            return
+        self._release_advanced(presigned)
+
+    def _quarantine(self, account, reason):
+        # The presigned transaction may still be valid, so its nonce must never be handed out again.
+        self._logger.error("Quarantining nonce account %s: %s", account, reason)
+        with self._condition:
+            self._in_use.discard(account)
+            self._quarantined.add(account)
+            self._nonces[account] = None
+
+    def _release_advanced(self, presigned):
+        account = presigned.nonce_account
+        with self._condition:
+            self._spent[account] = presigned.nonce
+            self._nonces[account] = None
+        try:
+            self.refresh([account])
+        except Exception as error:
+            self._logger.error("Error refreshing nonce account %s: %s", account, error)
+        self.release(account)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'accounts': len(self._nonces),
+                'available': len(self._available),
+                'in_use': len(self._in_use),
+                'quarantined': len(self._quarantined),
+                'presigned': self.presigned,
+                'sent': self.sent,
+                'invalidations': self.invalidations,
+            }
+
+    def close(self):
+        if self._owns_tracker:
+            self.confirmation_tracker.stop()
@@ -0,0 +1,135 @@
+import logging
+from solana.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+PACKET_DATA_SIZE = 1232
+MAX_TX_ACCOUNT_LOCKS = 64
+SIGNATURE_SIZE = 64
+PUBKEY_SIZE = 32
+BLOCKHASH_SIZE = 32
+MESSAGE_HEADER_SIZE = 3
+
+def compact_u16_size(value):
+    if value < 0x80:
+        return 1
+    if value < 0x4000:
+        return 2
+    return 3
+
+def _account_meta(meta):
+    if isinstance(meta, dict):
+        return str(meta['pubkey']), meta['is_signer']
+    return str(meta.pubkey), meta.is_signer
+
+def required_signers(instructions):
+    return {pubkey for instruction in instructions for pubkey, is_signer in map(_account_meta, instruction.keys) if is_signer}
+
+class _Unit:
+    def __init__(self, index, instructions):
+        self.index = index
+        self.instructions = instructions
+        self.accounts = set()
+        self.signers = set()
+        self.instruction_bytes = 0
+        for instruction in instructions:
+            self.accounts.add(str(instruction.program_id))
+            for meta in instruction.keys:
+                pubkey, is_signer = _account_meta(meta)
+                self.accounts.add(pubkey)
+                if is_signer:
+                    self.signers.add(pubkey)
+            data_length = len(instruction.data)
+            self.instruction_bytes += (
+                1 + compact_u16_size(len(instruction.keys)) + len(instruction.keys)
+                + compact_u16_size(data_length) + data_length
+            )
+
+class _Bin:
+    def __init__(self, fee_payer, reserved=None):
+        self.units = []
+        self.accounts = {fee_payer}
+        self.signers = {fee_payer}
+        self.instruction_bytes = 0
+        self.instruction_count = 0
+        if reserved is not None:
+            self._reserve(reserved)
+
+    def size_with(self, unit):
+        accounts = len(self.accounts | unit.accounts)
+        signers = len(self.signers | unit.signers)
+        count = self.instruction_count + len(unit.instructions)
+        return accounts, transaction_size(accounts, signers, count, self.instruction_bytes + unit.instruction_bytes)
+
+    def fits(self, unit, max_size, max_accounts):
+        accounts, size = self.size_with(unit)
+        return accounts <= max_accounts and size <= max_size
+
+    def add(self, unit):
+        self.units.append(unit)
+        self._reserve(unit)
+
+    def _reserve(self, unit):
+        self.accounts |= unit.accounts
+        self.signers |= unit.signers
+        self.instruction_bytes += unit.instruction_bytes
+        self.instruction_count += len(unit.instructions)
+
+    def instructions(self):
+        return [instruction for unit in self.units for instruction in unit.instructions]
+
+    def indices(self):
+        return [unit.index for unit in self.units]
+
+def transaction_size(account_count, signer_count, instruction_count, instruction_bytes):
+    return (
+        compact_u16_size(signer_count) + SIGNATURE_SIZE * signer_count
+        + MESSAGE_HEADER_SIZE
+        + compact_u16_size(account_count) + PUBKEY_SIZE * account_count
+        + BLOCKHASH_SIZE
+        + compact_u16_size(instruction_count) + instruction_bytes
+    )
+
+def _pack(items, fee_payer, ordered, max_size, max_accounts, reserved=()):
+    fee_payer = str(fee_payer)
+    # Reserved instructions are added to every transaction later (e.g. AdvanceNonceAccount) and only take up room here.
+    reserved = _Unit(-1, list(reserved)) if reserved else None
+
+    units = [_Unit(index, list(item) if isinstance(item, list) else [item]) for index, item in enumerate(items)]
+    for unit in units:
+        if not _Bin(fee_payer, reserved).fits(unit, max_size, max_accounts):
+            raise ValueError(f"Instruction group of {len(unit.instructions)} instruction(s) does not fit in a single transaction")
+
+    bins = []
+    if ordered:
+        for unit in units:
+            if not bins or not bins[-1].fits(unit, max_size, max_accounts):
+                bins.append(_Bin(fee_payer, reserved))
+            bins[-1].add(unit)
+    else:
+        for unit in sorted(units, key=lambda unit: unit.instruction_bytes + PUBKEY_SIZE * len(unit.accounts), reverse=True):
+            for candidate in bins:
+                if candidate.fits(unit, max_size, max_accounts):
+                    candidate.add(unit)
+                    break
+            else:
+                new_bin = _Bin(fee_payer, reserved)
+                new_bin.add(unit)
+                bins.append(new_bin)
+
+    logger.debug("Packed %s instruction group(s) into %s transaction(s)", len(units), len(bins))
+    return bins
+
+def pack_instructions(items, fee_payer, ordered=True, max_size=PACKET_DATA_SIZE, max_accounts=MAX_TX_ACCOUNT_LOCKS, reserved=()):
+    return [packed.instructions() for packed in _pack(items, fee_payer, ordered, max_size, max_accounts, reserved)]
+
+def pack_groups(items, fee_payer, ordered=True, max_size=PACKET_DATA_SIZE, max_accounts=MAX_TX_ACCOUNT_LOCKS, reserved=()):
+    return [(packed.indices(), packed.instructions()) for packed in _pack(items, fee_payer, ordered, max_size, max_accounts, reserved)]
+
+def pack_transactions(items, fee_payer, recent_blockhash, ordered=True, max_size=PACKET_DATA_SIZE, max_accounts=MAX_TX_ACCOUNT_LOCKS):
+    transactions = []
+    for instructions in pack_instructions(items, fee_payer, ordered, max_size, max_accounts):
+        transaction = Transaction(recent_blockhash=recent_blockhash, fee_payer=fee_payer)
+        transaction.add(*instructions)
+        transactions.append(transaction)
+    return transactions
@@ -0,0 +1,21 @@
+from functools import lru_cache
+from solana.publickey import PublicKey
+
+PUBKEY_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=PUBKEY_CACHE_SIZE)
+def _parse_pubkey(value):
+    return PublicKey(value)
+
+def intern_pubkey(value):
+    if isinstance(value, PublicKey):
+        return value
+    return _parse_pubkey(value)
+
+def pubkey_cache_info():
+    return _parse_pubkey.cache_info()
+
+def clear_pubkey_cache():
+    _parse_pubkey.cache_clear()
+
+SPL_TOKEN_PROGRAM_ID = intern_pubkey("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
@@ -0,0 +1,224 @@
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from solana.rpc.api import Client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LATENCY_WINDOW = 200
+DEFAULT_HEDGE_DELAY = 0.25
+MIN_HEDGE_SAMPLES = 20
+ERROR_PENALTY = 10.0
+READ_METHOD_PREFIXES = ('get_', 'is_')
+
+@functools.lru_cache(maxsize=None)
+def _transport_errors():
+    errors = [ConnectionError, TimeoutError]
+    try:
+        import httpx
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        import requests
+        errors.extend([requests.exceptions.ConnectionError, requests.exceptions.Timeout])
+    except ImportError:
+        pass
+    return tuple(errors)
+
+def is_transport_error(error):
+    while error is not None:
+        if isinstance(error, _transport_errors()):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+class RpcEndpoint:
+    def __init__(self, url, client=None, window=DEFAULT_LATENCY_WINDOW):
+        self.url = url
+        self.client = client if client is not None else Client(url)
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def begin(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def record(self, latency, ok):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self._outcomes.append(0 if ok else 1)
+            if ok:
+                self._latencies.append(latency)
+            else:
+                self.errors += 1
+
+    def mean_latency(self):
+        with self._lock:
+            if not self._latencies:
+                return None
+            return sum(self._latencies) / len(self._latencies)
+
+    def p95(self):
+        with self._lock:
+            if len(self._latencies) < MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+            return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def error_rate(self):
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return sum(self._outcomes) / len(self._outcomes)
+
+    def score(self):
+        latency = self.mean_latency()
+        if latency is None:
+            latency = 0.0
+        return (latency + 0.001 * self.in_flight) * (1 + ERROR_PENALTY * self.error_rate()) + self.error_rate()
+
+    def close(self):
+        close = getattr(self.client, 'close', None)
+        if close is None:
+            session = getattr(getattr(self.client, '_provider', None), 'session', None)
+            close = getattr(session, 'close', None)
+        if close is not None:
+            close()
+
+    def stats(self):
+        with self._lock:
+            requests, errors, in_flight = self.requests, self.errors, self.in_flight
+        return {
+            'url': self.url,
+            'requests': requests,
+            'errors': errors,
+            'in_flight': in_flight,
+            'error_rate': self.error_rate(),
+            'mean_latency': self.mean_latency(),
+            'p95_latency': self.p95(),
+        }
+
+class RpcPool:
+    def __init__(self, endpoints, hedge_reads=True, default_hedge_delay=DEFAULT_HEDGE_DELAY, max_workers=32):
+        if not endpoints:
+            raise ValueError("RpcPool requires at least one endpoint")
+        self.endpoints = [endpoint if isinstance(endpoint, RpcEndpoint) else RpcEndpoint(endpoint) for endpoint in endpoints]
+        self.hedge_reads = hedge_reads
+        self.default_hedge_delay = default_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rpc-pool")
+        self._lock = threading.Lock()
+        self._logger = self._setup_logger()
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+    def _setup_logger(self):
+        logger.info("RpcPool initialized with %s endpoints", len(self.endpoints))
+        return logger
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        method.__name__ = name
+        return method
+
+    def ranked(self):
+        return sorted(self.endpoints, key=lambda endpoint: endpoint.score())
+
+    def healthiest(self):
+        return self.ranked()[0]
+
+    def _invoke(self, endpoint, method, args, kwargs):
+        endpoint.begin()
+        started = time.monotonic()
+        try:
+            result = getattr(endpoint.client, method)(*args, **kwargs)
+        except Exception:
+            endpoint.record(time.monotonic() - started, False)
+            raise
+        endpoint.record(time.monotonic() - started, True)
+        return result
+
+    def call(self, method, *args, **kwargs):
+        ranked = self.ranked()
+        if self.hedge_reads and len(ranked) > 1 and method.startswith(READ_METHOD_PREFIXES):
+            return self._hedged_call(ranked, method, args, kwargs)
+        return self._failover_call(ranked, method, args, kwargs)
+
+    def _failover_call(self, ranked, method, args, kwargs):
+        last_error = None
+        for endpoint in ranked:
+            try:
+                return self._invoke(endpoint, method, args, kwargs)
+            except Exception as error:
+                self._logger.error("RPC %s failed on %s: %s", method, endpoint.url, error)
+                # Retrying a rejected write elsewhere can only duplicate it; fail over on transport errors only.
+                if not method.startswith(READ_METHOD_PREFIXES) and not is_transport_error(error):
+                    raise
+                last_error = error
+        raise last_error
+
+    def _hedged_call(self, ranked, method, args, kwargs):
+        primary, backup = ranked[0], ranked[1]
+        delay = primary.p95() or self.default_hedge_delay
+        pending = {self._executor.submit(self._invoke, primary, method, args, kwargs)}
+        done, pending = wait(pending, timeout=delay)
+        if not done:
+            self._logger.debug("RPC %s on %s exceeded %.3fs, hedging to %s", method, primary.url, delay, backup.url)
+            with self._lock:
+                self.hedged_requests += 1
+            hedge = self._executor.submit(self._invoke, backup, method, args, kwargs)
+            pending.add(hedge)
+        else:
+            hedge = None
+
+        last_error = None
+        while done or pending:
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as error:
+                    last_error = error
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return result
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        self._logger.debug("Hedged RPC %s failed, failing over: %s", method, last_error)
+        remaining = [endpoint for endpoint in ranked if endpoint is not primary and (hedge is None or endpoint is not backup)]
+        if not remaining:
+            raise last_error
+        return self._failover_call(remaining, method, args, kwargs)
+
+    def stats(self):
+        with self._lock:
+            hedged_requests, hedge_wins = self.hedged_requests, self.hedge_wins
+        return {
+            'endpoints': [endpoint.stats() for endpoint in self.endpoints],
+            'hedged_requests': hedged_requests,
+            'hedge_wins': hedge_wins,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for endpoint in self.endpoints:
+            try:
+                endpoint.close()
+            except Exception as error:
+                self._logger.error("Error closing RPC client for %s: %s", endpoint.url, error)
@@ -1,14 +1,15 @@
 from solana.keypair import Keypair
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
-from cryptography.fernet import Fernet
 import logging
 import base64
 import os
+from src.utils.metrics import timed
+
+logger = logging.getLogger(__name__)
 
 def load_private_key_from_env(env_var_name):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Loading private key from environment variable: {env_var_name}")
+    logger.debug("Loading private key from environment variable: %s", env_var_name)
 
     try:
         private_key_base64 = os.getenv(env_var_name)
@@ -16,58 +17,69 @@ def load_private_key_from_env(env_var_name):
             raise ValueError(f"Environment variable {env_var_name} not set")
         private_key_bytes = base64.b64decode(private_key_base64)
         keypair = Keypair.from_secret_key(private_key_bytes)
-        logger.debug(f"Loaded private key for public key: {keypair.public_key}")
+        logger.debug("Loaded private key for public key: %s", keypair.public_key)
         return keypair
     except Exception as error:
-        logger.error(f"Error loading private key from environment: {error}")
+        logger.error("Error loading private key from environment: %s", error)
         return None
 
+@timed('sign_transaction')
 def sign_transaction(transaction, keypair):
-    logger = logging.getLogger(__name__)
-    logger.debug(f"Signing transaction with keypair: {keypair.public_key}")
+    logger.debug("Signing transaction with keypair: %s", keypair.public_key)
 
     try:
         transaction.sign(keypair)
         logger.debug("Transaction signed successfully")
         return transaction
     except Exception as error:
-        logger.error(f"Error signing transaction: {error}")
+        logger.error("Error signing transaction: %s", error)
         return None
 
+@timed('send_signed_transaction')
 def send_signed_transaction(client, transaction, opts=TxOpts(skip_confirmation=False)):
-    logger = logging.getLogger(__name__)
     logger.debug("Sending signed transaction")
 
     try:
-        transaction_result = client.send_transaction(transaction, opts=opts)
-        logger.debug(f"Signed transaction sent: {transaction_result}")
+        transaction_result = client.send_raw_transaction(transaction.serialize(), opts=opts)
+        logger.debug("Signed transaction sent: %s", transaction_result)
         return transaction_result
     except Exception as error:
-        logger.error(f"Error sending signed transaction: {error}")
+        logger.error("Error sending signed transaction: %s", error)
+        return None
+
+def submit_signed_transaction(tracker, transaction, commitment='confirmed', last_valid_block_height=None):
+    logger.debug("Submitting signed transaction for tracking until %s", commitment)
+
+    try:
+        signature, future = tracker.submit(transaction, commitment, last_valid_block_height)
+        logger.debug("Signed transaction submitted: %s", signature)
+        return signature, future
+    except Exception as error:
+        logger.error("Error submitting signed transaction: %s", error)
         return None
 
 def encrypt_data(data, key):
-    logger = logging.getLogger(__name__)
     logger.debug("Encrypting data")
 
     try:
+        from cryptography.fernet import Fernet
         fernet = Fernet(key)
         encrypted_data = fernet.encrypt(data.encode('utf-8'))
-        logger.debug(f"Data encrypted: {encrypted_data}")
+        logger.debug("Data encrypted: %s", encrypted_data)
         return encrypted_data
     except Exception as error:
-        logger.error(f"Error encrypting data: {error}")
+        logger.error("Error encrypting data: %s", error)
         return None
 
 def decrypt_data(encrypted_data, key):
-    logger = logging.getLogger(__name__)
     logger.debug("Decrypting data")
 
     try:
+        from cryptography.fernet import Fernet
         fernet = Fernet(key)
         decrypted_data = fernet.decrypt(encrypted_data).decode('utf-8')
-        logger.debug(f"Data decrypted: {decrypted_data}")
+        logger.debug("Data decrypted: %s", decrypted_data)
         return decrypted_data
     except Exception as error:
-        logger.error(f"Error decrypting data: {error}")
+        logger.error("Error decrypting data: %s", error)
         return None
\ No newline at end of file
@@ -0,0 +1,102 @@
+import base64
+import struct
+
+import pytest
+
+pytest.importorskip('solana')
+
+from base58 import b58decode
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.utils.accounts import AccountResolver, associated_token_address, fetch_multiple_accounts
+
+def new_key():
+    return str(Keypair().public_key)
+
+def encoded(data):
+    return {'data': [base64.b64encode(data).decode('utf-8'), 'base64']}
+
+def mint_account(decimals):
+    data = bytearray(82)
+    data[44] = decimals
+    return encoded(bytes(data))
+
+def token_account(mint, owner, amount):
+    return encoded(b58decode(mint) + b58decode(owner) + struct.pack('<Q', amount) + bytes(93))
+
+def calls(client):
+    return client.stats()['calls']
+
+def test_fetch_multiple_accounts_chunks_and_deduplicates():
+    keys = [new_key() for _ in range(5)]
+    client = MockRpcClient(accounts={key: mint_account(6) for key in keys})
+    accounts = fetch_multiple_accounts(client, keys + keys[:2], chunk_size=2)
+    assert set(accounts) == set(keys)
+    assert calls(client) == 3
+
+def test_prefetch_loads_many_accounts_in_one_request():
+    mints = [new_key() for _ in range(10)]
+    owner = new_key()
+    holdings = {associated_token_address(owner, mint): token_account(mint, owner, index) for index, mint in enumerate(mints)}
+    client = MockRpcClient(accounts=dict({mint: mint_account(index) for index, mint in enumerate(mints)}, **holdings))
+    resolver = AccountResolver(client)
+    resolver.prefetch(mints=mints, token_accounts=holdings)
+    assert calls(client) == 1
+    assert [resolver.get_decimals(mint) for mint in mints] == list(range(10))
+    assert resolver.get_token_account(associated_token_address(owner, mints[3]))['amount'] == 3
+    assert calls(client) == 1
+    assert resolver.stats()['fetches'] == 1
+
+def test_token_accounts_expire_but_decimals_stay_cached():
+    mint, owner = new_key(), new_key()
+    account = associated_token_address(owner, mint)
+    client = MockRpcClient(accounts={mint: mint_account(9), account: token_account(mint, owner, 1)})
+    resolver = AccountResolver(client, token_account_ttl=0)
+    resolver.prefetch(mints=[mint], token_accounts=[account])
+    client.accounts[account] = token_account(mint, owner, 2)
+    assert resolver.get_token_account(account)['amount'] == 2
+    assert resolver.get_decimals(mint) == 9
+    assert calls(client) == 2
+
+def test_missing_accounts_are_cached_as_absent():
+    client = MockRpcClient()
+    resolver = AccountResolver(client)
+    missing = new_key()
+    assert resolver.get_token_account(missing) is None
+    assert resolver.get_token_account(missing) is None
+    assert calls(client) == 1
+    with pytest.raises(ValueError):
+        resolver.get_decimals(new_key())
+
+def test_resolve_enriches_transfers_with_one_prefetch():
+    payer = new_key()
+    mint = new_key()
+    recipients = [new_key() for _ in range(4)]
+    source = associated_token_address(payer, mint)
+    accounts = {mint: mint_account(6), source: token_account(mint, payer, 10**9)}
+    accounts[associated_token_address(recipients[0], mint)] = token_account(mint, recipients[0], 0)
+    client = MockRpcClient(accounts=accounts)
+    resolver = AccountResolver(client, symbols={'usdc': mint})
+    instructions = [{'type': 'transfer_token', 'asset': 'USDC', 'recipient': recipient, 'amount': 1.5} for recipient in recipients]
+    instructions.append({'type': 'transfer_sol', 'recipient': recipients[0], 'amount': 1})
+
+    resolved = resolver.resolve(instructions, payer)
+
+    assert calls(client) == 1
+    assert resolved[-1] is instructions[-1]
+    for recipient, instruction in zip(recipients, resolved):
+        assert instruction['mint'] == mint and instruction['decimals'] == 6
+        assert instruction['amount'] == 1_500_000
+        assert instruction['source'] == source
+        assert instruction['destination'] == associated_token_address(recipient, mint)
+    assert [instruction['destination_exists'] for instruction in resolved[:4]] == [True, False, False, False]
+
+def test_resolve_infers_mint_from_source_account():
+    payer, mint, recipient = new_key(), new_key(), new_key()
+    source = new_key()
+    client = MockRpcClient(accounts={mint: mint_account(2), source: token_account(mint, payer, 500)})
+    resolver = AccountResolver(client)
+    resolved = resolver.resolve([{'type': 'transfer_token', 'source': source, 'recipient': recipient, 'amount': 3}], payer)
+    assert resolved[0]['mint'] == mint and resolved[0]['decimals'] == 2
+    assert resolved[0]['destination'] == associated_token_address(recipient, mint)
+    assert calls(client) == 2
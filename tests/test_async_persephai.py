@@ -0,0 +1,58 @@
+import asyncio
+import base64
+import time
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.benchmarks.scenarios import command_text, create_parser
+from src.main import AsyncPersephAI
+
+def address():
+    return str(Keypair().public_key)
+
+@pytest.fixture
+def agent_factory(monkeypatch):
+    monkeypatch.setenv('TEST_SOLANA_KEY', base64.b64encode(Keypair().secret_key).decode('utf-8'))
+
+    def create(rpc_latency=0.0, **kwargs):
+        agent = AsyncPersephAI('unused', 'TEST_SOLANA_KEY', rpc_pool=MockRpcClient(latency=rpc_latency),
+                               parser=create_parser(True), **kwargs)
+        agent.blockhash_provider.refresh()
+        agent.confirmation_tracker.poll_interval = 0.01
+        return agent
+
+    return create
+
+def test_submit_returns_awaitable_confirmations(agent_factory):
+    async def scenario():
+        agent = agent_factory()
+        try:
+            submitted = await agent.submit(command_text([address(), address()]))
+            return [await asyncio.wait_for(future, 5) for _, future in submitted]
+        finally:
+            await agent.close()
+
+    statuses = asyncio.run(scenario())
+    assert len(statuses) == 1 and statuses[0]['confirmationStatus'] == 'finalized'
+
+def test_sends_are_not_capped_by_the_default_executor(agent_factory):
+    requests = 96
+    latency = 0.2
+
+    async def scenario():
+        agent = agent_factory(rpc_latency=latency, max_concurrency=requests)
+        try:
+            started = time.perf_counter()
+            results = await agent.run_many([command_text([address()]) for _ in range(requests)])
+            return results, time.perf_counter() - started
+        finally:
+            await agent.close()
+
+    results, elapsed = asyncio.run(scenario())
+    assert all(result and result[0]['result'] for result in results)
+    # On the ~32-thread default executor, 96 blocking sends would need at least three rounds.
+    assert elapsed < 3 * latency
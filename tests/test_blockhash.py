@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.benchmarks.mocks import MockRpcClient
+from src.utils import blockhash
+from src.utils.blockhash import BlockhashProvider, DEFAULT_MAX_AGE
+
+class RecordingClient(MockRpcClient):
+    def __init__(self):
+        super().__init__()
+        self.commitments = []
+
+    def get_latest_blockhash(self, commitment=None):
+        self.commitments.append(commitment)
+        return super().get_latest_blockhash()
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(blockhash.time, 'monotonic', clock.monotonic)
+    return clock
+
+def test_blockhash_is_fetched_at_confirmed_commitment(clock):
+    client = RecordingClient()
+    BlockhashProvider(client).refresh()
+    assert client.commitments == ['confirmed']
+
+def test_cached_blockhash_is_reused_until_max_age(clock):
+    provider = BlockhashProvider(RecordingClient())
+    first, height = provider.get_blockhash_with_height()
+    clock.now += DEFAULT_MAX_AGE - 1
+    assert provider.get_blockhash_with_height() == (first, height)
+    clock.now += 1
+    second, second_height = provider.get_blockhash_with_height()
+    assert second != first and second_height > height
+    assert provider.metrics()['cache_misses'] == 2
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.benchmarks.mocks import MockChatClient, MockAsyncChatClient
+from src.parser import cache as cache_module
+from src.parser.cache import ResponseCache, normalize_cache_key
+from src.parser.deepseek import DeepSeekInterface
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock.time)
+    return clock
+
+def key(text, context=None):
+    return normalize_cache_key(text, context, 'model')
+
+def test_keys_ignore_whitespace_and_context_ordering():
+    assert key('transfer  1 SOL\nto A') == key(' transfer 1 SOL to A ')
+    assert key('x', {'b': 1, 'a': 2}) == key('x', {'a': 2, 'b': 1})
+    assert key('x', 'context') != key('x')
+    assert normalize_cache_key('x', None, 'other') != key('x')
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=10)
+    cache.set(key('a'), 'A')
+    clock.now += 9
+    assert cache.get(key('a')) == 'A'
+    clock.now += 1
+    assert cache.get(key('a')) is None
+    assert cache.stats()['size'] == 0
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.set(key('a'), 'A')
+    cache.set(key('b'), 'B')
+    assert cache.get(key('a')) == 'A'
+    cache.set(key('c'), 'C')
+    assert cache.get(key('b')) is None
+    assert (cache.get(key('a')), cache.get(key('c'))) == ('A', 'C')
+    assert cache.stats() == {'hits': 3, 'disk_hits': 0, 'misses': 1, 'hit_rate': 0.75, 'size': 2}
+
+def test_sqlite_store_survives_restart(clock, tmp_path):
+    path = str(tmp_path / 'responses.sqlite')
+    first = ResponseCache(ttl=10, path=path)
+    first.set(key('a'), 'A')
+    first.set(key('b'), 'B')
+    first.close()
+
+    second = ResponseCache(ttl=10, path=path)
+    assert second.get(key('a')) == 'A'
+    assert second.stats()['disk_hits'] == 1
+    second.invalidate(key('b'))
+    clock.now += 10
+    assert second.get(key('a')) is None
+    second.close()
+
+    third = ResponseCache(ttl=10, path=path)
+    clock.now -= 10
+    assert third.get(key('b')) is None
+    assert third.get(key('a')) == 'A'
+    third.close()
+
+def test_interface_serves_repeated_prompts_from_cache():
+    client = MockChatClient()
+    interface = DeepSeekInterface('unused', cache=ResponseCache(), client=client, async_client=MockAsyncChatClient())
+    first = interface.extract_instructions('transfer 1.5 SOL to A', None)
+    assert interface.extract_instructions('transfer  1.5 SOL to A', None) == first
+    assert client.stats()['calls'] == 1
+    interface.extract_instructions('transfer 1.5 SOL to A', None, use_cache=False)
+    assert client.stats()['calls'] == 2
@@ -0,0 +1,125 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from solana.system_program import TransferParams, transfer
+from solana.transaction import Transaction
+from src.benchmarks.mocks import MockRpcClient
+from src.utils.confirmation import ConfirmationTracker, TransactionExpiredError, TransactionFailedError
+
+BLOCKHASH = '11111111111111111111111111111111'
+
+class DroppingClient(MockRpcClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.broadcasts = 0
+
+    def send_raw_transaction(self, raw_transaction, opts=None):
+        self.broadcasts += 1
+        return {'result': None}
+
+class RejectingClient(DroppingClient):
+    def send_raw_transaction(self, raw_transaction, opts=None):
+        self.broadcasts += 1
+        raise RuntimeError("Transaction simulation failed")
+
+class ErroringClient(MockRpcClient):
+    def get_signature_statuses(self, signatures, *args, **kwargs):
+        response = super().get_signature_statuses(signatures, *args, **kwargs)
+        for status in response['result']['value']:
+            if status is not None:
+                status['err'] = {'InstructionError': [0, 'Custom']}
+        return response
+
+def signed_transaction():
+    payer = Keypair()
+    transaction = Transaction(recent_blockhash=BLOCKHASH, fee_payer=payer.public_key)
+    transaction.add(transfer(TransferParams(from_pubkey=payer.public_key, to_pubkey=Keypair().public_key, lamports=1)))
+    transaction.sign(payer)
+    return transaction
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+@pytest.fixture
+def tracker_for():
+    trackers = []
+    def make(client, **kwargs):
+        kwargs.setdefault('poll_interval', 0.01)
+        trackers.append(ConfirmationTracker(client, **kwargs))
+        return trackers[-1]
+    yield make
+    for tracker in trackers:
+        tracker.stop()
+
+def test_confirms_at_requested_commitment(tracker_for):
+    tracker = tracker_for(MockRpcClient(confirmation_status='confirmed'))
+    signature, future = tracker.submit(signed_transaction(), 'confirmed')
+    assert future.result(timeout=5)['confirmationStatus'] == 'confirmed'
+    assert tracker.stats()['confirmed'] == 1 and tracker.pending_count() == 0
+
+def test_waits_for_requested_commitment(tracker_for):
+    client = MockRpcClient(confirmation_status='confirmed')
+    tracker = tracker_for(client, expiry=0.05)
+    _, future = tracker.submit(signed_transaction(), 'finalized')
+    time.sleep(0.1)
+    assert not future.done()
+    client.confirmation_status = 'finalized'
+    assert future.result(timeout=5)['confirmationStatus'] == 'finalized'
+
+def test_submitting_twice_tracks_one_transaction(tracker_for):
+    tracker = tracker_for(DroppingClient(), rebroadcast_interval=60)
+    transaction = signed_transaction()
+    first = tracker.submit(transaction)
+    second = tracker.submit(transaction)
+    assert first[0] == second[0] and first[1] is second[1]
+    assert tracker.pending_count() == 1
+
+def test_expires_once_block_height_passes_last_valid(tracker_for):
+    client = DroppingClient()
+    tracker = tracker_for(client, rebroadcast_interval=60)
+    _, future = tracker.submit(signed_transaction(), last_valid_block_height=client.block_height + 2)
+    time.sleep(0.05)
+    assert not future.done()
+    client.block_height += 3
+    with pytest.raises(TransactionExpiredError):
+        future.result(timeout=5)
+    assert tracker.stats()['expired'] == 1
+
+def test_onchain_error_fails_the_future(tracker_for):
+    tracker = tracker_for(ErroringClient())
+    _, future = tracker.submit(signed_transaction())
+    with pytest.raises(TransactionFailedError):
+        future.result(timeout=5)
+
+def test_rejected_first_send_fails_without_rebroadcast(tracker_for):
+    client = RejectingClient()
+    tracker = tracker_for(client, rebroadcast_interval=0)
+    _, future = tracker.submit(signed_transaction())
+    with pytest.raises(TransactionFailedError, match="rejected"):
+        future.result(timeout=5)
+    time.sleep(0.05)
+    assert client.broadcasts == 1 and tracker.stats()['rebroadcasts'] == 0
+
+def test_accepted_transaction_is_rebroadcast_until_it_lands(tracker_for):
+    client = DroppingClient()
+    tracker = tracker_for(client, rebroadcast_interval=0.02)
+    _, future = tracker.submit(signed_transaction())
+    wait_for(lambda: client.broadcasts >= 3)
+    assert not future.done() and tracker.stats()['rebroadcasts'] >= 2
+
+def test_concurrent_resolution_counts_each_transaction_once(tracker_for):
+    tracker = tracker_for(DroppingClient(), rebroadcast_interval=60, poll_interval=60)
+    submitted = [tracker.submit(signed_transaction()) for _ in range(200)]
+    pending = list(tracker._pending.values())
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda entry: tracker._resolve(entry, 'confirmed', result={}), pending * 4))
+    assert all(future.done() for _, future in submitted)
+    assert tracker.stats()['confirmed'] == 200 and tracker.stats()['pending'] == 0
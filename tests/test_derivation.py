@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from src.utils import derivation
+from src.utils.derivation import (
+    clear_derivation_cache,
+    derivation_cache_info,
+    derive_ata,
+    derive_many,
+    derive_master_edition,
+    derive_metadata,
+    get_derivation_pool,
+    shutdown_derivation_pool
+)
+
+def address():
+    return str(Keypair().public_key)
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_derivation_cache()
+    yield
+    clear_derivation_cache()
+
+def inline(kind, rows):
+    return [derivation._derive_uncached(kind, row if isinstance(row, tuple) else (row,)) for row in rows]
+
+def test_single_derivations_are_cached():
+    owner, mint = address(), address()
+    assert derive_ata(owner, mint) == derive_ata(owner, mint)
+    assert derivation_cache_info()['hits'] == 1
+    assert derive_metadata(mint) != derive_master_edition(mint)
+
+def test_inline_batch_matches_single_derivations():
+    mints = [address() for _ in range(5)]
+    assert derive_many('metadata', mints) == [derive_metadata(mint) for mint in mints]
+
+def test_parallel_batch_matches_inline_results():
+    rows = [(address(), address()) for _ in range(6)]
+    rows.append(rows[0])
+    try:
+        parallel = derive_many('ata', rows, max_workers=2, chunk_size=2, parallel_threshold=1)
+        assert [str(result) for result in parallel] == [str(result) for result in inline('ata', rows)]
+        assert get_derivation_pool(2) is get_derivation_pool(2)
+    finally:
+        shutdown_derivation_pool()
+
+def test_caller_executor_is_used():
+    mints = [address() for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        derived = derive_many('master_edition', mints, chunk_size=1, parallel_threshold=1, executor=executor)
+    assert derivation._pool is None
+    assert [str(result) for result in derived] == [str(result) for result in inline('master_edition', mints)]
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        derive_many('vault', [address()])
@@ -0,0 +1,10 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.benchmarks.import_time import DEFAULT_MAX_IMPORT_SECONDS, check_cold_start
+
+def test_cold_import_stays_lazy_and_fast():
+    result = check_cold_start(max_seconds=DEFAULT_MAX_IMPORT_SECONDS, runs=3)
+    assert result['eager_modules'] == []
+    assert result['failures'] == []
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.parser.mappings import (
+    IncrementalScanner,
+    MAX_MATCH_LENGTH,
+    map_deepseek_response_to_instructions,
+    parse_command_grammar
+)
+
+COMMAND = "transfer 1.5 SOL to Alice, stake 2 tokens with Validator and swap 3 SOL for USDC on Raydium"
+
+def feed_all(chunks):
+    scanner = IncrementalScanner()
+    instructions = []
+    for chunk in chunks:
+        instructions.extend(scanner.feed(chunk))
+    instructions.extend(scanner.close())
+    return instructions, scanner
+
+@pytest.mark.parametrize('size', [1, 3, 7, 16, len(COMMAND)])
+def test_incremental_scanner_matches_full_scan(size):
+    chunks = [COMMAND[offset:offset + size] for offset in range(0, len(COMMAND), size)]
+    instructions, _ = feed_all(chunks)
+    assert instructions == map_deepseek_response_to_instructions(COMMAND)
+
+def test_incremental_scanner_waits_for_match_at_end_of_buffer():
+    scanner = IncrementalScanner()
+    assert scanner.feed("transfer 1 SOL to Al") == []
+    assert scanner.feed("ice then") == [{'type': 'transfer', 'asset': 'SOL', 'amount': 1.0, 'recipient': 'Alice'}]
+
+def test_incremental_scanner_buffer_stays_bounded_without_matches():
+    scanner = IncrementalScanner()
+    for _ in range(1000):
+        assert scanner.feed("nothing to see here ") == []
+    assert len(scanner._buffer) <= MAX_MATCH_LENGTH
+
+def test_incremental_scanner_finds_match_after_long_prose():
+    instructions, _ = feed_all(["lorem ipsum " * 500, "transfer NFT Token1 to Bob", " done"])
+    assert instructions == [{'type': 'nft_transfer', 'nft_id': 'Token1', 'recipient': 'Bob'}]
+
+def test_parse_command_grammar_rejects_partial_match():
+    assert parse_command_grammar("transfer 1 SOL to Alice and do something else") is None
+    assert parse_command_grammar("transfer 1 SOL to Alice then vote yes on proposal P1") == [
+        {'type': 'transfer', 'asset': 'SOL', 'amount': 1.0, 'recipient': 'Alice'},
+        {'type': 'governance_vote', 'vote': 'yes', 'proposal_id': 'P1'},
+    ]
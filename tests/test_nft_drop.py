@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip('solana')
+pytest.importorskip('spl.token')
+pytest.importorskip('metaplex')
+
+from concurrent.futures import ThreadPoolExecutor
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.pipelines.nft_drop import NftDropPipeline
+from src.utils.derivation import derive_ata
+from src.utils.pubkeys import SPL_TOKEN_PROGRAM_ID
+
+SYSTEM_PROGRAM_ID = '11111111111111111111111111111111'
+
+@pytest.fixture
+def pipeline(tmp_path):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pipeline = NftDropPipeline(MockRpcClient(), Keypair(), str(tmp_path / 'drop.jsonl'), drop_seed=b'seed',
+                                   derivation_executor=executor)
+        yield pipeline
+        pipeline.close()
+
+def test_each_row_creates_its_mint_before_minting(pipeline):
+    owner = str(Keypair().public_key)
+    [item] = pipeline.build([{'id': 1, 'name': 'One', 'uri': 'https://example.com/1.json', 'owner': owner}])
+    mint = pipeline.mint_for(1)
+    create, initialize, create_ata = item.instructions[:3]
+    assert str(create.program_id) == SYSTEM_PROGRAM_ID and str(create.keys[1].pubkey) == str(mint)
+    assert str(initialize.program_id) == str(SPL_TOKEN_PROGRAM_ID) and str(initialize.keys[0].pubkey) == str(mint)
+    assert str(derive_ata(owner, mint)) in {str(meta.pubkey) for meta in create_ata.keys}
+    assert [str(signer.public_key) for signer in item.signers] == [str(mint)]
+    assert all(instruction is not None for instruction in item.instructions)
+
+def test_mints_are_deterministic_per_row(pipeline):
+    assert pipeline.mint_for(7) == pipeline.mint_for(7)
+    assert pipeline.mint_for(7) != pipeline.mint_for(8)
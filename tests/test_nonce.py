@@ -0,0 +1,141 @@
+import base64
+import struct
+import time
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.utils.confirmation import TransactionExpiredError
+from src.utils.nonce import NoncePool, NoncePoolExhaustedError, decode_nonce_account
+
+def nonce_account(fill):
+    data = bytearray(80)
+    struct.pack_into('<II', data, 0, 0, 1)
+    data[40:72] = bytes([fill]) * 32
+    return {'data': [base64.b64encode(bytes(data)).decode('utf-8'), 'base64']}
+
+class RejectingClient(MockRpcClient):
+    def send_raw_transaction(self, raw_transaction, opts=None):
+        raise RuntimeError("Transaction simulation failed")
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+NONCE_1 = str(Keypair().public_key)
+NONCE_2 = str(Keypair().public_key)
+
+@pytest.fixture
+def accounts():
+    return {NONCE_1: nonce_account(1), NONCE_2: nonce_account(2)}
+
+@pytest.fixture
+def pool_factory():
+    pools = []
+
+    def create(client, nonce_accounts=(NONCE_1, NONCE_2)):
+        pool = NoncePool(client, Keypair(), list(nonce_accounts))
+        pool.confirmation_tracker.poll_interval = 0.01
+        pools.append(pool)
+        return pool
+
+    yield create
+    for pool in pools:
+        pool.close()
+
+def expired():
+    future = Future()
+    future.set_exception(TransactionExpiredError("expired"))
+    return future
+
+def test_decode_nonce_account_rejects_uninitialized():
+    assert decode_nonce_account(base64.b64decode(nonce_account(1)['data'][0]))['nonce']
+    assert decode_nonce_account(bytes(80)) is None
+    assert decode_nonce_account(None) is None
+
+def test_presign_hands_out_each_account_once(accounts, pool_factory):
+    pool = pool_factory(MockRpcClient(accounts=accounts))
+    first = pool.presign([], [])
+    second = pool.presign([], [])
+    assert {first.nonce_account, second.nonce_account} == {NONCE_1, NONCE_2}
+    with pytest.raises(NoncePoolExhaustedError):
+        pool.presign([], [], timeout=0.05)
+
+def test_discard_advances_nonce_before_reuse(accounts, pool_factory):
+    client = MockRpcClient(accounts=accounts)
+    pool = pool_factory(client, [NONCE_1])
+    presigned = pool.presign([], [])
+    pool.discard(presigned)
+    wait_for(lambda: len(client.sent) == 1)
+    wait_for(lambda: pool.stats()['available'] == 1)
+    assert pool.stats()['invalidations'] == 1
+    with pytest.raises(ValueError):
+        pool.send(presigned)
+    with pytest.raises(NoncePoolExhaustedError):
+        pool.presign([], [], timeout=0.05)
+    accounts[NONCE_1] = nonce_account(9)
+    assert pool.presign([], [], timeout=0.05).nonce != presigned.nonce
+
+def test_acquire_skips_accounts_without_usable_nonce(accounts, pool_factory):
+    missing = str(Keypair().public_key)
+    pool = pool_factory(MockRpcClient(accounts=accounts), [missing, NONCE_1])
+    presigned = pool.presign([], [])
+    assert presigned.nonce_account == NONCE_1
+    assert pool.stats()['available'] == 1
+    with pytest.raises(NoncePoolExhaustedError):
+        pool.presign([], [], timeout=0.05)
+
+def test_landed_transaction_recycles_account_with_new_nonce(accounts, pool_factory):
+    pool = pool_factory(MockRpcClient(accounts=accounts), [NONCE_1])
+    presigned = pool.presign([], [])
+    accounts[NONCE_1] = nonce_account(9)
+    _, future = pool.send(presigned)
+    future.result(timeout=5)
+    wait_for(lambda: pool.stats()['available'] == 1)
+    assert pool.presign([], [], timeout=1).nonce != presigned.nonce
+
+def test_expired_transaction_with_advanced_nonce_is_not_invalidated(accounts, pool_factory):
+    client = MockRpcClient(accounts=accounts)
+    pool = pool_factory(client, [NONCE_1])
+    presigned = pool.presign([], [])
+    accounts[NONCE_1] = nonce_account(9)
+    pool._recycle(presigned, expired())
+    assert pool.stats()['invalidations'] == 0
+    assert pool.stats()['available'] == 1
+    assert not client.sent
+
+def test_expired_transaction_is_invalidated_once(accounts, pool_factory):
+    client = MockRpcClient(accounts=accounts)
+    pool = pool_factory(client, [NONCE_1])
+    presigned = pool.presign([], [])
+    pool._recycle(presigned, expired())
+    wait_for(lambda: len(client.sent) == 1)
+    assert pool.stats()['invalidations'] == 1
+
+def test_failed_invalidation_quarantines_account(accounts, pool_factory):
+    pool = pool_factory(RejectingClient(accounts=accounts), [NONCE_1, NONCE_2])
+    presigned = pool.presign([], [])
+    pool._recycle(presigned, expired())
+    wait_for(lambda: pool.stats()['quarantined'] == 1)
+    time.sleep(0.05)
+    stats = pool.stats()
+    assert stats['invalidations'] == 1
+    assert stats['in_use'] == 0
+    assert pool.presign([], [], timeout=0.05).nonce_account != presigned.nonce_account
+    with pytest.raises(NoncePoolExhaustedError):
+        pool.presign([], [], timeout=0.05)
+
+def test_rejected_send_goes_through_invalidation(accounts, pool_factory):
+    pool = pool_factory(RejectingClient(accounts=accounts), [NONCE_1])
+    presigned = pool.presign([], [])
+    _, future = pool.send(presigned)
+    with pytest.raises(Exception):
+        future.result(timeout=5)
+    wait_for(lambda: pool.stats()['quarantined'] == 1)
+    assert pool.stats()['invalidations'] == 1
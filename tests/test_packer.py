@@ -0,0 +1,84 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from solana.transaction import Transaction
+from src.instructions.system import create_advance_nonce_instruction
+from src.instructions.templates import TRANSFER_SOL_TEMPLATE
+from src.utils.packer import (
+    MAX_TX_ACCOUNT_LOCKS,
+    PACKET_DATA_SIZE,
+    pack_groups,
+    pack_instructions,
+    required_signers,
+    transaction_size
+)
+
+BLOCKHASH = str(Keypair().public_key)
+
+def transfers(payer, count):
+    return TRANSFER_SOL_TEMPLATE.build_many([
+        {'sender': payer.public_key, 'recipient': Keypair().public_key, 'lamports': index + 1} for index in range(count)
+    ])
+
+def serialized_size(payer, instructions):
+    transaction = Transaction(recent_blockhash=BLOCKHASH, fee_payer=payer.public_key)
+    transaction.add(*instructions)
+    transaction.sign(payer)
+    return len(transaction.serialize())
+
+def test_transaction_size_matches_serialized_transaction():
+    payer = Keypair()
+    instructions = transfers(payer, 5)
+    accounts = {str(payer.public_key)} | {str(meta.pubkey) for instruction in instructions for meta in instruction.keys}
+    accounts |= {str(instruction.program_id) for instruction in instructions}
+    instruction_bytes = sum(1 + 1 + len(instruction.keys) + 1 + len(instruction.data) for instruction in instructions)
+    assert transaction_size(len(accounts), 1, len(instructions), instruction_bytes) == serialized_size(payer, instructions)
+
+def test_ordered_packing_preserves_order_and_fills_packets():
+    payer = Keypair()
+    instructions = transfers(payer, 100)
+    packed = pack_instructions(instructions, payer.public_key)
+    assert [instruction for group in packed for instruction in group] == instructions
+    assert len(packed) > 1
+    for group in packed:
+        assert serialized_size(payer, group) <= PACKET_DATA_SIZE
+
+def test_unordered_groups_keep_every_index_once():
+    payer = Keypair()
+    groups = pack_groups(transfers(payer, 60), payer.public_key, ordered=False)
+    assert sorted(index for indices, _ in groups for index in indices) == list(range(60))
+
+def test_reserved_instruction_is_counted_in_every_transaction():
+    payer = Keypair()
+    advance = create_advance_nonce_instruction(Keypair().public_key, payer.public_key)
+    instructions = transfers(payer, 100)
+    unreserved = pack_instructions(instructions, payer.public_key)
+    packed = pack_instructions(instructions, payer.public_key, reserved=[advance])
+    assert len(packed) >= len(unreserved)
+    for group in packed:
+        assert advance not in group
+        assert serialized_size(payer, [advance] + group) <= PACKET_DATA_SIZE
+
+def test_reserved_accounts_count_against_the_lock_limit():
+    payer = Keypair()
+    advance = create_advance_nonce_instruction(Keypair().public_key, payer.public_key)
+    instructions = transfers(payer, 200)
+    for group in pack_instructions(instructions, payer.public_key, max_size=10 ** 6, reserved=[advance]):
+        accounts = {str(payer.public_key)}
+        for instruction in [advance] + group:
+            accounts.add(str(instruction.program_id))
+            accounts.update(str(meta.pubkey) for meta in instruction.keys)
+        assert len(accounts) <= MAX_TX_ACCOUNT_LOCKS
+
+def test_group_larger_than_a_packet_is_rejected():
+    payer = Keypair()
+    with pytest.raises(ValueError):
+        pack_instructions([transfers(payer, 40)], payer.public_key)
+
+def test_required_signers():
+    payer = Keypair()
+    other = Keypair()
+    instructions = transfers(payer, 2) + [create_advance_nonce_instruction(Keypair().public_key, other.public_key)]
+    assert required_signers(instructions) == {str(payer.public_key), str(other.public_key)}
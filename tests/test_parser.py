@@ -0,0 +1,73 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.benchmarks.mocks import MockAsyncChatClient, MockChatClient, NullCache
+from src.parser.deepseek import BATCH_PREAMBLE, DeepSeekInterface, estimate_tokens
+from src.parser.parser import BATCH_ITEM_OVERHEAD_TOKENS, GRAMMAR_PATH, LLM_PATH, InstructionParser
+
+GRAMMAR_INPUT = "transfer 1.5 SOL to Alice and stake 2 tokens with Validator."
+PROSE_INPUT = "Could you transfer 1.5 SOL to Alice for me"
+
+def create_parser(grammar_fast_path=True):
+    client = MockChatClient()
+    interface = DeepSeekInterface('unused', cache=NullCache(), client=client, async_client=MockAsyncChatClient())
+    return InstructionParser('unused', grammar_fast_path=grammar_fast_path, interface=interface), client
+
+def test_grammar_input_skips_the_llm():
+    parser, client = create_parser()
+    assert parser.parse_input(GRAMMAR_INPUT) == [
+        {'type': 'transfer', 'asset': 'SOL', 'amount': 1.5, 'recipient': 'Alice'},
+        {'type': 'stake', 'asset': 'tokens', 'amount': 2.0, 'validator': 'Validator'},
+    ]
+    assert client.stats()['calls'] == 0
+    assert parser.path_stats()['counts'] == {GRAMMAR_PATH: 1, LLM_PATH: 0}
+
+def test_input_outside_the_grammar_goes_to_the_llm():
+    parser, client = create_parser()
+    assert parser.parse_input(PROSE_INPUT) == [{'type': 'transfer', 'asset': 'SOL', 'amount': 1.5, 'recipient': 'Alice'}]
+    assert client.stats()['calls'] == 1
+    assert parser.path_stats()['fractions'][LLM_PATH] == 1.0
+
+def test_fast_path_can_be_disabled():
+    parser, client = create_parser(grammar_fast_path=False)
+    parser.parse_input(GRAMMAR_INPUT)
+    assert client.stats()['calls'] == 1
+    assert parser.path_stats()['counts'][GRAMMAR_PATH] == 0
+
+def test_streamed_grammar_input_matches_parse_input():
+    parser, client = create_parser()
+    assert list(parser.parse_input_stream(GRAMMAR_INPUT)) == parser.parse_input(GRAMMAR_INPUT)
+    assert client.stats()['calls'] == 0
+
+def test_parse_batch_keeps_order_and_mixes_paths():
+    parser, client = create_parser()
+    inputs = [PROSE_INPUT, GRAMMAR_INPUT, "Please transfer 3 SOL to Bob"]
+    results = parser.parse_batch(inputs)
+    assert [[instruction.get('recipient', instruction.get('validator')) for instruction in result] for result in results] == [
+        ['Alice'], ['Alice', 'Validator'], ['Bob']
+    ]
+    assert client.stats()['calls'] == 1
+
+def test_parse_batch_splits_prompts_by_token_budget():
+    parser, client = create_parser()
+    inputs = [f"Please transfer {index + 1} SOL to Recipient{index}" for index in range(6)]
+    item_tokens = estimate_tokens(inputs[0]) + BATCH_ITEM_OVERHEAD_TOKENS
+    budget = estimate_tokens(BATCH_PREAMBLE) + 2 * item_tokens
+    results = parser.parse_batch(inputs, token_budget=budget)
+    assert [result[0]['recipient'] for result in results] == [f"Recipient{index}" for index in range(6)]
+    batches = parser._pack_batches(list(enumerate(inputs)), budget)
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    assert client.stats()['calls'] == 3
+
+def test_parse_batch_retries_missing_sections_individually():
+    def drop_second_section(messages):
+        content = messages[0]['content']
+        return content.split('### 2')[0] if '### 1' in content else content
+
+    client = MockChatClient(responder=drop_second_section)
+    interface = DeepSeekInterface('unused', cache=NullCache(), client=client, async_client=MockAsyncChatClient())
+    parser = InstructionParser('unused', interface=interface)
+    results = parser.parse_batch(["Please transfer 1 SOL to Alice", "Please transfer 2 SOL to Bob"])
+    assert [result[0]['recipient'] for result in results] == ['Alice', 'Bob']
+    assert client.stats()['calls'] == 2
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.pipelines.payouts import PayoutPipeline, base_units, payout_key
+from src.utils.ledger import CONFIRMED, FAILED, PENDING, SENT, Ledger
+
+def recipients(count):
+    return [{'recipient': str(Keypair().public_key), 'amount': '0.1'} for _ in range(count)]
+
+@pytest.fixture
+def pipeline_factory(tmp_path):
+    payer = Keypair()
+    pipelines = []
+
+    def create(client=None, **kwargs):
+        pipeline = PayoutPipeline(client or MockRpcClient(), payer, str(tmp_path / 'ledger.jsonl'), window=4, **kwargs)
+        pipeline.executor.confirmation_tracker.poll_interval = 0.01
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield create
+    for pipeline in pipelines:
+        pipeline.close()
+
+def test_payout_key_prefers_explicit_id():
+    assert payout_key({'id': 7, 'recipient': 'A', 'amount': '1'}) == '7'
+
+def test_payout_key_depends_on_row_content_not_position():
+    row = {'recipient': 'A', 'amount': '1'}
+    assert payout_key(dict(row)) == payout_key(row)
+    assert payout_key(row) != payout_key(dict(row, amount='2'))
+    assert payout_key(row) != payout_key(row, mint='Mint')
+
+def test_base_units_is_exact():
+    assert base_units('0.1', 9) == 100_000_000
+    assert base_units('1.000001', 6) == 1_000_001
+
+def test_run_rejects_duplicate_rows_before_paying_anything(pipeline_factory):
+    rows = recipients(9)
+    client = MockRpcClient()
+    pipeline = pipeline_factory(client)
+    with pytest.raises(ValueError, match='duplicate payout'):
+        pipeline.run(iter(rows + rows[:1]))
+    assert not client.sent
+    assert all(pipeline.ledger.state(payout_key(row)) is None for row in rows)
+
+def test_run_checks_duplicates_in_files(pipeline_factory, tmp_path):
+    path = tmp_path / 'recipients.jsonl'
+    rows = recipients(6)
+    path.write_text(''.join(json.dumps(row) + '\n' for row in rows + rows[-1:]))
+    client = MockRpcClient()
+    with pytest.raises(ValueError, match='duplicate payout'):
+        pipeline_factory(client).run(str(path))
+    assert not client.sent
+
+def test_run_accepts_one_shot_iterators(pipeline_factory):
+    assert pipeline_factory().run(iter(recipients(6))) == {'skipped': 0, CONFIRMED: 6}
+
+def test_rerun_skips_confirmed_payouts(pipeline_factory):
+    rows = recipients(10)
+    client = MockRpcClient()
+    assert pipeline_factory(client).run(rows) == {'skipped': 0, CONFIRMED: 10}
+    sent = len(client.sent)
+    assert pipeline_factory(client).run(rows) == {'skipped': 10}
+    assert len(client.sent) == sent
+
+def test_ledger_reloads_latest_state_and_skips_truncated_line(tmp_path):
+    path = str(tmp_path / 'ledger.jsonl')
+    ledger = Ledger(path, fsync=False)
+    ledger.record(['a', 'b'], PENDING, signature='s1')
+    ledger.record('a', CONFIRMED, signature='s1')
+    ledger.record('b', SENT, signature='s1')
+    ledger.close()
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"key": "c", "sta')
+
+    ledger = Ledger(path, fsync=False)
+    assert ledger.state('a') == CONFIRMED
+    assert ledger.state('c') is None
+    assert list(ledger.in_flight()) == ['s1']
+    ledger.record('b', FAILED, error='boom')
+    ledger.close()
+    assert Ledger(path, fsync=False).state('b') == FAILED
@@ -0,0 +1,93 @@
+import base64
+import random
+import struct
+
+import pytest
+
+pytest.importorskip('solana')
+np = pytest.importorskip('numpy')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.instructions.raydium_pools import (
+    PoolStateCache,
+    StalePoolStateError,
+    constant_product_out,
+    minimum_amount_out,
+    resolve_swap
+)
+
+def address():
+    return str(Keypair().public_key)
+
+def token_account(amount):
+    data = bytearray(165)
+    struct.pack_into('<Q', data, 64, amount)
+    return {'data': [base64.b64encode(bytes(data)).decode('utf-8'), 'base64']}
+
+def pool_cache(*reserves, fee_bps=25):
+    accounts = {}
+    cache = PoolStateCache(MockRpcClient(accounts=accounts))
+    states = []
+    for base_reserve, quote_reserve in reserves:
+        base_vault, quote_vault = address(), address()
+        accounts[base_vault] = token_account(base_reserve)
+        accounts[quote_vault] = token_account(quote_reserve)
+        states.append(cache.add_pool(address(), address(), address(), base_vault, quote_vault, 9, 6, fee_bps,
+                                     base_symbol='SOL', quote_symbol='USDC'))
+    cache.refresh()
+    return cache, states
+
+def test_refresh_reads_vault_balances():
+    cache, [state] = pool_cache((5_000, 7_000))
+    assert state.balances == (5_000, 7_000)
+    assert state.reserves('USDC') == (7_000, 5_000)
+
+def test_unrefreshed_pool_is_stale():
+    cache = PoolStateCache(MockRpcClient())
+    state = cache.add_pool(address(), address(), address(), address(), address(), 9, 6)
+    with pytest.raises(StalePoolStateError):
+        cache.get_state(state.pool)
+
+def test_quote_matches_scalar_formula():
+    cache, [state] = pool_cache((1_000_000_000_000, 150_000_000_000))
+    quote = cache.quote(state, 'SOL', 2_000_000_000, slippage_bps=100)
+    expected = constant_product_out(2_000_000_000, 1_000_000_000_000, 150_000_000_000, 25)
+    assert quote['amount_out'] == expected
+    assert quote['min_amount_out'] == minimum_amount_out(expected, 100)
+
+@pytest.mark.parametrize('max_reserve, max_amount, dtype', [(10 ** 8, 10 ** 6, np.int64), (10 ** 15, 10 ** 12, object)])
+def test_quote_many_matches_scalar_quotes_across_sizes_and_pools(max_reserve, max_amount, dtype):
+    rng = random.Random(7)
+    reserves = [(rng.randrange(1, max_reserve), rng.randrange(1, max_reserve)) for _ in range(4)]
+    cache, states = pool_cache(*reserves)
+    amounts = [0] + [rng.randrange(1, max_amount) for _ in range(50)]
+    quotes = cache.quote_many(states, ['SOL', 'USDC', 'SOL', 'USDC'], amounts, slippage_bps=75)
+    assert quotes['amount_out'].shape == (len(amounts), len(states))
+    assert quotes['amount_out'].dtype == dtype
+    for row, amount in enumerate(amounts):
+        for column, state in enumerate(states):
+            reserve_in, reserve_out = state.reserves(['SOL', 'USDC', 'SOL', 'USDC'][column])
+            expected = constant_product_out(amount, reserve_in, reserve_out, state.fee_bps)
+            assert quotes['amount_out'][row, column] == expected
+            assert quotes['min_amount_out'][row, column] == minimum_amount_out(expected, 75)
+
+def test_quote_many_is_exact_for_u64_sized_reserves():
+    reserve = 2 ** 64 - 1
+    cache, [state] = pool_cache((reserve, reserve - 12_345))
+    amounts = [10 ** 18, 2 ** 63, 3]
+    quotes = cache.quote_many(state, 'SOL', amounts)
+    assert [int(value) for value in quotes['amount_out']] == [
+        constant_product_out(amount, reserve, reserve - 12_345, state.fee_bps) for amount in amounts
+    ]
+
+def test_quote_many_rejects_fractional_amounts():
+    cache, [state] = pool_cache((5_000, 7_000))
+    with pytest.raises(ValueError):
+        cache.quote_many(state, 'SOL', [1.5])
+
+def test_resolve_swap_fills_min_amount_out():
+    cache, [state] = pool_cache((1_000_000_000_000, 150_000_000_000))
+    resolved = resolve_swap(cache, {'type': 'raydium_swap', 'from_asset': 'SOL', 'to_asset': 'USDC', 'amount': 1.5})
+    assert resolved['pool'] == state.pool and resolved['amount_in'] == 1_500_000_000
+    assert resolved['min_amount_out'] == cache.quote(state, 'SOL', 1_500_000_000)['min_amount_out']
@@ -0,0 +1,88 @@
+import base64
+
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.instructions.registry import InstructionBuildError, InstructionRegistry, create_default_registry
+from src.main import PersephAI
+
+def address():
+    return str(Keypair().public_key)
+
+@pytest.fixture
+def persephai(monkeypatch):
+    keypair = Keypair()
+    monkeypatch.setenv('TEST_SOLANA_KEY', base64.b64encode(keypair.secret_key).decode('utf-8'))
+    instances = []
+
+    def create(**kwargs):
+        instances.append(PersephAI('unused', 'TEST_SOLANA_KEY', rpc_pool=MockRpcClient(), **kwargs))
+        return instances[-1]
+
+    yield create
+    for instance in instances:
+        instance.close()
+
+def test_build_many_keeps_input_order_across_types():
+    payer = Keypair().public_key
+    recipients = [address() for _ in range(3)]
+    instructions = create_default_registry().build_many([
+        {'type': 'transfer', 'recipient': recipients[0], 'amount': 1.0},
+        {'type': 'stake', 'amount': 1.0, 'validator': recipients[1], 'seed': 'order'},
+        {'type': 'transfer_sol', 'recipient': recipients[2], 'lamports': 5},
+    ], {'payer': payer})
+    assert [str(instruction.keys[1].pubkey) for instruction in (instructions[0], instructions[2])] == [recipients[0], recipients[2]]
+    assert isinstance(instructions[1], list) and str(instructions[1][2].keys[1].pubkey) == recipients[1]
+
+def test_unregistered_type_raises_build_error():
+    registry = InstructionRegistry()
+    with pytest.raises(InstructionBuildError) as error:
+        registry.build_many([{'type': 'transfer'}], {'payer': Keypair().public_key})
+    assert error.value.failures == [(0, 'transfer')]
+    assert registry.build({'type': 'transfer'}, {}) is None
+
+def test_failed_build_reports_index_and_type():
+    registry = create_default_registry()
+    with pytest.raises(InstructionBuildError) as error:
+        registry.build_many([
+            {'type': 'transfer', 'recipient': address(), 'amount': 1.0},
+            {'type': 'transfer', 'recipient': 'not-a-key', 'amount': 1.0},
+        ], {'payer': Keypair().public_key})
+    assert error.value.failures == [(1, 'transfer')]
+
+def test_bulk_builder_failure_falls_back_to_single_builds():
+    registry = InstructionRegistry()
+    registry.register('echo', lambda data, context: data['value'], lambda group, context: 1 / 0)
+    assert registry.build_many([{'type': 'echo', 'value': 'a'}, {'type': 'echo', 'value': 'b'}], {}) == ['a', 'b']
+
+def test_unsupported_types_are_skipped():
+    registry = create_default_registry()
+    recipient = address()
+    instructions = registry.build_many([
+        {'type': 'borrow', 'asset': 'USDC', 'amount': 1.0, 'platform': 'Solend'},
+        {'type': 'transfer', 'recipient': recipient, 'amount': 1.0},
+        {'type': 'governance_vote', 'vote': 'yes', 'proposal_id': 'P1'},
+    ], {'payer': Keypair().public_key})
+    assert len(instructions) == 1 and str(instructions[0].keys[1].pubkey) == recipient
+    assert set(registry.unsupported_types()) == {'borrow', 'governance_vote'}
+
+def test_registering_an_unsupported_type_makes_it_buildable():
+    registry = create_default_registry()
+    registry.register('borrow', lambda data, context: 'borrowed')
+    assert registry.build_many([{'type': 'borrow'}], {}) == ['borrowed']
+    assert 'borrow' not in registry.unsupported_types()
+
+def test_pumpfun_action_without_programs_fails_clearly(persephai):
+    with pytest.raises(InstructionBuildError):
+        persephai().build_instructions([{'type': 'pumpfun_action', 'action': 'buy'}])
+
+def test_pumpfun_action_uses_configured_programs(persephai):
+    pump_program, fun_program = address(), address()
+    instance = persephai(pump_program=pump_program, fun_program=fun_program)
+    [group] = instance.build_instructions([{'type': 'pumpfun_action', 'action': 'buy'}])
+    assert [str(instruction.program_id) for instruction in group] == [pump_program, fun_program]
+    assert all(instruction.data == b'buy' for instruction in group)
+    assert str(group[0].keys[0].pubkey) == str(instance.keypair.public_key)
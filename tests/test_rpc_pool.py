@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+pytest.importorskip('solana')
+
+from src.utils.rpc_pool import RpcEndpoint, RpcPool, is_transport_error
+
+class FakeClient:
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.closed = False
+
+    def _respond(self, method):
+        self.calls.append(method)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {'result': self.name}
+
+    def get_balance(self, *args, **kwargs):
+        return self._respond('get_balance')
+
+    def send_raw_transaction(self, *args, **kwargs):
+        return self._respond('send_raw_transaction')
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def pool_for():
+    pools = []
+
+    def create(*clients, **kwargs):
+        pools.append(RpcPool([RpcEndpoint(client.name, client=client) for client in clients], **kwargs))
+        return pools[-1]
+
+    yield create
+    for pool in pools:
+        pool.close()
+
+def test_transport_errors_are_found_through_causes():
+    try:
+        try:
+            raise ConnectionError("reset")
+        except ConnectionError as error:
+            raise RuntimeError("wrapped") from error
+    except RuntimeError as wrapped:
+        assert is_transport_error(wrapped)
+    assert not is_transport_error(ValueError("Transaction simulation failed"))
+
+def test_reads_fail_over_on_any_error(pool_for):
+    broken, healthy = FakeClient('a', error=ValueError("bad")), FakeClient('b')
+    pool = pool_for(broken, healthy, hedge_reads=False)
+    assert pool.get_balance('key') == {'result': 'b'}
+    assert pool.ranked()[0].url == 'b'
+
+def test_rejected_write_is_not_retried_elsewhere(pool_for):
+    rejecting, other = FakeClient('a', error=ValueError("Transaction simulation failed")), FakeClient('b')
+    pool = pool_for(rejecting, other, hedge_reads=False)
+    with pytest.raises(ValueError):
+        pool.send_raw_transaction(b'tx')
+    assert other.calls == []
+
+def test_write_fails_over_on_transport_error(pool_for):
+    unreachable, other = FakeClient('a', error=ConnectionError("refused")), FakeClient('b')
+    pool = pool_for(unreachable, other, hedge_reads=False)
+    assert pool.send_raw_transaction(b'tx') == {'result': 'b'}
+
+def test_slow_read_is_hedged_to_the_backup(pool_for):
+    slow, fast = FakeClient('a', delay=0.5), FakeClient('b')
+    pool = pool_for(slow, fast, default_hedge_delay=0.02)
+    assert pool.get_balance('key') == {'result': 'b'}
+    assert pool.stats()['hedged_requests'] == 1 and pool.stats()['hedge_wins'] == 1
+
+def test_writes_are_never_hedged(pool_for):
+    slow, fast = FakeClient('a', delay=0.1), FakeClient('b')
+    pool = pool_for(slow, fast, default_hedge_delay=0.01)
+    assert pool.send_raw_transaction(b'tx') == {'result': 'a'}
+    assert fast.calls == [] and pool.stats()['hedged_requests'] == 0
+
+def test_close_closes_every_client(pool_for):
+    clients = FakeClient('a'), FakeClient('b')
+    pool_for(*clients).close()
+    assert all(client.closed for client in clients)
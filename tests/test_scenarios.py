@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from src.benchmarks.scenarios import create_scenarios, parser_scenarios
+
+def test_parser_scenarios_parse_instructions():
+    scenarios = parser_scenarios()
+    assert len(scenarios['parser.parse_input.grammar']()) == 2
+    assert len(scenarios['parser.parse_input.llm']()) == 2
+
+def test_every_scenario_runs_without_raising():
+    pytest.importorskip('raydium')
+    scenarios, cleanups = create_scenarios()
+    failures = {}
+    try:
+        for name, scenario in scenarios.items():
+            try:
+                scenario()
+            except Exception as error:
+                failures[name] = repr(error)
+    finally:
+        for cleanup in cleanups:
+            cleanup()
+    assert failures == {}
@@ -0,0 +1,157 @@
+import base64
+import struct
+
+import pytest
+
+pytest.importorskip('solana')
+pytest.importorskip('numpy')
+
+from solana.keypair import Keypair
+from src.benchmarks.mocks import MockRpcClient
+from src.pipelines.stake_rebalancer import (
+    ACTIVATING,
+    ACTIVE,
+    DEACTIVATING,
+    INACTIVE,
+    NOT_DEACTIVATING,
+    StakeRebalancer,
+    decode_stake_account,
+    move_seed,
+    parse_move_key,
+    plan_rebalance,
+    stake_status
+)
+from src.instructions.staking import stake_account_with_seed
+from src.utils.ledger import CONFIRMED, Ledger
+
+SOL = 1_000_000_000
+RESERVE = 2_282_880
+EPOCH = 500
+
+def address():
+    return str(Keypair().public_key)
+
+def account(voter, stake, status=ACTIVE, pubkey=None):
+    return {'pubkey': pubkey or address(), 'voter': voter, 'stake': stake, 'status': status}
+
+def stake_data(voter=None, stake=0, activation_epoch=0, deactivation_epoch=NOT_DEACTIVATING):
+    data = bytearray(200)
+    struct.pack_into('<IQ', data, 0, 1 if voter is None else 2, RESERVE)
+    if voter is not None:
+        data[124:156] = bytes(Keypair().public_key) if voter == 'random' else voter
+        struct.pack_into('<QQQ', data, 156, stake, activation_epoch, deactivation_epoch)
+    return bytes(data)
+
+def test_decode_and_status():
+    delegated = decode_stake_account(stake_data('random', 5 * SOL, activation_epoch=10, deactivation_epoch=EPOCH))
+    assert delegated['stake'] == 5 * SOL
+    assert stake_status(delegated, EPOCH) == DEACTIVATING
+    assert stake_status(delegated, EPOCH + 1) == INACTIVE
+    assert stake_status(dict(delegated, deactivation_epoch=NOT_DEACTIVATING), 10) == ACTIVATING
+    assert stake_status(dict(delegated, deactivation_epoch=NOT_DEACTIVATING), 11) == ACTIVE
+    initialized = decode_stake_account(stake_data())
+    assert initialized['voter'] is None and stake_status(initialized, EPOCH) == INACTIVE
+    assert decode_stake_account(bytes(200)) is None
+
+def test_surplus_active_stake_is_deactivated_not_redelegated():
+    a, b = address(), address()
+    big, small = account(a, 10 * SOL), account(a, 4 * SOL)
+    moves = plan_rebalance([big, small, account(b, 2 * SOL)], {a: 1, b: 1})
+    assert moves == [{'type': 'split_deactivate', 'stake_account': big['pubkey'], 'validator': None, 'lamports': 6 * SOL}]
+
+def test_whole_account_is_deactivated_when_remainder_is_dust():
+    a, b = address(), address()
+    source = account(a, 8 * SOL)
+    moves = plan_rebalance([source, account(b, 8 * SOL)], {b: 1})
+    assert moves == [{'type': 'deactivate', 'stake_account': source['pubkey'], 'validator': None, 'lamports': 8 * SOL}]
+
+def test_inactive_stake_is_delegated_to_deficits():
+    a, b = address(), address()
+    free = account(None, 6 * SOL, INACTIVE)
+    moves = plan_rebalance([account(a, 6 * SOL), free], {a: 1, b: 1})
+    assert moves == [{'type': 'delegate', 'stake_account': free['pubkey'], 'validator': b, 'lamports': 6 * SOL}]
+
+def test_inactive_stake_split_across_validators():
+    a, b, c = address(), address(), address()
+    free = account(None, 6 * SOL, INACTIVE)
+    moves = plan_rebalance([account(a, 6 * SOL), free], {a: 2, b: 1, c: 1})
+    assert [(move['type'], move['validator'], move['lamports']) for move in moves] == [
+        ('split_delegate', b, 3 * SOL), ('split_delegate', c, 3 * SOL)
+    ]
+
+def test_deactivating_and_activating_stake_is_left_alone():
+    a, b = address(), address()
+    accounts = [account(a, 6 * SOL, DEACTIVATING), account(a, 6 * SOL, ACTIVATING), account(b, 6 * SOL)]
+    # a holds 6 activating, b 6 active and 6 is in transit: nothing can move until the deactivation completes.
+    assert plan_rebalance(accounts, {a: 1, b: 2}) == []
+
+def test_new_funds_create_accounts():
+    a = address()
+    moves = plan_rebalance([account(a, 5 * SOL)], {a: 1}, total=8 * SOL)
+    assert moves == [{'type': 'create', 'stake_account': None, 'validator': a, 'lamports': 3 * SOL}]
+
+def test_pending_deposits_are_not_moved_and_deposit_only_when_active():
+    a, b = address(), address()
+    rebalancer = StakeRebalancer(MockRpcClient(), Keypair(), stake_pool=address())
+    active = dict(account(a, 4 * SOL), pending_deposit=True)
+    activating = dict(account(a, 4 * SOL, ACTIVATING), pending_deposit=True)
+    moves = rebalancer.plan([active, activating, account(b, 8 * SOL)], {b: 1})
+    assert moves == [{'type': 'deposit', 'stake_account': active['pubkey'], 'validator': a, 'lamports': 4 * SOL}]
+
+def test_build_keys_and_accounts_are_deterministic():
+    owner = Keypair()
+    a, b = address(), address()
+    moves = plan_rebalance([account(a, 10 * SOL), account(None, 3 * SOL, INACTIVE)], {a: 1, b: 1})
+    first = StakeRebalancer(MockRpcClient(), owner).build(moves, EPOCH)
+    second = StakeRebalancer(MockRpcClient(), owner).build(moves, EPOCH)
+    assert [item.keys for item in first] == [item.keys for item in second]
+    assert all(not item.signers for item in first)
+    parsed = [parse_move_key(item.keys[0]) for item in first]
+    assert {move['type'] for move in parsed} == {'split_deactivate', 'delegate'}
+    split = next(move for move in parsed if move['type'] == 'split_deactivate')
+    assert split['new_account'] is not None and split['epoch'] == EPOCH
+    assert StakeRebalancer(MockRpcClient(), owner).build(moves, EPOCH + 1)[0].keys != first[0].keys
+
+def test_from_ledger_tracks_new_accounts_and_deposits(tmp_path):
+    owner = Keypair()
+    a = address()
+    rebalancer = StakeRebalancer(MockRpcClient(), owner, stake_pool=address())
+    create, split = rebalancer.build([
+        {'type': 'create', 'stake_account': None, 'validator': a, 'lamports': 3 * SOL},
+        {'type': 'split_deactivate', 'stake_account': address(), 'validator': None, 'lamports': 2 * SOL},
+    ], EPOCH)
+    assert all(instruction is not None for item in (create, split) for instruction in item.instructions)
+    ledger = Ledger(str(tmp_path / 'ledger.jsonl'), fsync=False)
+    ledger.record(create.keys + split.keys, CONFIRMED, signature='s')
+    created, split_account = (parse_move_key(item.keys[0])['new_account'] for item in (create, split))
+    managed, pending, pooled = rebalancer.from_ledger(ledger)
+    assert set(managed) == {created, split_account} and pending == [created] and pooled == {}
+
+    deposit = rebalancer.build([{'type': 'deposit', 'stake_account': created, 'validator': a, 'lamports': 3 * SOL}], EPOCH + 2)
+    ledger.record(deposit[0].keys, CONFIRMED, signature='t')
+    managed, pending, pooled = rebalancer.from_ledger(ledger)
+    assert managed == [split_account] and pending == [] and pooled == {a: 3 * SOL}
+    ledger.close()
+
+def test_created_account_is_derived_from_owner_and_seed():
+    owner = Keypair()
+    move = {'type': 'create', 'stake_account': None, 'validator': address(), 'lamports': 3 * SOL}
+    [item] = StakeRebalancer(MockRpcClient(), owner).build([move], EPOCH)
+    create = item.instructions[0]
+    new_account = parse_move_key(item.keys[0])['new_account']
+    assert [str(meta.pubkey) for meta in create.keys] == [str(owner.public_key), new_account]
+    assert str(stake_account_with_seed(owner.public_key, move_seed(move, EPOCH))) == new_account
+    seed = move_seed(move, EPOCH).encode('utf-8')
+    assert create.data[36:44] == len(seed).to_bytes(8, 'little') and create.data[44:44 + len(seed)] == seed
+
+def test_fetch_accounts_reads_inactive_balance_from_lamports():
+    voter = Keypair().public_key
+    pubkeys = [address(), address()]
+    accounts = {
+        pubkeys[0]: {'lamports': RESERVE + 7 * SOL, 'data': [base64.b64encode(stake_data()).decode('utf-8'), 'base64']},
+        pubkeys[1]: {'lamports': RESERVE + 5 * SOL, 'data': [
+            base64.b64encode(stake_data(bytes(voter), 4 * SOL, activation_epoch=1, deactivation_epoch=EPOCH - 2)).decode('utf-8'), 'base64'
+        ]},
+    }
+    fetched = StakeRebalancer(MockRpcClient(accounts=accounts), Keypair()).fetch_accounts(pubkeys, EPOCH)
+    assert [(entry['status'], entry['stake']) for entry in fetched] == [(INACTIVE, 7 * SOL), (INACTIVE, 5 * SOL)]
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('solana')
+
+from solana.keypair import Keypair
+from solana.system_program import SYS_PROGRAM_ID
+from src.instructions.system import create_transfer_sol_instruction
+from src.instructions.templates import (
+    CREATE_ASSOCIATED_TOKEN_ACCOUNT_TEMPLATE,
+    TRANSFER_SOL_TEMPLATE,
+    TRANSFER_TOKEN_TEMPLATE,
+    compile_pump_action_template
+)
+from src.instructions.token import create_transfer_token_instruction
+from src.utils.derivation import ASSOCIATED_TOKEN_PROGRAM_ID, derive_ata
+from src.utils.pubkeys import SPL_TOKEN_PROGRAM_ID
+
+def keys():
+    return str(Keypair().public_key)
+
+def as_tuple(instruction):
+    return (
+        instruction.program_id,
+        [(meta.pubkey, meta.is_signer, meta.is_writable) for meta in instruction.keys],
+        bytes(instruction.data)
+    )
+
+def test_transfer_sol_template_matches_system_builder():
+    rows = [{'sender': keys(), 'recipient': keys(), 'lamports': lamports} for lamports in (0, 1, 5000, 2**64 - 1)]
+    built = TRANSFER_SOL_TEMPLATE.build_many(rows)
+    assert len(built) == len(rows)
+    for row, instruction in zip(rows, built):
+        expected = create_transfer_sol_instruction(row['sender'], row['recipient'], row['lamports'])
+        assert as_tuple(instruction) == as_tuple(expected)
+
+def test_transfer_token_template_matches_spl_builder():
+    rows = [
+        {'source': keys(), 'mint': keys(), 'destination': keys(), 'owner': keys(), 'amount': amount, 'decimals': decimals}
+        for amount, decimals in ((1, 0), (1_000_000, 6), (2**64 - 1, 9))
+    ]
+    for row, instruction in zip(rows, TRANSFER_TOKEN_TEMPLATE.build_many(rows)):
+        expected = create_transfer_token_instruction(
+            row['source'], row['destination'], row['owner'], row['amount'], row['mint'], row['decimals']
+        )
+        assert as_tuple(instruction) == as_tuple(expected)
+
+def test_create_associated_token_account_template_layout():
+    payer, owner, mint = keys(), keys(), keys()
+    instruction = CREATE_ASSOCIATED_TOKEN_ACCOUNT_TEMPLATE.build(
+        payer=payer, account=derive_ata(owner, mint), owner=owner, mint=mint
+    )
+    program_id, metas, data = as_tuple(instruction)
+    assert program_id == ASSOCIATED_TOKEN_PROGRAM_ID
+    assert data == b'\x01'
+    assert [str(pubkey) for pubkey, _, _ in metas] == [payer, str(derive_ata(owner, mint)), owner, mint, str(SYS_PROGRAM_ID), str(SPL_TOKEN_PROGRAM_ID)]
+    assert [(signer, writable) for _, signer, writable in metas] == [(True, True), (False, True), (False, False), (False, False), (False, False), (False, False)]
+
+def test_out_of_range_values_raise():
+    with pytest.raises(Exception):
+        TRANSFER_SOL_TEMPLATE.build(sender=keys(), recipient=keys(), lamports=-1)
+    with pytest.raises(Exception):
+        TRANSFER_TOKEN_TEMPLATE.build(source=keys(), mint=keys(), destination=keys(), owner=keys(), amount=1, decimals=256)
+
+def test_pump_action_template_packs_fixed_size_data():
+    template = compile_pump_action_template(keys(), 4)
+    assert template.data_size == 4
+    assert bytes(template.build(user=keys(), action_data=b'\x01\x02').data) == b'\x01\x02\x00\x00'